@@ -1,8 +1,11 @@
 # Evaluation/Evaluate.py
 
+import time
+
 import numpy as np
 import pandas as pd
-from sklearn.metrics import mean_squared_error, mean_absolute_error
+
+from Evaluation.metrics import batch_rmse, batch_mae, batch_mape
 
 
 # ============================================================
@@ -10,16 +13,16 @@ from sklearn.metrics import mean_squared_error, mean_absolute_error
 # ============================================================
 
 def rmse(y_true, y_pred):
-    return np.sqrt(mean_squared_error(y_true, y_pred))
+    return float(batch_rmse(y_true, y_pred, per="all", mask_nan=False))
 
 
 def mae(y_true, y_pred):
-    return mean_absolute_error(y_true, y_pred)
+    return float(batch_mae(y_true, y_pred, per="all", mask_nan=False))
 
 
 def mape(y_true, y_pred):
-    y_true, y_pred = np.array(y_true), np.array(y_pred)
-    return np.mean(np.abs((y_true - y_pred) / y_true)) * 100
+    # Zero actuals are excluded instead of dividing by zero
+    return float(batch_mape(y_true, y_pred, per="all", mask_nan=False))
 
 
 # ============================================================
@@ -40,12 +43,19 @@ def evaluate_model(
     """
 
     # Fit model
+    fit_start = time.perf_counter()
     if exog_train is not None:
         model.fit(y_train, exog_train)
-        y_pred = model.predict(steps=steps, exog_future=exog_test)
     else:
         model.fit(y_train)
+    fit_time = time.perf_counter() - fit_start
+
+    predict_start = time.perf_counter()
+    if exog_train is not None:
+        y_pred = model.predict(steps=steps, exog_future=exog_test)
+    else:
         y_pred = model.predict(steps=steps)
+    predict_time = time.perf_counter() - predict_start
 
     y_pred = np.array(y_pred)
     y_true = np.array(y_test[:steps])
@@ -63,4 +73,7 @@ def evaluate_model(
     else:
         results["Params"] = None
 
+    results["FitTime"] = fit_time
+    results["PredictTime"] = predict_time
+
     return results
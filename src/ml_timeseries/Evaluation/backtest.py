@@ -0,0 +1,211 @@
+# Evaluation/backtest.py
+
+import copy
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from Evaluation.Evaluate import rmse, mae, mape
+from experiments.arima_grid_search import resolve_n_jobs
+
+
+METRIC_COLUMNS = ["RMSE", "MAE", "MAPE"]
+
+
+# ============================================================
+# HELPERS
+# ============================================================
+
+def _slice(data, start, stop):
+    if data is None:
+        return None
+    if hasattr(data, "iloc"):
+        return data.iloc[start:stop]
+    return data[start:stop]
+
+
+def _label(y, position):
+    if hasattr(y, "index"):
+        return y.index[position]
+    return position
+
+
+def fold_origins(n_obs, n_folds, horizon, step=None):
+    """
+    Forecast origins (first test position) for each fold. The last fold's
+    test window ends at the last observation.
+    """
+    step = step or horizon
+    origins = [
+        n_obs - horizon - (n_folds - 1 - fold) * step
+        for fold in range(n_folds)
+    ]
+
+    if origins[0] < 1:
+        raise ValueError(
+            f"Not enough observations ({n_obs}) for {n_folds} folds "
+            f"with horizon={horizon} and step={step}"
+        )
+    return origins
+
+
+def refit_blocks(n_folds, refit_every):
+    """
+    Group folds into blocks that start with a refit; the remaining folds of
+    a block only update the fitted state. Blocks are independent.
+    """
+    if not refit_every:
+        return [list(range(n_folds))]
+    return [
+        list(range(start, min(start + refit_every, n_folds)))
+        for start in range(0, n_folds, refit_every)
+    ]
+
+
+def _fit(model, y, exog):
+    if exog is not None:
+        model.fit(y, exog)
+    else:
+        model.fit(y)
+
+
+def _update(model, new_y, new_exog):
+    if new_exog is not None:
+        model.update(new_y, new_exog=new_exog)
+    else:
+        model.update(new_y)
+
+
+def _predict(model, steps, exog_future):
+    if exog_future is not None:
+        return model.predict(steps=steps, exog_future=exog_future)
+    return model.predict(steps=steps)
+
+
+# ============================================================
+# BLOCK EXECUTION
+# ============================================================
+
+def _run_block(model, y, exog, horizon, window, window_size, block):
+    """
+    block = [(fold, origin), ...]; refit at the first origin, then carry
+    the fitted state forward with update(). update() only appends, so a
+    sliding window is refitted at every origin to keep window_size points.
+    """
+    model = copy.deepcopy(model)
+    rows = []
+    previous_origin = None
+    train_start = 0
+
+    for fold, origin in block:
+        fit_start = time.perf_counter()
+        refit = previous_origin is None or window == "sliding"
+
+        if not refit:
+            try:
+                _update(
+                    model,
+                    _slice(y, previous_origin, origin),
+                    _slice(exog, previous_origin, origin)
+                )
+            except NotImplementedError:
+                refit = True
+
+        if refit:
+            train_start = 0 if window == "expanding" else max(0, origin - window_size)
+            _fit(model, _slice(y, train_start, origin), _slice(exog, train_start, origin))
+
+        fit_time = time.perf_counter() - fit_start
+
+        predict_start = time.perf_counter()
+        y_pred = _predict(model, horizon, _slice(exog, origin, origin + horizon))
+        predict_time = time.perf_counter() - predict_start
+
+        y_true = np.asarray(_slice(y, origin, origin + horizon))
+        y_pred = np.asarray(y_pred)[:len(y_true)]
+
+        rows.append({
+            "Fold": fold,
+            "Origin": _label(y, origin),
+            "TrainSize": origin - train_start,
+            "Refit": refit,
+            "RMSE": rmse(y_true, y_pred),
+            "MAE": mae(y_true, y_pred),
+            "MAPE": mape(y_true, y_pred),
+            "FitTime": fit_time,
+            "PredictTime": predict_time
+        })
+        previous_origin = origin
+
+    return rows
+
+
+# ============================================================
+# ROLLING-ORIGIN BACKTEST
+# ============================================================
+
+def rolling_origin_backtest(
+    model,
+    y,
+    n_folds=5,
+    horizon=12,
+    step=None,
+    window="expanding",
+    window_size=None,
+    refit_every=1,
+    exog=None,
+    n_jobs=1,
+    model_name=None
+):
+    """
+    Rolling-origin evaluation of a model over several forecast origins.
+
+    window      : "expanding" (train from the start) or "sliding"
+                  (last window_size points, default = first origin)
+    step        : distance between origins (default = horizon)
+    refit_every : 1 = refit at every origin, k = refit every k origins and
+                  update() in between, 0 = fit once then update only.
+                  Models without update() are refitted instead. Sliding
+                  windows always refit (update() cannot drop old points).
+    n_jobs      : worker processes; independent refit blocks run in parallel
+
+    Returns one frame with a row per fold plus "mean" and "std" rows
+    aggregating the metrics across folds.
+    """
+    if window not in ("expanding", "sliding"):
+        raise ValueError(f"Unsupported window: {window}")
+
+    origins = fold_origins(len(y), n_folds, horizon, step)
+    window_size = window_size or origins[0]
+
+    blocks = [
+        [(fold, origins[fold]) for fold in block]
+        for block in refit_blocks(n_folds, 1 if window == "sliding" else refit_every)
+    ]
+    worker = partial(_run_block, model, y, exog, horizon, window, window_size)
+
+    n_jobs = min(resolve_n_jobs(n_jobs), len(blocks))
+    if n_jobs == 1:
+        block_rows = [worker(block) for block in blocks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            block_rows = list(executor.map(worker, blocks))
+
+    df_folds = pd.DataFrame([row for rows in block_rows for row in rows])
+
+    numeric = df_folds[METRIC_COLUMNS + ["FitTime", "PredictTime"]]
+    aggregates = pd.DataFrame([
+        {"Fold": "mean", **numeric.mean()},
+        {"Fold": "std", **numeric.std()}
+    ])
+
+    df_results = pd.concat(
+        [df_folds.astype({"Fold": object}), aggregates],
+        ignore_index=True
+    )
+    df_results.insert(0, "Model", model_name or model.__class__.__name__)
+
+    return df_results
@@ -0,0 +1,191 @@
+# Evaluation/metrics.py
+
+"""
+Vectorized forecast metrics over (n_series, horizon) arrays
+
+Every metric is an elementwise error matrix followed by one masked
+reduction, so a whole panel of forecasts is scored in a single pass:
+
+    per="series"  -> one value per series     (n_series,)
+    per="horizon" -> one value per step ahead (horizon,)
+    per="all"     -> one scalar
+
+With mask_nan=True, points where the actual or the forecast is NaN are
+ignored instead of propagating.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+REDUCE_AXIS = {"series": 1, "horizon": 0, "all": None}
+
+
+# ============================================================
+# HELPERS
+# ============================================================
+
+def _as_2d(values):
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        return values[np.newaxis, :]
+    if values.ndim != 2:
+        raise ValueError(f"Expected a 1-D or 2-D array, got {values.ndim}-D")
+    return values
+
+
+def _prepare(y_true, y_pred, mask_nan):
+    y_true = _as_2d(y_true)
+    y_pred = _as_2d(y_pred)
+
+    if y_true.shape != y_pred.shape:
+        raise ValueError(
+            f"Shape mismatch: y_true {y_true.shape} vs y_pred {y_pred.shape}"
+        )
+
+    if mask_nan:
+        mask = np.isfinite(y_true) & np.isfinite(y_pred)
+    else:
+        mask = np.ones(y_true.shape, dtype=bool)
+
+    return y_true, y_pred, mask
+
+
+def _masked_mean(values, mask, per):
+    if per not in REDUCE_AXIS:
+        raise ValueError(f"Unsupported reduction: {per}")
+    axis = REDUCE_AXIS[per]
+
+    total = np.sum(np.where(mask, values, 0.0), axis=axis, dtype=np.float64)
+    count = np.sum(mask, axis=axis)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(count > 0, total / np.maximum(count, 1), np.nan)
+
+
+def seasonal_scale(y_train, m=1, mask_nan=True):
+    """
+    Per-series MASE denominator: mean absolute seasonal difference of the
+    in-sample data, shape (n_series,). Zero scales become NaN.
+    """
+    y_train = _as_2d(y_train)
+    diffs = np.abs(y_train[:, m:] - y_train[:, :-m])
+
+    mask = np.isfinite(diffs) if mask_nan else np.ones(diffs.shape, dtype=bool)
+    scale = _masked_mean(diffs, mask, "series")
+
+    return np.where(scale > 0, scale, np.nan)
+
+
+# ============================================================
+# METRICS
+# ============================================================
+
+def batch_rmse(y_true, y_pred, per="series", mask_nan=True):
+    y_true, y_pred, mask = _prepare(y_true, y_pred, mask_nan)
+    return np.sqrt(_masked_mean((y_true - y_pred) ** 2, mask, per))
+
+
+def batch_mae(y_true, y_pred, per="series", mask_nan=True):
+    y_true, y_pred, mask = _prepare(y_true, y_pred, mask_nan)
+    return _masked_mean(np.abs(y_true - y_pred), mask, per)
+
+
+def batch_mape(y_true, y_pred, per="series", mask_nan=True, eps=1e-12):
+    """
+    Zero-safe MAPE in percent: points with |y_true| <= eps are excluded
+    (NaN if nothing is left) rather than dividing by zero.
+    """
+    y_true, y_pred, mask = _prepare(y_true, y_pred, mask_nan)
+    nonzero = np.abs(y_true) > eps
+    mask = mask & nonzero
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ape = np.abs((y_true - y_pred) / np.where(nonzero, y_true, 1.0))
+
+    return _masked_mean(ape, mask, per) * 100
+
+
+def batch_smape(y_true, y_pred, per="series", mask_nan=True):
+    """Symmetric MAPE in percent (0..200); 0/0 counts as a perfect forecast"""
+    y_true, y_pred, mask = _prepare(y_true, y_pred, mask_nan)
+    denom = np.abs(y_true) + np.abs(y_pred)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratio = np.where(denom > 0, 2 * np.abs(y_true - y_pred) / denom, 0.0)
+
+    return _masked_mean(ratio, mask, per) * 100
+
+
+def batch_mase(
+    y_true,
+    y_pred,
+    y_train=None,
+    scale=None,
+    m=1,
+    per="series",
+    mask_nan=True
+):
+    """
+    Mean absolute scaled error. Pass the in-sample data as y_train
+    (n_series, T) or a precomputed per-series `scale` from seasonal_scale.
+    """
+    y_true, y_pred, mask = _prepare(y_true, y_pred, mask_nan)
+
+    if scale is None:
+        if y_train is None:
+            raise ValueError("batch_mase needs y_train or scale")
+        scale = seasonal_scale(y_train, m, mask_nan)
+
+    scale = np.asarray(scale, dtype=float).reshape(-1, 1)
+    scaled = np.abs(y_true - y_pred) / scale
+
+    if mask_nan:
+        mask = mask & np.isfinite(scaled)
+
+    return _masked_mean(scaled, mask, per)
+
+
+def batch_bias(y_true, y_pred, per="series", mask_nan=True):
+    """Mean forecast minus actual; positive means over-forecasting"""
+    y_true, y_pred, mask = _prepare(y_true, y_pred, mask_nan)
+    return _masked_mean(y_pred - y_true, mask, per)
+
+
+# ============================================================
+# METRIC TABLES
+# ============================================================
+
+def batch_metrics(
+    y_true,
+    y_pred,
+    y_train=None,
+    m=1,
+    per="series",
+    mask_nan=True,
+    index=None
+):
+    """
+    All metrics in one frame: one row per series (per="series"), per
+    horizon step (per="horizon", index 1..horizon) or a single row.
+    MASE is included when y_train is given.
+    """
+    results = {
+        "RMSE": batch_rmse(y_true, y_pred, per, mask_nan),
+        "MAE": batch_mae(y_true, y_pred, per, mask_nan),
+        "MAPE": batch_mape(y_true, y_pred, per, mask_nan),
+        "sMAPE": batch_smape(y_true, y_pred, per, mask_nan),
+        "Bias": batch_bias(y_true, y_pred, per, mask_nan)
+    }
+    if y_train is not None:
+        results["MASE"] = batch_mase(
+            y_true, y_pred, y_train=y_train, m=m, per=per, mask_nan=mask_nan
+        )
+
+    if per == "all":
+        return pd.DataFrame({name: [float(value)] for name, value in results.items()})
+
+    if index is None and per == "horizon":
+        index = pd.RangeIndex(1, len(results["RMSE"]) + 1, name="horizon")
+
+    return pd.DataFrame(results, index=index)
@@ -0,0 +1,385 @@
+# src/ml_timeseries/data/chunked_preprocess.py
+"""
+Out-of-core preprocessing for time-partitioned inputs
+
+Chunks (e.g. one file per month, or load_data(..., chunksize=n)) are
+processed in time order with the same steps as preprocess_time_series:
+sort, de-duplicate, regular frequency grid, missing-value fill and
+outlier capping. State that spans chunk boundaries (the last emitted
+timestamp and grid point, the last valid value, the pending run of
+missing values for bfill / interpolate) is carried forward, and the
+cleaned values are appended straight to a series store on disk, so peak
+memory follows the chunk size rather than the history length.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+import os
+import shutil
+import logging
+import pandas as pd
+import numpy as np
+
+from data.load_data import load_data
+from data.preprocess import PreprocessConfig
+from data.quantile_sketch import QuantileSketch, k_for_error
+from data.series_store import TIMESTAMPS_FILE, VALUES_FILE, write_meta
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------
+# Appendable .npy files
+# ---------------------------
+class NpyAppender:
+    """
+    1-D .npy file written in appended pieces. The header is rewritten
+    with the final length on close (npy headers are padded to a fixed
+    size, so it never moves the data).
+    """
+
+    def __init__(self, path, dtype):
+        self.path = Path(path)
+        self.dtype = np.dtype(dtype)
+        self.length = 0
+        self._file = open(self.path, "wb")
+        self._header_size = self._write_header()
+
+    def _write_header(self) -> int:
+        self._file.seek(0)
+        np.lib.format.write_array_header_1_0(self._file, {
+            "descr": np.lib.format.dtype_to_descr(self.dtype),
+            "fortran_order": False,
+            "shape": (self.length,)
+        })
+        return self._file.tell()
+
+    def append(self, values: np.ndarray) -> None:
+        values = np.ascontiguousarray(values, dtype=self.dtype)
+        self._file.write(values.tobytes())
+        self.length += len(values)
+
+    def close(self) -> None:
+        end = self._file.tell()
+        if self._write_header() != self._header_size:
+            raise RuntimeError("npy header size changed while appending")
+        self._file.seek(end)
+        self._file.close()
+
+
+# ---------------------------
+# Chunk sources
+# ---------------------------
+def iter_file_chunks(
+    paths: Iterable,
+    date_col: str,
+    target_col: str,
+    chunksize: Optional[int] = None
+) -> Iterator[pd.DataFrame]:
+    """Raw frames from time-partitioned files, in the given order"""
+    for path in paths:
+        loaded = load_data(
+            str(path),
+            usecols=[date_col, target_col],
+            chunksize=chunksize,
+            sort=False
+        )
+        if chunksize:
+            yield from loaded
+        else:
+            yield loaded
+
+
+# ---------------------------
+# Chunked cleaning
+# ---------------------------
+class ChunkedPreprocessor:
+    """
+    Applies the preprocess_time_series steps chunk by chunk. push()
+    returns the (timestamps, values) ready to be written; finish()
+    flushes what is held back for bfill / interpolate. Timestamps of
+    tz-aware input are returned as naive UTC (see to_index).
+    """
+
+    def __init__(self, date_col: str, target_col: str, config: PreprocessConfig):
+        if config.fill_method not in ("ffill", "bfill", "interpolate"):
+            raise ValueError(f"Unsupported fill method: {config.fill_method}")
+
+        self.date_col = date_col
+        self.target_col = target_col
+        self.config = config
+        self.offset = pd.tseries.frequencies.to_offset(config.freq)
+
+        self.tz = None              # time zone of the input dates
+        self.last_date = None       # last raw timestamp seen
+        self.next_grid = None       # next point of the regular grid
+        self.last_valid = np.nan    # last non-missing value emitted
+        self.n_missing = 0
+        self.n_obs = 0
+
+        # Grid points held back until a later valid value resolves them
+        self.pending_dates: List[np.ndarray] = []
+        self.pending_count = 0
+
+    def _regularize(self, chunk: pd.DataFrame) -> pd.Series:
+        if self.date_col not in chunk.columns or self.target_col not in chunk.columns:
+            raise ValueError(f"Chunk is missing {self.date_col} or {self.target_col}")
+
+        dates = pd.to_datetime(chunk[self.date_col])
+        if dates.isna().any():
+            raise ValueError("Date column contains null values")
+
+        if self.last_date is None:
+            self.tz = dates.dt.tz
+        elif str(dates.dt.tz) != str(self.tz):
+            raise ValueError(f"Chunks must share one time zone: {dates.dt.tz} != {self.tz}")
+
+        series = pd.Series(chunk[self.target_col].to_numpy(dtype=np.float64), index=dates)
+        series = series.sort_index(kind="stable")
+
+        if self.last_date is not None and series.index[0] < self.last_date:
+            raise ValueError(
+                f"Chunks must be time-ordered: {series.index[0]} < {self.last_date}"
+            )
+
+        if self.config.remove_duplicates:
+            duplicated = series.index.duplicated(keep="first")
+            if self.last_date is not None:
+                # The first occurrence was in an earlier chunk
+                duplicated |= series.index == self.last_date
+            series = series[~duplicated]
+
+        self.last_date = series.index[-1] if len(series) else self.last_date
+        if not len(series):
+            return series
+
+        # Continue the grid from where the previous chunk stopped
+        start = self.next_grid if self.next_grid is not None else series.index[0]
+        grid = pd.date_range(start=start, end=series.index[-1], freq=self.offset)
+        if len(grid):
+            self.next_grid = grid[-1] + self.offset
+
+        return series.reindex(grid)
+
+    def to_index(self, dates: np.ndarray) -> pd.DatetimeIndex:
+        """Index of emitted timestamps, in the input's time zone and named after date_col"""
+        index = pd.DatetimeIndex(dates, name=self.date_col)
+        if self.tz is not None:
+            index = index.tz_localize("UTC").tz_convert(self.tz)
+        if len(index):
+            index.freq = self.offset
+        return index
+
+    def _fill(self, series: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+        dates = series.index.values
+        values = series.to_numpy(copy=True)
+        missing = np.isnan(values)
+        self.n_missing += int(missing.sum())
+        method = self.config.fill_method
+
+        if method == "ffill":
+            filled = pd.Series(np.concatenate([[self.last_valid], values])).ffill()
+            values = filled.to_numpy()[1:]
+            self._remember_last(values)
+            return dates, values
+
+        # bfill / interpolate need the next valid value: hold the
+        # trailing missing run back until a later chunk provides it
+        valid_positions = np.flatnonzero(~missing)
+        if len(valid_positions) == 0:
+            self.pending_dates.append(dates)
+            self.pending_count += len(dates)
+            return dates[:0], values[:0]
+
+        cut = valid_positions[-1] + 1
+        held_dates = np.concatenate(self.pending_dates + [dates[:cut]])
+        held_values = np.concatenate([np.full(self.pending_count, np.nan), values[:cut]])
+
+        anchor = np.concatenate([[self.last_valid], held_values])
+        if method == "bfill":
+            filled = pd.Series(anchor).bfill().to_numpy()[1:]
+        else:
+            filled = pd.Series(anchor).interpolate(limit_area="inside").to_numpy()[1:]
+
+        self.pending_dates = [dates[cut:]]
+        self.pending_count = len(dates) - cut
+        self._remember_last(filled)
+        return held_dates, filled
+
+    def _remember_last(self, values: np.ndarray) -> None:
+        valid = values[~np.isnan(values)]
+        if len(valid):
+            self.last_valid = valid[-1]
+
+    def push(self, chunk: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        series = self._regularize(chunk)
+        if not len(series):
+            return np.empty(0, dtype="datetime64[ns]"), np.empty(0)
+
+        dates, values = self._fill(series)
+        self.n_obs += len(dates)
+        return dates, values
+
+    def finish(self) -> Tuple[np.ndarray, np.ndarray]:
+        if not self.pending_count:
+            return np.empty(0, dtype="datetime64[ns]"), np.empty(0)
+
+        dates = np.concatenate(self.pending_dates)
+        # No later value: bfill leaves the tail missing, interpolate
+        # carries the last value forward (as pandas does)
+        fill_value = np.nan if self.config.fill_method == "bfill" else self.last_valid
+        values = np.full(len(dates), fill_value)
+
+        self.pending_dates, self.pending_count = [], 0
+        self.n_obs += len(dates)
+        return dates, values
+
+    # ---------------------------
+    # State
+    # ---------------------------
+    def to_dict(self) -> Dict:
+        def timestamp(value):
+            return value.isoformat() if value is not None else None
+
+        # Pending points are the grid points right before next_grid
+        return {
+            "tz": str(self.tz) if self.tz is not None else None,
+            "last_date": timestamp(self.last_date),
+            "next_grid": timestamp(self.next_grid),
+            "last_valid": None if np.isnan(self.last_valid) else float(self.last_valid),
+            "pending_count": int(self.pending_count),
+            "n_missing": int(self.n_missing),
+            "n_obs": int(self.n_obs)
+        }
+
+    @classmethod
+    def from_dict(
+        cls, state: Dict, date_col: str, target_col: str, config: PreprocessConfig
+    ) -> "ChunkedPreprocessor":
+        processor = cls(date_col, target_col, config)
+        processor.tz = state.get("tz")
+
+        def timestamp(value):
+            if value is None:
+                return None
+            # isoformat keeps only the UTC offset; restore the zone for the grid
+            value = pd.Timestamp(value)
+            return value.tz_convert(processor.tz) if processor.tz is not None else value
+
+        processor.last_date = timestamp(state["last_date"])
+        processor.next_grid = timestamp(state["next_grid"])
+        if state["last_valid"] is not None:
+            processor.last_valid = state["last_valid"]
+        processor.n_missing = state["n_missing"]
+        processor.n_obs = state["n_obs"]
+
+        processor.pending_count = state["pending_count"]
+        if processor.pending_count:
+            pending = pd.date_range(
+                end=processor.next_grid - processor.offset,
+                periods=processor.pending_count,
+                freq=processor.offset
+            )
+            processor.pending_dates = [pending.values]
+        return processor
+
+
+# ---------------------------
+# Out-of-core pipeline
+# ---------------------------
+def _clip_in_place(path: Path, caps: Tuple[float, float], block_size: int) -> int:
+    values = np.load(path, mmap_mode="r+")
+    lower_cap, upper_cap = caps
+    n_capped = 0
+    for start in range(0, len(values), block_size):
+        block = values[start:start + block_size]
+        n_capped += int(((block < lower_cap) | (block > upper_cap)).sum())
+        np.clip(block, lower_cap, upper_cap, out=block)
+    values.flush()
+    del values
+    return n_capped
+
+
+def preprocess_chunked(
+    chunks: Iterable[pd.DataFrame],
+    date_col: str,
+    target_col: str,
+    config: PreprocessConfig,
+    output_path,
+    caps: Optional[Tuple[float, float]] = None,
+    block_size: int = 1_000_000
+) -> dict:
+    """
+    Out-of-core preprocess_time_series: cleans time-ordered chunks and
+    streams the result into a series store at output_path (open it with
+    data.series_store.load_series / load_split).
+
+    Outlier caps come from `caps` when given (e.g. frozen at training
+    time); otherwise from a quantile sketch fed while streaming, within
+    config.sketch_rank_error of the exact quantiles. The caps are then
+    applied in place over the written values, block by block.
+
+    Returns the store metadata.
+    """
+    output_path = Path(output_path)
+    tmp_path = output_path.with_name(f"{output_path.name}.tmp")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    tmp_path.mkdir(parents=True)
+
+    processor = ChunkedPreprocessor(date_col, target_col, config)
+    sketch = QuantileSketch(k=k_for_error(config.sketch_rank_error)) if caps is None else None
+
+    values_file = NpyAppender(tmp_path / VALUES_FILE, np.float64)
+    dates_file = NpyAppender(tmp_path / TIMESTAMPS_FILE, "datetime64[ns]")
+
+    def write(dates, values):
+        dates_file.append(dates.astype("datetime64[ns]"))
+        values_file.append(values)
+        if sketch is not None:
+            sketch.update(values)
+
+    try:
+        n_chunks = 0
+        for chunk in chunks:
+            write(*processor.push(chunk))
+            n_chunks += 1
+        write(*processor.finish())
+    finally:
+        values_file.close()
+        dates_file.close()
+
+    if processor.n_missing:
+        logger.warning(
+            "Missing values detected: %.2f%%",
+            100 * processor.n_missing / max(processor.n_obs, 1)
+        )
+
+    if caps is None:
+        q = config.outlier_cap_quantile
+        caps = tuple(float(v) for v in sketch.quantile([1 - q, q]))
+
+    n_capped = _clip_in_place(tmp_path / VALUES_FILE, caps, block_size)
+    if n_capped:
+        logger.info("Capping %d outliers", n_capped)
+
+    meta = write_meta(
+        tmp_path,
+        name=target_col,
+        n_obs=processor.n_obs,
+        freq=processor.offset.freqstr,
+        tz=processor.tz,
+        index_name=date_col,
+        config=config,
+        state={"lower_cap": caps[0], "upper_cap": caps[1]}
+    )
+
+    shutil.rmtree(output_path, ignore_errors=True)
+    os.replace(tmp_path, output_path)
+
+    logger.info(
+        "Chunked preprocessing done | Chunks: %d | Rows: %d | Store: %s",
+        n_chunks,
+        processor.n_obs,
+        output_path
+    )
+    return meta
@@ -0,0 +1,168 @@
+# src/ml_timeseries/data/incremental_preprocess.py
+"""
+Append-only preprocessing of new observations
+
+IncrementalPreprocessor is fitted once on the history and then cleans
+only the rows that arrive afterwards: it keeps the last timestamp, the
+fill state and the frozen outlier caps, and persists them as JSON
+between runs.
+
+Equivalence with a full rerun of preprocess_series:
+
+- index, de-duplication and missing-value fill are identical. For bfill
+  and interpolate a trailing run of missing points depends on the next
+  valid value, so those points are held back and returned by the
+  append() that resolves them (the output can start before the new rows)
+- the outlier caps are the ones fitted on the history. After m appended
+  rows on top of n fitted ones, a frozen cap sits within m / (n + m) of
+  its target quantile rank in the full series (see cap_tolerance); the
+  history is never re-capped. Refit when that drift matters.
+"""
+
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import json
+import logging
+import pandas as pd
+import numpy as np
+
+from data.chunked_preprocess import ChunkedPreprocessor
+from data.preprocess import PreprocessConfig, outlier_caps, validate_series
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalPreprocessor:
+    """
+    Stateful preprocess_series for append-only data.
+
+        prep = IncrementalPreprocessor("date", "sales", config)
+        history = prep.fit(df)
+        prep.save(path)
+        ...
+        prep = IncrementalPreprocessor.load(path)
+        new_rows = prep.append(new_df)
+    """
+
+    def __init__(
+        self,
+        date_col: str,
+        target_col: str,
+        config: PreprocessConfig,
+        caps: Optional[Tuple[float, float]] = None
+    ):
+        self.date_col = date_col
+        self.target_col = target_col
+        self.config = config
+        self.caps = caps
+        self.n_fit = 0
+        self._processor = ChunkedPreprocessor(date_col, target_col, config)
+
+    # ---------------------------
+    # Cleaning
+    # ---------------------------
+    def _to_series(self, dates: np.ndarray, values: np.ndarray) -> pd.Series:
+        return pd.Series(values, index=self._processor.to_index(dates), name=self.target_col)
+
+    def _cap(self, values: np.ndarray) -> np.ndarray:
+        lower_cap, upper_cap = self.caps
+        outliers = int(((values < lower_cap) | (values > upper_cap)).sum())
+        if outliers > 0:
+            logger.info("Capping %d outliers", outliers)
+        return np.clip(values, lower_cap, upper_cap)
+
+    def fit(self, df: pd.DataFrame) -> pd.Series:
+        """
+        Clean the history and freeze the outlier caps (unless given).
+        Returns the cleaned rows that are final.
+        """
+        if self._processor.last_date is not None:
+            raise ValueError("Preprocessor is already fitted; use append()")
+        validate_series(df, self.date_col, self.target_col)
+
+        dates, values = self._processor.push(df)
+
+        if self.caps is None:
+            lower_cap, upper_cap = outlier_caps(
+                pd.Series(values),
+                self.config.outlier_cap_quantile,
+                self.config.quantile_method,
+                self.config.sketch_rank_error
+            )
+            self.caps = (float(lower_cap), float(upper_cap))
+
+        self.n_fit = self._processor.n_obs
+        return self._to_series(dates, self._cap(values))
+
+    def append(self, new_df: pd.DataFrame) -> pd.Series:
+        """
+        Validate, regularize, fill and cap the new rows only. Rows must be
+        later than the last timestamp seen; a repeat of that timestamp is
+        dropped as a duplicate.
+        """
+        if self.caps is None:
+            raise ValueError("Preprocessor is not fitted")
+        validate_series(new_df, self.date_col, self.target_col)
+
+        if len(new_df) == 0:
+            return self._to_series(np.empty(0, dtype="datetime64[ns]"), np.empty(0))
+
+        dates, values = self._processor.push(new_df)
+
+        if self.cap_tolerance > self.config.sketch_rank_error:
+            logger.warning(
+                "Frozen outlier caps may be off by %.2f%% in rank; consider refitting",
+                100 * self.cap_tolerance
+            )
+
+        return self._to_series(dates, self._cap(values))
+
+    @property
+    def cap_tolerance(self) -> float:
+        """Upper bound on the rank drift of the frozen caps vs. a full rerun"""
+        n_obs = self._processor.n_obs
+        return (n_obs - self.n_fit) / n_obs if n_obs else 0.0
+
+    @property
+    def last_date(self) -> Optional[pd.Timestamp]:
+        return self._processor.last_date
+
+    # ---------------------------
+    # State
+    # ---------------------------
+    def to_dict(self) -> Dict:
+        return {
+            "date_col": self.date_col,
+            "target_col": self.target_col,
+            "config": asdict(self.config),
+            "caps": list(self.caps) if self.caps is not None else None,
+            "n_fit": self.n_fit,
+            "processor": self._processor.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "IncrementalPreprocessor":
+        config = PreprocessConfig(**state["config"])
+        caps = tuple(state["caps"]) if state["caps"] is not None else None
+
+        prep = cls(state["date_col"], state["target_col"], config, caps)
+        prep.n_fit = state["n_fit"]
+        prep._processor = ChunkedPreprocessor.from_dict(
+            state["processor"], prep.date_col, prep.target_col, config
+        )
+        return prep
+
+    def save(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        tmp_path.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path) -> "IncrementalPreprocessor":
+        with open(Path(path), "r") as f:
+            return cls.from_dict(json.load(f))
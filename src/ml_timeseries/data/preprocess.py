@@ -3,11 +3,13 @@ Industry-grade preprocessing for time series forecasting
 """
 
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Dict, Iterable, Optional, Tuple
 import pandas as pd
 import numpy as np
 import logging
 
+from data.quantile_sketch import QuantileSketch, k_for_error
+
 logger = logging.getLogger(__name__)
 
 
@@ -20,6 +22,8 @@ class PreprocessConfig:
     test_size: float = 0.2
     fill_method: str = "ffill"      # ffill | bfill | interpolate
     outlier_cap_quantile: float = 0.99
+    quantile_method: str = "exact"  # exact | sketch
+    sketch_rank_error: float = 0.005  # sketch accuracy (fraction of n)
     remove_duplicates: bool = True
 
 
@@ -96,9 +100,45 @@ def handle_missing(series: pd.Series, method: str) -> pd.Series:
 # ---------------------------
 # Outlier handling
 # ---------------------------
-def cap_outliers(series: pd.Series, upper_quantile: float) -> pd.Series:
-    upper_cap = series.quantile(upper_quantile)
-    lower_cap = series.quantile(1 - upper_quantile)
+def outlier_caps(
+    series: pd.Series,
+    upper_quantile: float,
+    method: str = "exact",
+    rank_error: float = 0.005
+) -> Tuple[float, float]:
+    if method == "exact":
+        lower_cap, upper_cap = series.quantile([1 - upper_quantile, upper_quantile])
+        return lower_cap, upper_cap
+    if method == "sketch":
+        return sketch_outlier_caps([series.to_numpy()], upper_quantile, rank_error)
+    raise ValueError(f"Unsupported quantile method: {method}")
+
+
+def sketch_outlier_caps(
+    chunks: Iterable,
+    upper_quantile: float,
+    rank_error: float = 0.005,
+    sketch: Optional[QuantileSketch] = None
+) -> Tuple[float, float]:
+    """
+    Approximate caps from data streamed chunk by chunk through a KLL
+    sketch, within rank_error of the exact quantiles. Pass a sketch to
+    continue one (e.g. merged from workers or deserialized).
+    """
+    sketch = sketch or QuantileSketch(k=k_for_error(rank_error))
+    for chunk in chunks:
+        sketch.update(np.asarray(chunk, dtype=np.float64))
+
+    lower_cap, upper_cap = sketch.quantile([1 - upper_quantile, upper_quantile])
+    return float(lower_cap), float(upper_cap)
+
+
+def cap_outliers(
+    series: pd.Series,
+    upper_quantile: float,
+    caps: Optional[Tuple[float, float]] = None
+) -> pd.Series:
+    lower_cap, upper_cap = caps if caps is not None else outlier_caps(series, upper_quantile)
 
     outliers = ((series > upper_cap) | (series < lower_cap)).sum()
 
@@ -133,13 +173,16 @@ def time_series_split(
 # ---------------------------
 # Full preprocessing pipeline
 # ---------------------------
-def preprocess_time_series(
+def preprocess_series(
     df: pd.DataFrame,
     date_col: str,
     target_col: str,
     config: PreprocessConfig
-) -> Tuple[pd.Series, pd.Series]:
-
+) -> Tuple[pd.Series, Dict[str, float]]:
+    """
+    Cleaned full series (before the split) and the fitted preprocessing
+    state: the outlier caps applied to it
+    """
     validate_series(df, date_col, target_col)
 
     series = prepare_time_index(
@@ -151,8 +194,354 @@ def preprocess_time_series(
     )
 
     series = handle_missing(series, config.fill_method)
-    series = cap_outliers(series, config.outlier_cap_quantile)
+
+    lower_cap, upper_cap = outlier_caps(
+        series,
+        config.outlier_cap_quantile,
+        config.quantile_method,
+        config.sketch_rank_error
+    )
+    series = cap_outliers(
+        series, config.outlier_cap_quantile, caps=(lower_cap, upper_cap)
+    )
+
+    return series, {"lower_cap": float(lower_cap), "upper_cap": float(upper_cap)}
+
+
+def preprocess_time_series(
+    df: pd.DataFrame,
+    date_col: str,
+    target_col: str,
+    config: PreprocessConfig
+) -> Tuple[pd.Series, pd.Series]:
+
+    series, _ = preprocess_series(df, date_col, target_col, config)
 
     train, test = time_series_split(series, config.test_size)
 
     return train, test
+
+
+# ---------------------------
+# Panel preprocessing
+# ---------------------------
+# Long-format frames (series_col, date_col, target_col) are processed for
+# all series at once: rows are ordered by (series, date) and every step
+# works on the stacked arrays, using the series boundaries instead of a
+# groupby per series.
+def _panel_codes(column: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return column.cat.codes.to_numpy(), column.cat.categories
+    return pd.factorize(column, sort=True)
+
+
+def _group_bounds(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # First and last row of each row's series (series contiguous)
+    n = len(codes)
+    rows = np.arange(n)
+    change = codes[1:] != codes[:-1]
+
+    is_first = np.ones(n, dtype=bool)
+    is_first[1:] = change
+    is_last = np.ones(n, dtype=bool)
+    is_last[:-1] = change
+
+    first = np.maximum.accumulate(np.where(is_first, rows, 0))
+    last = np.minimum.accumulate(np.where(is_last, rows, n)[::-1])[::-1]
+    return first, last
+
+
+def _fixed_step(offset, tz) -> Optional[int]:
+    # Frequencies whose grid is start + k * step (in ns)
+    if isinstance(offset, pd.offsets.Tick):
+        return offset.nanos
+    if isinstance(offset, pd.offsets.Day) and tz is None:
+        return offset.n * 86_400 * 10**9
+    return None
+
+
+def validate_panel(
+    df: pd.DataFrame,
+    series_col: str = "series_id",
+    date_col: str = "date",
+    target_col: str = "value"
+):
+    if series_col not in df.columns:
+        raise ValueError(f"Missing series column: {series_col}")
+
+    validate_series(df, date_col, target_col)
+
+    if df[series_col].isna().any():
+        raise ValueError("Series column contains null values")
+
+
+def prepare_panel_index(
+    df: pd.DataFrame,
+    freq: str,
+    remove_duplicates: bool,
+    series_col: str = "series_id",
+    date_col: str = "date",
+    target_col: str = "value"
+) -> pd.DataFrame:
+    """
+    prepare_time_index for every series: sorted by (series, date),
+    de-duplicated and reindexed to freq from each series' own first
+    timestamp (asfreq semantics). series_col comes back categorical.
+    """
+    codes, labels = pd.factorize(df[series_col], sort=True)
+    dates = pd.DatetimeIndex(pd.to_datetime(df[date_col])).as_unit("ns")
+    tz = dates.tz
+    stamps = dates.asi8
+    values = df[target_col].to_numpy(dtype=np.float64)
+
+    same_series = codes[1:] == codes[:-1]
+    is_sorted = np.all(
+        (codes[1:] > codes[:-1]) | (same_series & (stamps[1:] >= stamps[:-1]))
+    )
+    if not is_sorted:
+        # Stable: the first of duplicated timestamps stays first
+        order = np.lexsort((stamps, codes))
+        codes, stamps, values = codes[order], stamps[order], values[order]
+        same_series = codes[1:] == codes[:-1]
+
+    duplicated = np.zeros(len(codes), dtype=bool)
+    duplicated[1:] = same_series & (stamps[1:] == stamps[:-1])
+    if duplicated.any():
+        if not remove_duplicates:
+            raise ValueError("Duplicate timestamps within a series")
+        keep = ~duplicated
+        codes, stamps, values = codes[keep], stamps[keep], values[keep]
+
+    n_series = len(labels)
+    first, last = _group_bounds(codes)
+    is_first = first == np.arange(len(codes))
+    start = stamps[is_first]
+    end = stamps[last[is_first]]
+
+    offset = pd.tseries.frequencies.to_offset(freq)
+    step = _fixed_step(offset, tz)
+
+    if step is not None:
+        relative = stamps - start[codes]
+        on_grid = relative % step == 0
+        positions = relative // step
+        lengths = (end - start) // step + 1
+    else:
+        # Calendar frequencies (W, ME, B, tz-aware D, ...): the grid of a
+        # series depends on its start, so build one per distinct start
+        starts, start_ids = np.unique(start, return_inverse=True)
+        ends = np.full(len(starts), np.iinfo(np.int64).min)
+        np.maximum.at(ends, start_ids, end)
+
+        grids = [
+            pd.date_range(
+                pd.Timestamp(s, tz="UTC").tz_convert(tz) if tz else pd.Timestamp(s),
+                pd.Timestamp(e, tz="UTC").tz_convert(tz) if tz else pd.Timestamp(e),
+                freq=offset
+            ).as_unit("ns").asi8
+            for s, e in zip(starts, ends)
+        ]
+        grid_offsets = np.concatenate([[0], np.cumsum([len(g) for g in grids])])
+        all_grid = np.concatenate(grids)
+
+        row_ids = start_ids[codes]
+        positions = np.empty(len(codes), dtype=np.int64)
+        lengths = np.empty(n_series, dtype=np.int64)
+        for i, grid in enumerate(grids):
+            rows = row_ids == i
+            positions[rows] = np.searchsorted(grid, stamps[rows])
+            members = start_ids == i
+            lengths[members] = np.searchsorted(grid, end[members], side="right")
+
+        found = all_grid[np.minimum(grid_offsets[row_ids] + positions, len(all_grid) - 1)]
+        on_grid = (positions < lengths[codes]) & (found == stamps)
+
+    out_offsets = np.concatenate([[0], np.cumsum(lengths)])
+    out_codes = np.repeat(np.arange(n_series), lengths)
+    within = np.arange(out_offsets[-1]) - out_offsets[out_codes]
+
+    if step is not None:
+        out_stamps = start[out_codes] + within * step
+    else:
+        out_stamps = all_grid[grid_offsets[start_ids[out_codes]] + within]
+
+    out_values = np.full(out_offsets[-1], np.nan)
+    out_values[out_offsets[codes[on_grid]] + positions[on_grid]] = values[on_grid]
+
+    out_dates = pd.DatetimeIndex(out_stamps.view("datetime64[ns]"))
+    if tz is not None:
+        out_dates = out_dates.tz_localize("UTC").tz_convert(tz)
+
+    panel = pd.DataFrame({
+        series_col: pd.Categorical.from_codes(out_codes, categories=labels),
+        date_col: out_dates,
+        target_col: out_values
+    })
+
+    logger.info(
+        "Panel time index prepared | Series: %d | Rows: %d | Freq: %s",
+        n_series,
+        len(panel),
+        freq
+    )
+
+    return panel
+
+
+def handle_missing_panel(
+    panel: pd.DataFrame,
+    method: str,
+    series_col: str = "series_id",
+    target_col: str = "value"
+) -> pd.DataFrame:
+    """
+    handle_missing within each series of a panel ordered by (series, date);
+    values never carry over from one series to the next
+    """
+    if method not in ("ffill", "bfill", "interpolate"):
+        raise ValueError(f"Unsupported fill method: {method}")
+
+    values = panel[target_col].to_numpy(dtype=np.float64)
+    missing = np.isnan(values)
+
+    if missing.any():
+        logger.warning("Missing values detected: %.2f%%", missing.mean() * 100)
+    else:
+        return panel
+
+    codes, _ = _panel_codes(panel[series_col])
+    first, last = _group_bounds(codes)
+    n = len(values)
+    rows = np.arange(n)
+
+    # Nearest valid row before / after each row, across the whole stack
+    prev_valid = np.maximum.accumulate(np.where(missing, -1, rows))
+    next_valid = np.minimum.accumulate(np.where(missing, n, rows)[::-1])[::-1]
+    has_prev = prev_valid >= first
+    has_next = next_valid <= last
+
+    prev_values = values[np.maximum(prev_valid, 0)]
+    next_values = values[np.minimum(next_valid, n - 1)]
+
+    if method == "ffill":
+        filled = np.where(has_prev, prev_values, np.nan)
+    elif method == "bfill":
+        filled = np.where(has_next, next_values, np.nan)
+    else:
+        # Linear in position; past the last valid value it is carried forward
+        span = np.where(has_next & has_prev, next_valid - prev_valid, 1)
+        weight = (rows - prev_valid) / np.maximum(span, 1)
+        interpolated = prev_values + (next_values - prev_values) * weight
+        filled = np.where(
+            has_prev, np.where(has_next, interpolated, prev_values), np.nan
+        )
+
+    panel = panel.copy()
+    panel[target_col] = np.where(missing, filled, values)
+    return panel
+
+
+def panel_outlier_caps(
+    panel: pd.DataFrame,
+    upper_quantile: float,
+    series_col: str = "series_id",
+    target_col: str = "value"
+) -> pd.DataFrame:
+    """
+    Exact per-series (lower_cap, upper_cap), as Series.quantile with
+    linear interpolation, from one sort of the stacked values
+    """
+    values = panel[target_col].to_numpy(dtype=np.float64)
+    codes, labels = _panel_codes(panel[series_col])
+    n_series = len(labels)
+
+    # Sort within each series by (series, global rank): one argsort of
+    # floats and one of int keys, several times faster than lexsort.
+    # NaNs rank last, so they end up last within each series
+    n = len(values)
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.argsort(values)] = np.arange(n)
+    sorted_values = values[np.argsort(codes.astype(np.int64) * n + rank)]
+    sizes = np.bincount(codes, minlength=n_series)
+    n_valid = np.bincount(codes, weights=~np.isnan(values), minlength=n_series).astype(np.int64)
+    group_start = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    def quantile(q):
+        h = (n_valid - 1) * q
+        lo = np.floor(h).astype(np.int64)
+        hi = np.minimum(lo + 1, n_valid - 1)
+        t = h - lo
+        a = sorted_values[np.clip(group_start + lo, 0, max(n - 1, 0))]
+        b = sorted_values[np.clip(group_start + hi, 0, max(n - 1, 0))]
+        # Same lerp as numpy.quantile
+        result = np.where(t >= 0.5, b - (b - a) * (1 - t), a + (b - a) * t)
+        return np.where(n_valid > 0, result, np.nan)
+
+    return pd.DataFrame(
+        {
+            "lower_cap": quantile(1 - upper_quantile),
+            "upper_cap": quantile(upper_quantile)
+        },
+        index=pd.Index(labels, name=series_col)
+    )
+
+
+def cap_outliers_panel(
+    panel: pd.DataFrame,
+    upper_quantile: float,
+    caps: Optional[pd.DataFrame] = None,
+    series_col: str = "series_id",
+    target_col: str = "value"
+) -> pd.DataFrame:
+    """cap_outliers per series; series without caps are left as they are"""
+    if caps is None:
+        caps = panel_outlier_caps(panel, upper_quantile, series_col, target_col)
+
+    codes, labels = _panel_codes(panel[series_col])
+    caps = caps.reindex(labels)
+    lower_cap = caps["lower_cap"].fillna(-np.inf).to_numpy()[codes]
+    upper_cap = caps["upper_cap"].fillna(np.inf).to_numpy()[codes]
+
+    values = panel[target_col].to_numpy(dtype=np.float64)
+    outliers = ((values > upper_cap) | (values < lower_cap)).sum()
+
+    if outliers > 0:
+        logger.info("Capping %d outliers", outliers)
+
+    panel = panel.copy()
+    panel[target_col] = np.clip(values, lower_cap, upper_cap)
+    return panel
+
+
+def preprocess_panel(
+    df: pd.DataFrame,
+    config: PreprocessConfig,
+    series_col: str = "series_id",
+    date_col: str = "date",
+    target_col: str = "value"
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    preprocess_series for every series of a long-format frame in one
+    pass. Returns the cleaned panel, ordered by (series, date) and ready
+    for build_panel_features, and the per-series outlier caps. Caps are
+    always exact (quantile_method only applies to single series).
+    """
+    validate_panel(df, series_col, date_col, target_col)
+
+    panel = prepare_panel_index(
+        df,
+        config.freq,
+        config.remove_duplicates,
+        series_col,
+        date_col,
+        target_col
+    )
+
+    panel = handle_missing_panel(panel, config.fill_method, series_col, target_col)
+
+    caps = panel_outlier_caps(panel, config.outlier_cap_quantile, series_col, target_col)
+    panel = cap_outliers_panel(
+        panel, config.outlier_cap_quantile, caps, series_col, target_col
+    )
+
+    return panel, caps
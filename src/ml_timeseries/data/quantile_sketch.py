@@ -0,0 +1,193 @@
+# src/ml_timeseries/data/quantile_sketch.py
+"""
+Streaming quantile sketch (KLL) for out-of-core preprocessing
+
+The sketch keeps O(k) items in levels of compactors: an item at level h
+stands for 2**h original values. When a level overflows it is sorted and
+every other item (random offset) is promoted, so updates, merges and
+queries never need the full data. Rank error is typically about 1.7 / k
+of n (k=200 -> ~0.85%), independent of n.
+
+The bound is probabilistic: compaction offsets are random, so single
+runs can exceed 1.7 / k (by up to ~1.5x over many seeds). k_for_error
+sizes k with a safety factor to keep the error under the target.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+import json
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_K = 200
+MIN_CAPACITY = 8
+CAPACITY_DECAY = 2.0 / 3.0
+
+# Typical rank error is RANK_ERROR_CONSTANT / k; the safety factor covers
+# the random spread (worst case over 30 seeds, single and merged sketches,
+# stays within ~85% of the target)
+RANK_ERROR_CONSTANT = 1.7
+SAFETY_FACTOR = 1.75
+
+
+def k_for_error(rank_error: float) -> int:
+    """
+    Sketch size k for a target normalized rank error (e.g. 0.01 = 1%),
+    met with high probability rather than guaranteed
+    """
+    return max(MIN_CAPACITY, int(np.ceil(SAFETY_FACTOR * RANK_ERROR_CONSTANT / rank_error)))
+
+
+class QuantileSketch:
+    """
+    Mergeable, serializable KLL quantile sketch.
+
+        sketch = QuantileSketch(k=k_for_error(0.005))
+        for chunk in chunks:
+            sketch.update(chunk)
+        lower, upper = sketch.quantile([0.01, 0.99])
+
+    NaN and infinite values are ignored. The minimum and maximum are
+    tracked exactly.
+    """
+
+    def __init__(self, k: int = DEFAULT_K, seed: Optional[int] = 0):
+        self.k = int(k)
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    # -------------------------------------------------
+    # Compaction
+    # -------------------------------------------------
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(MIN_CAPACITY, int(np.ceil(self.k * CAPACITY_DECAY ** depth)))
+
+    def _compact(self, level: int) -> None:
+        items = np.sort(self.levels[level])
+
+        # An odd item out stays at this level with its weight
+        odd = len(items) % 2
+        promoted = items[odd:][self._rng.integers(2)::2]
+
+        if level + 1 == len(self.levels):
+            self.levels.append(np.empty(0))
+        self.levels[level] = items[:odd]
+        self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+
+    def _compress(self) -> None:
+        # Compact the lowest overflowing level until every level fits;
+        # each compaction halves its items, so this terminates
+        while True:
+            for level in range(len(self.levels)):
+                if len(self.levels[level]) > self._capacity(level):
+                    self._compact(level)
+                    break
+            else:
+                return
+
+    # -------------------------------------------------
+    # Updates
+    # -------------------------------------------------
+    def update(self, values) -> "QuantileSketch":
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return self
+
+        self.n += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        """Fold another sketch (e.g. from another worker) into this one"""
+        if other.k != self.k:
+            raise ValueError(f"Cannot merge sketches with k={self.k} and k={other.k}")
+
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, items in enumerate(other.levels):
+            self.levels[level] = np.concatenate([self.levels[level], items])
+
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    # -------------------------------------------------
+    # Queries
+    # -------------------------------------------------
+    def _weighted_items(self) -> Tuple[np.ndarray, np.ndarray]:
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([
+            np.full(len(level_items), 2.0 ** level)
+            for level, level_items in enumerate(self.levels)
+        ])
+        order = np.argsort(items, kind="stable")
+        return items[order], np.cumsum(weights[order])
+
+    def quantile(self, q: Union[float, Iterable[float]]):
+        """Approximate quantile(s); exact at q=0 and q=1"""
+        scalar = np.ndim(q) == 0
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+
+        if self.n == 0:
+            result = np.full(len(q), np.nan)
+        else:
+            items, cum_weights = self._weighted_items()
+            positions = np.searchsorted(cum_weights, q * cum_weights[-1], side="left")
+            result = items[np.minimum(positions, len(items) - 1)]
+            result = np.where(q <= 0, self.min, np.where(q >= 1, self.max, result))
+
+        return float(result[0]) if scalar else result
+
+    def rank(self, value: float) -> float:
+        """Approximate fraction of values <= value"""
+        if self.n == 0:
+            return np.nan
+        items, cum_weights = self._weighted_items()
+        position = np.searchsorted(items, value, side="right")
+        return float(cum_weights[position - 1] / cum_weights[-1]) if position else 0.0
+
+    @property
+    def size(self) -> int:
+        """Items retained (memory is O(k) regardless of n)"""
+        return sum(len(items) for items in self.levels)
+
+    # -------------------------------------------------
+    # Serialization
+    # -------------------------------------------------
+    def to_dict(self) -> Dict:
+        return {
+            "k": self.k,
+            "n": self.n,
+            "min": self.min if self.n else None,
+            "max": self.max if self.n else None,
+            "levels": [items.tolist() for items in self.levels]
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict, seed: Optional[int] = 0) -> "QuantileSketch":
+        sketch = cls(k=state["k"], seed=seed)
+        sketch.n = state["n"]
+        sketch.min = state["min"] if state["min"] is not None else np.inf
+        sketch.max = state["max"] if state["max"] is not None else -np.inf
+        sketch.levels = [np.asarray(items, dtype=np.float64) for items in state["levels"]]
+        return sketch
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, payload: str, seed: Optional[int] = 0) -> "QuantileSketch":
+        return cls.from_dict(json.loads(payload), seed=seed)
@@ -0,0 +1,155 @@
+# src/ml_timeseries/data/series_store.py
+"""
+Memory-mapped store of preprocessed series
+
+A store is a directory with values.npy, timestamps.npy and meta.json
+(name, frequency, time zone, the PreprocessConfig and the fitted
+outlier caps).
+Arrays are written contiguously and opened memory-mapped, so training,
+inference and backtests reuse the preprocessed series without parsing
+or cleaning the raw data again.
+"""
+
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+import json
+import os
+import shutil
+import logging
+import pandas as pd
+import numpy as np
+
+from data.preprocess import (
+    PreprocessConfig,
+    preprocess_series,
+    time_series_split,
+)
+
+logger = logging.getLogger(__name__)
+
+
+META_FILE = "meta.json"
+VALUES_FILE = "values.npy"
+TIMESTAMPS_FILE = "timestamps.npy"
+FORMAT_VERSION = 1
+
+
+# ---------------------------
+# Write
+# ---------------------------
+def write_meta(
+    path,
+    name,
+    n_obs: int,
+    freq: Optional[str],
+    tz=None,
+    config: Optional[PreprocessConfig] = None,
+    state: Optional[Dict[str, float]] = None,
+    index_name: Optional[str] = None
+) -> dict:
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "name": name,
+        "n_obs": n_obs,
+        "freq": freq,
+        "tz": str(tz) if tz is not None else None,
+        "index_name": index_name,
+        "config": asdict(config) if config is not None else None,
+        "state": state or {}
+    }
+    with open(Path(path) / META_FILE, "w") as f:
+        json.dump(meta, f, indent=2, default=str)
+    return meta
+
+
+def save_series(
+    series: pd.Series,
+    path,
+    config: Optional[PreprocessConfig] = None,
+    state: Optional[Dict[str, float]] = None
+) -> Path:
+    """
+    Write a preprocessed series (DatetimeIndex) with its preprocessing
+    config and fitted state. The directory is replaced atomically.
+    """
+    path = Path(path)
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    tmp_path.mkdir(parents=True)
+
+    index = pd.DatetimeIndex(series.index)
+    np.save(tmp_path / VALUES_FILE, np.ascontiguousarray(series.to_numpy()))
+    np.save(tmp_path / TIMESTAMPS_FILE, np.ascontiguousarray(index.values))
+
+    write_meta(
+        tmp_path,
+        name=series.name,
+        n_obs=len(series),
+        freq=index.freqstr if index.freq is not None else (
+            config.freq if config is not None else None
+        ),
+        tz=index.tz,
+        config=config,
+        state=state,
+        index_name=index.name
+    )
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+
+    logger.info("Series stored | %s | Rows: %d", path, len(series))
+    return path
+
+
+def preprocess_to_store(
+    df: pd.DataFrame,
+    date_col: str,
+    target_col: str,
+    config: PreprocessConfig,
+    path
+) -> pd.Series:
+    """Preprocess the raw frame once and persist the cleaned series"""
+    series, state = preprocess_series(df, date_col, target_col, config)
+    save_series(series, path, config, state)
+    return series
+
+
+# ---------------------------
+# Read
+# ---------------------------
+def load_meta(path) -> dict:
+    with open(Path(path) / META_FILE, "r") as f:
+        return json.load(f)
+
+
+def load_series(path, mmap: bool = True) -> Tuple[pd.Series, dict]:
+    """
+    (series, meta) from a store. With mmap=True the values and timestamps
+    stay on disk and are paged in on access; the Series wraps them
+    without copying.
+    """
+    path = Path(path)
+    meta = load_meta(path)
+    mode = "r" if mmap else None
+
+    values = np.load(path / VALUES_FILE, mmap_mode=mode)
+    timestamps = np.load(path / TIMESTAMPS_FILE, mmap_mode=mode)
+
+    # Timestamps are stored as naive UTC; the frequency is validated on
+    # the local index (a daily grid is not a fixed UTC step across DST)
+    index = pd.DatetimeIndex(timestamps, name=meta.get("index_name"), copy=False)
+    if meta.get("tz"):
+        index = index.tz_localize("UTC").tz_convert(meta["tz"])
+    if meta["freq"] is not None:
+        index.freq = meta["freq"]
+
+    series = pd.Series(values, index=index, name=meta["name"], copy=False)
+    return series, meta
+
+
+def load_split(path, mmap: bool = True) -> Tuple[pd.Series, pd.Series]:
+    """Train / test views of a stored series, split with its stored test_size"""
+    series, meta = load_series(path, mmap)
+    config = meta["config"] or {}
+    return time_series_split(series, config.get("test_size", PreprocessConfig.test_size))
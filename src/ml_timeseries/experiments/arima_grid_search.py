@@ -1,67 +1,635 @@
 # experiments/arima_grid_search.py
 
-import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import partial
+
 import numpy as np
 from statsmodels.tsa.statespace.sarimax import SARIMAX
 
-def grid_search(
+from experiments.candidate_cache import fingerprint_data
+
+
+class CandidateTimeout(Exception):
+    """Raised inside the optimizer callback once a fit exceeds its budget"""
+    pass
+
+
+# ============================================================
+# SINGLE CANDIDATE
+# ============================================================
+
+def build_sarimax(y, exog, order, seasonal_order=None):
+    kwargs = {}
+    if seasonal_order is not None:
+        kwargs["seasonal_order"] = seasonal_order
+
+    return SARIMAX(
+        y,
+        exog=exog,
+        order=order,
+        enforce_stationarity=False,
+        enforce_invertibility=False,
+        **kwargs
+    )
+
+
+def score_results(results, metric):
+    return results.aic if metric == "aic" else results.bic
+
+
+# Starting value for AR/MA lags the donor does not have. Exactly zero
+# puts the optimizer on a flat ridge of the likelihood and tends to end
+# in a worse local optimum than a cold start.
+WARM_START_LAG = 0.01
+
+
+def warm_start_params(model, donor):
+    """
+    Starting parameters for `model` taken from a fitted nested candidate.
+
+    Parameters shared with the donor are copied over and the extra AR/MA
+    lags start at a small nonzero value, so the optimizer starts next to
+    the nested model's optimum. Anything else keeps the default starting
+    value.
+    """
+    donor_params = dict(zip(donor["param_names"], donor["params"]))
+    start_params = np.array(model.start_params, dtype=float)
+
+    for i, name in enumerate(model.param_names):
+        if name in donor_params:
+            start_params[i] = donor_params[name]
+        elif name.startswith(("ar.", "ma.")):
+            start_params[i] = WARM_START_LAG
+
+    return start_params
+
+
+def _start_loglike(model, params):
+    try:
+        llf = model.loglike(params)
+    except Exception:
+        return -np.inf
+    return llf if np.isfinite(llf) else -np.inf
+
+
+def _keep_warm_fit(results, donor, candidate):
+    """
+    A warm fit is kept only if it converged and, for a nested donor fitted
+    on the same data, reached at least the donor's likelihood (the
+    candidate contains the donor, so anything lower is a poor optimum)
+    """
+    if not results.mle_retvals.get("converged", True):
+        return False
+    if (donor["order"], donor["seasonal_order"]) == candidate:
+        # A prior from an earlier, shorter series: likelihoods differ
+        return True
+    donor_llf = donor.get("llf")
+    return donor_llf is None or results.llf >= donor_llf
+
+
+def fit_candidate(
     y,
-    exog=None,
-    order_grid=None,
-    seasonal_order_grid=None,
-    metric="aic"
+    exog,
+    order,
+    seasonal_order=None,
+    metric="aic",
+    timeout=None,
+    donor=None
 ):
-    best_score = np.inf
-    best_model = None
-    best_order = None
-    best_seasonal_order = None
+    """
+    Fit one SARIMAX candidate and return (record, results).
+
+    The timeout is a wall-clock budget in seconds, checked after every
+    optimizer iteration: model construction, the state-space
+    initialization and the iteration in progress are not interrupted, so
+    a fit can overrun the budget by that much. Failed or timed-out fits
+    are reported through record["status"] instead of raising, with
+    results set to None.
+
+    If a donor record is given the optimizer is warm-started from it,
+    unless the default start is already more likely. A warm fit that does
+    not converge or ends below its nested donor's likelihood is redone
+    from the default start and the better of the two is kept. This keeps
+    warm fits from settling in poorer optima than cold ones in most
+    cases, but a different local optimum remains possible; search with
+    warm_start=False when results must match cold fits exactly.
+    """
+    record = {
+        "order": order,
+        "seasonal_order": seasonal_order,
+        "score": np.inf,
+        "status": "failed",
+        "fit_time": None,
+        "n_iter": None,
+        "warm_start_from": None,
+        "params": None,
+        "param_names": None,
+        "llf": None,
+        "cached": False
+    }
+    results = None
+    start = time.perf_counter()
+
+    def _check_deadline(_params):
+        if time.perf_counter() - start > timeout:
+            raise CandidateTimeout()
+
+    callback = _check_deadline if timeout is not None else None
 
-    for order in order_grid:
-        if seasonal_order_grid is None:
-            try:
-                model = SARIMAX(
-                    y,
-                    exog=exog,
-                    order=order,
-                    enforce_stationarity=False,
-                    enforce_invertibility=False
+    try:
+        model = build_sarimax(y, exog, order, seasonal_order)
+
+        start_params = None
+        if donor is not None:
+            start_params = warm_start_params(model, donor)
+            default_params = np.asarray(model.start_params, dtype=float)
+            if _start_loglike(model, default_params) > _start_loglike(model, start_params):
+                start_params = None
+
+        results = model.fit(start_params=start_params, disp=False, callback=callback)
+        record["n_iter"] = results.mle_retvals.get("iterations")
+
+        if start_params is not None:
+            warm_from = (donor["order"], donor["seasonal_order"])
+            if not _keep_warm_fit(results, donor, (order, seasonal_order)):
+                cold = model.fit(disp=False, callback=callback)
+                record["n_iter"] = (record["n_iter"] or 0) + (
+                    cold.mle_retvals.get("iterations") or 0
                 )
-                results = model.fit(disp=False)
-                score = results.aic if metric == "aic" else results.bic
+                if score_results(cold, metric) <= score_results(results, metric):
+                    results, warm_from = cold, None
+            record["warm_start_from"] = warm_from
 
-                if score < best_score:
-                    best_score = score
-                    best_model = results
-                    best_order = order
+        score = score_results(results, metric)
 
-            except:
-                continue
+        if np.isfinite(score):
+            record["score"] = score
+            record["status"] = "ok"
+            record["params"] = np.asarray(results.params)
+            record["param_names"] = list(model.param_names)
+            record["llf"] = float(results.llf)
         else:
-            for seasonal_order in seasonal_order_grid:
-                try:
-                    model = SARIMAX(
-                        y,
-                        exog=exog,
-                        order=order,
-                        seasonal_order=seasonal_order,
-                        enforce_stationarity=False,
-                        enforce_invertibility=False
-                    )
-                    results = model.fit(disp=False)
-                    score = results.aic if metric == "aic" else results.bic
-
-                    if score < best_score:
-                        best_score = score
-                        best_model = results
-                        best_order = order
-                        best_seasonal_order = seasonal_order
-
-                except:
-                    continue
+            results = None
+
+    except CandidateTimeout:
+        record["status"] = "timeout"
+        results = None
+    except Exception:
+        results = None
+
+    record["fit_time"] = time.perf_counter() - start
+    return record, results
+
+
+def _fit_candidate_worker(y, exog, metric, timeout, task):
+    # Only the lightweight record crosses the process boundary
+    (order, seasonal_order), donor = task
+    record, _ = fit_candidate(
+        y, exog, order, seasonal_order, metric, timeout, donor
+    )
+    return record
+
+
+# ============================================================
+# HELPERS
+# ============================================================
+
+def expand_candidates(order_grid, seasonal_order_grid=None):
+    if seasonal_order_grid is None:
+        return [(order, None) for order in order_grid]
+
+    return [
+        (order, seasonal_order)
+        for order in order_grid
+        for seasonal_order in seasonal_order_grid
+    ]
+
+
+def resolve_n_jobs(n_jobs):
+    if n_jobs is None:
+        return 1
+    if n_jobs < 0:
+        return max(1, (os.cpu_count() or 1) + 1 + n_jobs)
+    return max(1, n_jobs)
+
+
+def select_best(records):
+    """
+    Pick the best successful record. Ties are broken by position in the
+    candidate list, so the winner never depends on completion order.
+    """
+    best_idx = None
+    for idx, record in enumerate(records):
+        if record["status"] != "ok":
+            continue
+        if best_idx is None or record["score"] < records[best_idx]["score"]:
+            best_idx = idx
+    return best_idx
+
+
+# ============================================================
+# CANDIDATE EVALUATION
+# ============================================================
+
+def _nesting_level(candidate):
+    order, seasonal_order = candidate
+    level = order[0] + order[2]
+    if seasonal_order is not None:
+        level += seasonal_order[0] + seasonal_order[2]
+    return level
+
+
+def _is_nested(inner, outer):
+    # Same differencing and period, no more AR/MA lags on any axis
+    (p, d, q), seasonal = inner
+    (P_o, d_o, Q_o), seasonal_o = outer
+    if d != d_o or p > P_o or q > Q_o:
+        return False
+    if (seasonal is None) != (seasonal_o is None):
+        return False
+    if seasonal is None:
+        return True
+    return (
+        seasonal[1] == seasonal_o[1]
+        and seasonal[3] == seasonal_o[3]
+        and seasonal[0] <= seasonal_o[0]
+        and seasonal[2] <= seasonal_o[2]
+    )
+
+
+def select_donor(candidate, donors):
+    """
+    Closest successfully fitted nested candidate (most lags, then best
+    score, then earliest), or None.
+    """
+    best = None
+    for record in donors:
+        if record["status"] != "ok":
+            continue
+        key = (record["order"], record["seasonal_order"])
+        if key == candidate or not _is_nested(key, candidate):
+            continue
+        rank = (-_nesting_level(key), record["score"])
+        if best is None or rank < best[0]:
+            best = (rank, record)
+    return best[1] if best is not None else None
+
+
+def task_pool(n_jobs, n_tasks=None):
+    """
+    Process pool for candidate fits (created once per search and reused
+    across batches), or a null context when fitting in-process
+    """
+    n_jobs = resolve_n_jobs(n_jobs)
+    if n_tasks is not None:
+        n_jobs = min(n_jobs, max(1, n_tasks))
+    if n_jobs == 1:
+        return nullcontext(None)
+    return ProcessPoolExecutor(max_workers=n_jobs)
+
+
+def _run_tasks(y, exog, tasks, metric, timeout, fitted, executor=None):
+    if executor is None or len(tasks) == 1:
+        records = []
+        for (order, seasonal_order), donor in tasks:
+            record, results = fit_candidate(
+                y, exog, order, seasonal_order, metric, timeout, donor
+            )
+            records.append(record)
+
+            if fitted is not None and results is not None:
+                kept = next(iter(fitted.values()), None)
+                if kept is None or record["score"] < score_results(kept, metric):
+                    fitted.clear()
+                    fitted[(order, seasonal_order)] = results
+        return records
+
+    worker = partial(_fit_candidate_worker, y, exog, metric, timeout)
+    # map() yields in submission order regardless of finish order
+    return list(executor.map(worker, tasks))
+
+
+def evaluate_candidates(
+    y,
+    exog,
+    candidates,
+    metric="aic",
+    n_jobs=1,
+    timeout=None,
+    fitted=None,
+    warm_start=False,
+    donors=(),
+    cache=None,
+    priors=None,
+    executor=None
+):
+    """
+    Fit a batch of (order, seasonal_order) candidates, in-process or over a
+    process pool. Returns the records in candidate order.
+
+    Pass an executor from task_pool to reuse one pool across calls;
+    otherwise a pool is created for this batch when n_jobs > 1.
+
+    When running in-process, the best fitted results seen so far are kept in
+    `fitted` (keyed by candidate) so the winner does not need rebuilding.
+
+    With warm_start, candidates are fitted in waves of increasing lag count
+    so each one can start from the closest nested order already fitted
+    (in this batch or in `donors`).
+
+    With a CandidateCache, cached records are reused and new ones stored,
+    separately for warm and cold searches. `priors` maps candidates to
+    records from an earlier search on a prefix of the series; with
+    warm_start, those candidates start from their previous parameters.
+    """
+    records = [None] * len(candidates)
+    donors = list(donors)
+    priors = priors or {}
+
+    data_key = None
+    if cache is not None:
+        data_key = fingerprint_data(y, exog)
+        for i, candidate in enumerate(candidates):
+            records[i] = cache.get(data_key, candidate, metric, warm_start)
+        donors += [record for record in records if record is not None]
+
+    pending = [i for i, record in enumerate(records) if record is None]
+
+    if warm_start:
+        levels = sorted({_nesting_level(candidates[i]) for i in pending})
+        waves = [
+            [i for i in pending if _nesting_level(candidates[i]) == level]
+            for level in levels
+        ]
+    else:
+        waves = [pending] if pending else []
+
+    pool = task_pool(n_jobs, len(pending)) if executor is None else nullcontext(executor)
+    with pool as executor:
+        for positions in waves:
+            tasks = []
+            for i in positions:
+                donor = None
+                if warm_start:
+                    donor = priors.get(candidates[i]) or select_donor(candidates[i], donors)
+                tasks.append((candidates[i], donor))
+
+            wave = _run_tasks(y, exog, tasks, metric, timeout, fitted, executor)
+
+            for i, record in zip(positions, wave):
+                records[i] = record
+                if cache is not None:
+                    cache.put(data_key, candidates[i], metric, record, warm_start)
+            donors += wave
+
+    return records
+
+
+def load_priors(cache, y, exog, metric):
+    """Ranked records (best first) from an earlier search on this series"""
+    if cache is None:
+        return []
+    return cache.load_ranking(y, exog, metric)
+
+
+def summarize_search(y, exog, records, fitted=None):
+    best_idx = select_best(records)
+
+    best_model = None
+    best_order = None
+    best_seasonal_order = None
+    best_score = np.inf
+
+    if best_idx is not None:
+        best = records[best_idx]
+        best_order = best["order"]
+        best_seasonal_order = best["seasonal_order"]
+        best_score = best["score"]
+
+        best_model = (fitted or {}).get((best_order, best_seasonal_order))
+        if best_model is None:
+            # Rebuild the winner from its parameters without re-optimizing
+            best_model = build_sarimax(
+                y, exog, best_order, best_seasonal_order
+            ).smooth(best["params"])
 
     return {
         "best_model": best_model,
         "best_order": best_order,
         "best_seasonal_order": best_seasonal_order,
-        "best_score": best_score
+        "best_score": best_score,
+        "candidates": records
     }
+
+
+# ============================================================
+# GRID SEARCH
+# ============================================================
+
+def grid_search(
+    y,
+    exog=None,
+    order_grid=None,
+    seasonal_order_grid=None,
+    metric="aic",
+    n_jobs=1,
+    timeout=None,
+    warm_start=False,
+    cache=None
+):
+    """
+    Exhaustive SARIMAX order search.
+
+    n_jobs     : number of worker processes (-1 = all cores, 1 = in-process)
+    timeout    : per-candidate wall-clock budget in seconds (None = unlimited),
+                 checked between optimizer iterations (see fit_candidate)
+    warm_start : start each fit from the closest nested order already fitted
+    cache      : optional CandidateCache; identical reruns skip all fits and,
+                 with warm_start, reruns on an extended series start from
+                 the cached params
+
+    Every candidate record carries the optimizer iteration count (n_iter).
+    """
+    candidates = expand_candidates(order_grid, seasonal_order_grid)
+    priors = {
+        (r["order"], r["seasonal_order"]): r
+        for r in load_priors(cache, y, exog, metric)
+    }
+
+    fitted = {}
+    records = evaluate_candidates(
+        y,
+        exog,
+        candidates,
+        metric,
+        n_jobs,
+        timeout,
+        fitted,
+        warm_start,
+        cache=cache,
+        priors=priors
+    )
+
+    if cache is not None:
+        cache.save_ranking(y, exog, metric, records)
+
+    return summarize_search(y, exog, records, fitted)
+
+
+# ============================================================
+# STEPWISE SEARCH (Hyndman-Khandakar style)
+# ============================================================
+
+# Seed (p, q) and (P, Q) pairs, as in forecast::auto.arima
+STEPWISE_SEEDS = [
+    ((2, 2), (1, 1)),
+    ((0, 0), (0, 0)),
+    ((1, 0), (1, 0)),
+    ((0, 1), (0, 1))
+]
+
+# Same default model budget as forecast::auto.arima
+DEFAULT_MAX_FITS = 94
+
+
+def _axis_values(grid, n_axes):
+    # Allowed values per axis, taken from the grid the model was built with
+    return [sorted({item[axis] for item in grid}) for axis in range(n_axes)]
+
+
+def _snap(value, allowed):
+    # Closest allowed value, preferring the smaller one on ties
+    return min(allowed, key=lambda a: (abs(a - value), a))
+
+
+def _step(value, allowed, direction):
+    pos = allowed.index(value) + direction
+    if 0 <= pos < len(allowed):
+        return allowed[pos]
+    return None
+
+
+def _to_candidate(point, m):
+    order = tuple(point[:3])
+    if m is None:
+        return order, None
+    return order, tuple(point[3:]) + (m,)
+
+
+def _neighbours(point, axes):
+    """
+    Orders one step away from `point` along each axis, plus the joint
+    p/q and P/Q moves used by auto.arima.
+    """
+    moves = [[axis] for axis in range(len(axes))]
+    moves.append([0, 2])
+    if len(axes) == 6:
+        moves.append([3, 5])
+
+    result = []
+    for axes_to_move in moves:
+        for direction in (-1, 1):
+            candidate = list(point)
+            for axis in axes_to_move:
+                candidate[axis] = _step(point[axis], axes[axis], direction)
+            if None not in candidate:
+                result.append(tuple(candidate))
+    return result
+
+
+def stepwise_search(
+    y,
+    exog=None,
+    order_grid=None,
+    seasonal_order_grid=None,
+    metric="aic",
+    max_fits=DEFAULT_MAX_FITS,
+    n_jobs=1,
+    timeout=None,
+    warm_start=False,
+    cache=None
+):
+    """
+    Greedy neighbourhood search over the values spanned by the grids.
+
+    Starts from the auto.arima seed orders (snapped to the allowed values
+    and the lowest allowed d / D), then repeatedly evaluates every unvisited
+    neighbour of the current best order and moves while the score improves.
+    At most `max_fits` models are fitted.
+
+    With a cache holding a ranking for a prefix of this series, the previous
+    best order is tried first and, with warm_start, known candidates start
+    from their previous parameters.
+    """
+    axes = _axis_values(order_grid, 3)
+    m = None
+    if seasonal_order_grid is not None:
+        axes += _axis_values(seasonal_order_grid, 3)
+        m = seasonal_order_grid[0][3]
+
+    seeds = []
+    for (p, q), (P, Q) in STEPWISE_SEEDS:
+        point = [_snap(p, axes[0]), axes[1][0], _snap(q, axes[2])]
+        if m is not None:
+            point += [_snap(P, axes[3]), axes[4][0], _snap(Q, axes[5])]
+        point = tuple(point)
+        if point not in seeds:
+            seeds.append(point)
+
+    ranking = load_priors(cache, y, exog, metric)
+    priors = {(r["order"], r["seasonal_order"]): r for r in ranking}
+
+    if ranking:
+        best = ranking[0]
+        point = tuple(best["order"]) + tuple((best["seasonal_order"] or ())[:3])
+        same_shape = len(point) == len(axes) and (
+            m is None or best["seasonal_order"][3] == m
+        )
+        if same_shape and all(v in allowed for v, allowed in zip(point, axes)):
+            seeds = [point] + [seed for seed in seeds if seed != point]
+
+    fitted = {}
+    records = []
+    visited = set()
+    batch = seeds
+    current_score = np.inf
+
+    with task_pool(n_jobs) as executor:
+        while batch:
+            batch = batch[:max(0, max_fits - len(records))]
+            if not batch:
+                break
+
+            visited.update(batch)
+            records += evaluate_candidates(
+                y,
+                exog,
+                [_to_candidate(point, m) for point in batch],
+                metric,
+                n_jobs,
+                timeout,
+                fitted,
+                warm_start,
+                donors=records,
+                cache=cache,
+                priors=priors,
+                executor=executor
+            )
+
+            best_idx = select_best(records)
+            if best_idx is None or records[best_idx]["score"] >= current_score:
+                break
+
+            best = records[best_idx]
+            current_score = best["score"]
+            current = tuple(best["order"]) + tuple((best["seasonal_order"] or ())[:3])
+
+            batch = [p for p in _neighbours(current, axes) if p not in visited]
+
+    if cache is not None:
+        cache.save_ranking(y, exog, metric, records)
+
+    return summarize_search(y, exog, records, fitted)
@@ -0,0 +1,279 @@
+# experiments/candidate_cache.py
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+DEFAULT_CACHE_DIR = Path("artifacts") / "candidate_cache"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Number of leading observations that identify a series across reruns
+LINEAGE_PREFIX = 32
+
+
+# ============================================================
+# FINGERPRINTS
+# ============================================================
+
+def _update_with_array(digest, values):
+    arr = np.ascontiguousarray(np.asarray(values, dtype=float))
+    digest.update(str(arr.shape).encode())
+    digest.update(arr.tobytes())
+
+
+def _update_with_index(digest, index):
+    if isinstance(index, pd.DatetimeIndex):
+        digest.update(index.asi8.tobytes())
+    else:
+        digest.update(np.asarray(index).astype(str).tobytes())
+
+
+def fingerprint_data(y, exog=None):
+    """
+    Hash of the series values and index plus the exog values and columns.
+    """
+    digest = hashlib.sha256()
+
+    _update_with_array(digest, y)
+    if isinstance(y, pd.Series):
+        _update_with_index(digest, y.index)
+
+    if exog is not None:
+        _update_with_array(digest, exog)
+        if isinstance(exog, pd.DataFrame):
+            digest.update(json.dumps([str(c) for c in exog.columns]).encode())
+
+    return digest.hexdigest()
+
+
+def _head(data, n):
+    if data is None:
+        return None
+    if isinstance(data, (pd.Series, pd.DataFrame)):
+        return data.iloc[:n]
+    return np.asarray(data)[:n]
+
+
+def candidate_key(data_key, candidate, metric, warm_start=False):
+    # Warm-started fits can settle in a different optimum than cold ones
+    order, seasonal_order = candidate
+    payload = json.dumps([
+        data_key,
+        list(order),
+        list(seasonal_order) if seasonal_order is not None else None,
+        metric,
+        bool(warm_start)
+    ])
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def lineage_key(y, exog, metric):
+    # Identifies "the same series, possibly extended" by its first points
+    head = fingerprint_data(_head(y, LINEAGE_PREFIX), _head(exog, LINEAGE_PREFIX))
+    return hashlib.sha256(f"{head}|{metric}".encode()).hexdigest()
+
+
+# ============================================================
+# SERIALIZATION
+# ============================================================
+
+def _as_tuple(value):
+    return tuple(value) if value is not None else None
+
+
+def _record_to_json(record):
+    return {
+        "order": list(record["order"]),
+        "seasonal_order": (
+            list(record["seasonal_order"])
+            if record["seasonal_order"] is not None else None
+        ),
+        "score": float(record["score"]),
+        "status": record["status"],
+        "n_iter": int(record["n_iter"]) if record["n_iter"] is not None else None,
+        "params": (
+            [float(v) for v in record["params"]]
+            if record["params"] is not None else None
+        ),
+        "param_names": record["param_names"],
+        "llf": float(record["llf"]) if record.get("llf") is not None else None
+    }
+
+
+def _record_from_json(entry):
+    return {
+        "order": _as_tuple(entry["order"]),
+        "seasonal_order": _as_tuple(entry["seasonal_order"]),
+        "score": entry["score"],
+        "status": entry["status"],
+        "fit_time": 0.0,
+        "n_iter": entry["n_iter"],
+        "warm_start_from": None,
+        "params": (
+            np.asarray(entry["params"]) if entry["params"] is not None else None
+        ),
+        "param_names": entry["param_names"],
+        "llf": entry.get("llf"),
+        "cached": True
+    }
+
+
+# ============================================================
+# CACHE
+# ============================================================
+
+class CandidateCache:
+    """
+    Content-addressed on-disk cache of grid-search candidate results.
+
+    Entries are keyed by a hash of (series, exog, order, seasonal order,
+    metric, warm start) and hold the score, parameters and convergence
+    status. The cache also keeps the last ranking per series lineage, so a
+    warm-started rerun on an extended series can start every candidate
+    from its previous fit.
+
+    Files are evicted least-recently-used once the cache exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._size = None
+
+        (self.cache_dir / "candidates").mkdir(parents=True, exist_ok=True)
+        (self.cache_dir / "rankings").mkdir(parents=True, exist_ok=True)
+
+    # --------------------------------------------------------
+    # File helpers
+    # --------------------------------------------------------
+    def _files(self):
+        return [
+            path
+            for sub in ("candidates", "rankings")
+            for path in (self.cache_dir / sub).glob("*.json")
+        ]
+
+    def _read(self, path):
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Bump the mtime so eviction follows last use
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def _write(self, path, entry):
+        # A unique temporary file per writer, so concurrent searches never
+        # interleave; it has no .json suffix and is never listed as an entry
+        tmp_path = None
+        try:
+            with tempfile.NamedTemporaryFile(
+                "w", dir=path.parent, prefix=f"{path.stem}.", suffix=".tmp", delete=False
+            ) as f:
+                tmp_path = Path(f.name)
+                json.dump(entry, f)
+
+            old_size = path.stat().st_size if path.exists() else 0
+            os.replace(tmp_path, path)
+        except BaseException:
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+            raise
+
+        if self._size is None:
+            self._size = self.size_bytes()
+        else:
+            self._size += path.stat().st_size - old_size
+
+        if self._size > self.max_bytes:
+            self.evict()
+
+    def size_bytes(self):
+        return sum(path.stat().st_size for path in self._files())
+
+    def evict(self):
+        """Drop least-recently-used files until under max_bytes"""
+        files = sorted(self._files(), key=lambda path: path.stat().st_mtime)
+        size = sum(path.stat().st_size for path in files)
+
+        for path in files:
+            if size <= self.max_bytes:
+                break
+            size -= path.stat().st_size
+            path.unlink()
+
+        self._size = size
+
+    def clear(self):
+        for path in self._files():
+            path.unlink()
+        self._size = 0
+
+    # --------------------------------------------------------
+    # Candidate records
+    # --------------------------------------------------------
+    def _candidate_path(self, data_key, candidate, metric, warm_start):
+        key = candidate_key(data_key, candidate, metric, warm_start)
+        return self.cache_dir / "candidates" / f"{key}.json"
+
+    def get(self, data_key, candidate, metric, warm_start=False):
+        path = self._candidate_path(data_key, candidate, metric, warm_start)
+        if not path.exists():
+            return None
+
+        entry = self._read(path)
+        return _record_from_json(entry) if entry is not None else None
+
+    def put(self, data_key, candidate, metric, record, warm_start=False):
+        # Timeouts depend on the budget, not the data, so they are not cached
+        if record["status"] == "timeout":
+            return
+
+        path = self._candidate_path(data_key, candidate, metric, warm_start)
+        self._write(path, _record_to_json(record))
+
+    # --------------------------------------------------------
+    # Rankings
+    # --------------------------------------------------------
+    def save_ranking(self, y, exog, metric, records):
+        ranked = sorted(
+            (r for r in records if r["status"] == "ok"),
+            key=lambda r: r["score"]
+        )
+        entry = {
+            "n_obs": len(y),
+            "data_key": fingerprint_data(y, exog),
+            "records": [_record_to_json(r) for r in ranked]
+        }
+        path = self.cache_dir / "rankings" / f"{lineage_key(y, exog, metric)}.json"
+        self._write(path, entry)
+
+    def load_ranking(self, y, exog, metric):
+        """
+        Ranked records from the last search on a prefix of this series
+        (or on this exact series), best first. Empty if none matches.
+        """
+        path = self.cache_dir / "rankings" / f"{lineage_key(y, exog, metric)}.json"
+        if not path.exists():
+            return []
+
+        entry = self._read(path)
+        if entry is None or entry["n_obs"] > len(y):
+            return []
+
+        n_obs = entry["n_obs"]
+        if fingerprint_data(_head(y, n_obs), _head(exog, n_obs)) != entry["data_key"]:
+            return []
+
+        return [_record_from_json(r) for r in entry["records"]]
@@ -1,20 +1,148 @@
 # experiments/model_comparison.py
 
+import time
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import wait
+
+import numpy as np
 import pandas as pd
 from Evaluation.Evaluate import evaluate_model
+from experiments.arima_grid_search import resolve_n_jobs
+from utils.exceptions import EvaluationError
+
+
+ON_ERROR_POLICIES = ("raise", "record", "skip")
+RESULT_COLUMNS = ["Model", "RMSE", "MAE", "MAPE", "Params", "FitTime", "PredictTime"]
 
 
 # ============================================================
 # MODEL COMPARISON
 # ============================================================
 
+def _evaluate_worker(model_name, model, y_train, y_test, steps, exog_train, exog_test):
+    metrics = evaluate_model(
+        model=model,
+        y_train=y_train,
+        y_test=y_test,
+        steps=steps,
+        exog_train=exog_train,
+        exog_test=exog_test,
+        model_name=model_name
+    )
+    # Send the fitted model back so it can be selected and refreshed
+    return metrics, model
+
+
+def _failure_row(model_name, error):
+    return {
+        "Model": model_name,
+        "RMSE": np.nan,
+        "MAE": np.nan,
+        "MAPE": np.nan,
+        "Params": None,
+        "FitTime": np.nan,
+        "PredictTime": np.nan,
+        "Error": error
+    }
+
+
+def _process_worker(conn, args):
+    # The "start" message lets the parent count the timeout from here
+    conn.send(("start", None))
+    try:
+        outcome = ("ok", _evaluate_worker(*args))
+    except Exception as e:
+        outcome = ("error", e)
+
+    try:
+        conn.send(outcome)
+    except Exception as e:
+        # Unpicklable result or exception: report it as a failure
+        conn.send(("error", RuntimeError(f"{outcome[0]} result not sent: {e!r}")))
+    finally:
+        conn.close()
+
+
+def _run_in_processes(tasks, n_jobs, timeout, verbose, stop_on_error):
+    """
+    Run {model_name: args} with at most n_jobs worker processes, one per
+    model. A model's timeout counts from when its worker starts it, so
+    models queued behind others are not charged for the wait, and an
+    overrunning worker is terminated on its own.
+
+    Returns {model_name: (status, payload)} with status "ok", "error" or
+    "timeout". With stop_on_error, no new model starts after a failure.
+    """
+    queue = list(tasks.items())
+    running = {}
+    outcomes = {}
+
+    def finish(conn, status, payload):
+        model_name, process, _ = running.pop(conn)
+        conn.close()
+        if status == "timeout":
+            process.terminate()
+        process.join()
+        outcomes[model_name] = (status, payload)
+
+    try:
+        while queue or running:
+            failed = any(status != "ok" for status, _ in outcomes.values())
+            while queue and len(running) < n_jobs and not (stop_on_error and failed):
+                model_name, args = queue.pop(0)
+                if verbose:
+                    print(f"Evaluating {model_name} ...")
+
+                recv_conn, send_conn = Pipe(duplex=False)
+                process = Process(target=_process_worker, args=(send_conn, args), daemon=True)
+                process.start()
+                send_conn.close()
+                running[recv_conn] = [model_name, process, None]
+
+            if not running:
+                break
+
+            deadlines = [task[2] for task in running.values() if task[2] is not None]
+            wait_time = None
+            if deadlines:
+                wait_time = max(0.0, min(deadlines) - time.perf_counter())
+
+            for conn in wait(list(running), timeout=wait_time):
+                try:
+                    status, payload = conn.recv()
+                except EOFError:
+                    exitcode = running[conn][1].exitcode
+                    finish(conn, "error", RuntimeError(f"worker exited with code {exitcode}"))
+                    continue
+
+                if status == "start":
+                    if timeout is not None:
+                        running[conn][2] = time.perf_counter() + timeout
+                else:
+                    finish(conn, status, payload)
+
+            now = time.perf_counter()
+            for conn, (_, _, deadline) in list(running.items()):
+                if deadline is not None and now >= deadline:
+                    finish(conn, "timeout", None)
+    finally:
+        for conn in list(running):
+            finish(conn, "timeout", None)
+
+    return outcomes
+
+
 def compare_models(
     models,
     y_train,
     y_test,
     steps,
     exog_train=None,
-    exog_test=None
+    exog_test=None,
+    verbose=True,
+    n_jobs=1,
+    timeout=None,
+    on_error="raise"
 ):
     """
     models = {
@@ -22,31 +150,138 @@ def compare_models(
         "SARIMA": SARIMAModel(),
         "HoltWinters": HoltWintersModel(...)
     }
+
+    n_jobs   : worker processes for evaluating models concurrently
+               (-1 = all cores, 1 = in-process)
+    timeout  : per-model wall-clock budget in seconds, counted from when
+               a worker starts that model (not from submission); an
+               overrunning worker is terminated. Enforcing it always uses
+               worker processes, one per model.
+    on_error : "raise"  - raise EvaluationError on the first failure
+               "record" - keep a row with NaN metrics and the error
+               "skip"   - leave the model out of the results (raises
+                          EvaluationError listing the errors if every
+                          model failed)
+
+    Fitted models replace the entries of `models`, as in-process fitting
+    would. FitTime / PredictTime (seconds) are reported next to the metrics.
     """
+    if on_error not in ON_ERROR_POLICIES:
+        raise ValueError(f"Unsupported on_error policy: {on_error}")
 
     results = []
+    failures = []
+
+    n_jobs = min(resolve_n_jobs(n_jobs), max(1, len(models)))
 
-    for model_name, model in models.items():
-        print(f"Evaluating {model_name} ...")
-
-        metrics = evaluate_model(
-            model=model,
-            y_train=y_train,
-            y_test=y_test,
-            steps=steps,
-            exog_train=exog_train,
-            exog_test=exog_test,
-            model_name=model_name
+    if n_jobs == 1 and timeout is None:
+        for model_name, model in models.items():
+            if verbose:
+                print(f"Evaluating {model_name} ...")
+
+            try:
+                metrics, _ = _evaluate_worker(
+                    model_name, model, y_train, y_test, steps, exog_train, exog_test
+                )
+                results.append(metrics)
+            except Exception as e:
+                if on_error == "raise":
+                    raise EvaluationError(f"{model_name} failed: {e!r}") from e
+                failures.append((model_name, repr(e)))
+    else:
+        tasks = {
+            model_name: (model_name, model, y_train, y_test, steps, exog_train, exog_test)
+            for model_name, model in models.items()
+        }
+        outcomes = _run_in_processes(
+            tasks, n_jobs, timeout, verbose, stop_on_error=(on_error == "raise")
         )
 
-        results.append(metrics)
+        # Collect in dict order so the results never depend on timing
+        for model_name in models:
+            if model_name not in outcomes:
+                continue
+            status, payload = outcomes[model_name]
+
+            if status == "ok":
+                metrics, fitted_model = payload
+                models[model_name] = fitted_model
+                results.append(metrics)
+            elif status == "timeout":
+                if on_error == "raise":
+                    raise EvaluationError(f"{model_name} timed out after {timeout}s")
+                failures.append((model_name, f"timeout after {timeout}s"))
+            else:
+                if on_error == "raise":
+                    raise EvaluationError(
+                        f"{model_name} failed: {payload!r}"
+                    ) from payload
+                failures.append((model_name, repr(payload)))
+
+    if not results and failures and on_error == "skip":
+        details = "; ".join(f"{name}: {error}" for name, error in failures)
+        raise EvaluationError(f"All models failed: {details}")
 
-    df_results = pd.DataFrame(results)
+    if on_error == "record":
+        for metrics in results:
+            metrics["Error"] = None
+        results += [_failure_row(name, error) for name, error in failures]
+
+    columns = RESULT_COLUMNS + (["Error"] if on_error == "record" else [])
+    df_results = pd.DataFrame(results, columns=columns if not results else None)
     df_results = df_results.sort_values("RMSE").reset_index(drop=True)
 
     return df_results
 
 
+# ============================================================
+# BEST MODEL SELECTION
+# ============================================================
+
+def get_best_model(df_results, models):
+    """
+    df_results is sorted by RMSE, so the first row is the winner
+    """
+    best_model_name = df_results.loc[0, "Model"]
+    return best_model_name, models[best_model_name]
+
+
+def _split_at(data, n):
+    if hasattr(data, "iloc"):
+        return data.iloc[:n], data.iloc[n:]
+    return data[:n], data[n:]
+
+
+def refit_best_model(best_model, y_full, y_train=None, exog_full=None):
+    """
+    Bring the selected model up to date with the full series.
+
+    If the model was fitted on y_train and y_full simply continues it, the
+    remaining points are absorbed with model.update() (parameters held
+    fixed) instead of a full refit. Otherwise the model is refitted.
+    """
+    if y_train is not None and hasattr(best_model, "update"):
+        y_head, y_new = _split_at(y_full, len(y_train))
+
+        if np.array_equal(np.asarray(y_head), np.asarray(y_train)):
+            try:
+                if exog_full is not None:
+                    _, exog_new = _split_at(exog_full, len(y_train))
+                    best_model.update(y_new, new_exog=exog_new)
+                else:
+                    best_model.update(y_new)
+                return best_model
+            except NotImplementedError:
+                pass
+
+    if exog_full is not None:
+        best_model.fit(y_full, exog_full)
+    else:
+        best_model.fit(y_full)
+
+    return best_model
+
+
 # ============================================================
 # SAVE RESULTS
 # ============================================================
@@ -0,0 +1,219 @@
+"""
+Precomputed calendar lookup table
+Calendar, holiday and fiscal-period columns are computed once per date
+range and joined into features by integer day position
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+import pandas as pd
+import numpy as np
+import logging
+
+from pandas.tseries.holiday import get_calendar
+
+logger = logging.getLogger(__name__)
+
+
+CALENDAR_FEATURES = [
+    "day_of_week",
+    "week_of_year",
+    "month",
+    "quarter",
+    "day_of_month",
+    "is_weekend",
+    "is_month_start",
+    "is_month_end",
+]
+HOLIDAY_FEATURES = ["is_holiday", "days_to_holiday", "days_from_holiday"]
+FISCAL_FEATURES = ["fiscal_year", "fiscal_quarter", "fiscal_month"]
+
+DEFAULT_HOLIDAY_CALENDAR = "USFederalHolidayCalendar"
+
+# Days to the nearest holiday are capped so the columns stay bounded
+MAX_HOLIDAY_DISTANCE = 366
+
+
+# -------------------------------------------------
+# Date -> day number
+# -------------------------------------------------
+def day_numbers(dates) -> np.ndarray:
+    """Days since the epoch of each (wall-clock) date, any resolution"""
+    dates = pd.DatetimeIndex(dates)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    return dates.values.astype("datetime64[D]").astype(np.int64)
+
+
+def _holiday_distances(day: np.ndarray, holidays: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Days until the next / since the previous holiday (0 on a holiday)
+    if len(holidays) == 0:
+        cap = np.full(len(day), MAX_HOLIDAY_DISTANCE)
+        return cap, cap
+
+    pos = np.searchsorted(holidays, day, side="left")
+    next_day = holidays[np.minimum(pos, len(holidays) - 1)]
+    to_next = np.where(pos < len(holidays), next_day - day, MAX_HOLIDAY_DISTANCE)
+
+    pos = np.searchsorted(holidays, day, side="right") - 1
+    prev_day = holidays[np.maximum(pos, 0)]
+    from_prev = np.where(pos >= 0, day - prev_day, MAX_HOLIDAY_DISTANCE)
+
+    return (
+        np.minimum(to_next, MAX_HOLIDAY_DISTANCE),
+        np.minimum(from_prev, MAX_HOLIDAY_DISTANCE),
+    )
+
+
+# -------------------------------------------------
+# Calendar table
+# -------------------------------------------------
+class CalendarTable:
+    """
+    One row per day from `start` to `end` holding every calendar, holiday
+    and fiscal column as int32. A date's row is its day number minus the
+    first day, so joining the table onto any index is a single integer
+    take per column instead of recomputing isocalendar() and friends.
+
+    The fiscal year starts on the first day of `fiscal_year_start` (month
+    number) and is named after the calendar year it ends in.
+    """
+
+    def __init__(
+        self,
+        start,
+        end,
+        holiday_calendar: str = DEFAULT_HOLIDAY_CALENDAR,
+        fiscal_year_start: int = 1
+    ):
+        dates = pd.date_range(
+            pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq="D"
+        )
+        self.holiday_calendar = holiday_calendar
+        self.fiscal_year_start = fiscal_year_start
+        self.first_day = int(day_numbers(dates[:1])[0]) if len(dates) else 0
+        self.n_days = len(dates)
+
+        day = day_numbers(dates)
+        columns = {
+            "day_of_week": dates.dayofweek,
+            "week_of_year": dates.isocalendar().week.to_numpy(),
+            "month": dates.month,
+            "quarter": dates.quarter,
+            "day_of_month": dates.day,
+            "is_weekend": dates.dayofweek >= 5,
+            "is_month_start": dates.is_month_start,
+            "is_month_end": dates.is_month_end,
+        }
+
+        # Pad the holiday range so distances near the edges are right
+        holidays = get_calendar(holiday_calendar).holidays(
+            dates[0] - pd.Timedelta(days=MAX_HOLIDAY_DISTANCE),
+            dates[-1] + pd.Timedelta(days=MAX_HOLIDAY_DISTANCE)
+        ) if len(dates) else pd.DatetimeIndex([])
+        holiday_days = np.unique(day_numbers(holidays))
+        columns["is_holiday"] = np.isin(day, holiday_days)
+        columns["days_to_holiday"], columns["days_from_holiday"] = _holiday_distances(
+            day, holiday_days
+        )
+
+        fiscal_month = (dates.month - fiscal_year_start) % 12 + 1
+        columns["fiscal_year"] = dates.year + (
+            (fiscal_year_start > 1) & (dates.month >= fiscal_year_start)
+        )
+        columns["fiscal_quarter"] = (fiscal_month - 1) // 3 + 1
+        columns["fiscal_month"] = fiscal_month
+
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.asarray(values, dtype=np.int32) for name, values in columns.items()
+        }
+
+    @property
+    def last_day(self) -> int:
+        return self.first_day + self.n_days - 1
+
+    def covers(self, first_day: int, last_day: int) -> bool:
+        return self.n_days > 0 and first_day >= self.first_day and last_day <= self.last_day
+
+    def positions(self, dates) -> np.ndarray:
+        days = day_numbers(dates)
+        if len(days) and not self.covers(int(days.min()), int(days.max())):
+            raise ValueError("Dates fall outside the calendar table range")
+        return days - self.first_day
+
+    def lookup(
+        self,
+        dates,
+        columns: Sequence[str],
+        out: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """
+        (len(dates), len(columns)) block of table values for these dates,
+        written into `out` when given (e.g. a slice of a feature matrix)
+        """
+        pos = self.positions(dates)
+        if out is None:
+            out = np.empty((len(pos), len(columns)), dtype=np.int32, order="F")
+
+        for j, name in enumerate(columns):
+            out[:, j] = self.columns[name][pos]
+        return out
+
+
+# -------------------------------------------------
+# Shared tables
+# -------------------------------------------------
+_TABLES: Dict[Tuple[str, int], CalendarTable] = {}
+
+
+def get_calendar_table(
+    dates,
+    holiday_calendar: str = DEFAULT_HOLIDAY_CALENDAR,
+    fiscal_year_start: int = 1
+) -> CalendarTable:
+    """
+    Process-wide table covering `dates`, shared by every series and call
+    with the same holiday calendar and fiscal year. A request outside the
+    cached range rebuilds it over whole years spanning both ranges.
+    """
+    key = (holiday_calendar, fiscal_year_start)
+    table = _TABLES.get(key)
+
+    days = day_numbers(dates)
+    if len(days) == 0:
+        first_day = last_day = int(day_numbers([pd.Timestamp.now()])[0])
+    else:
+        first_day, last_day = int(days.min()), int(days.max())
+
+    if table is None or not table.covers(first_day, last_day):
+        if table is not None:
+            first_day = min(first_day, table.first_day)
+            last_day = max(last_day, table.last_day)
+
+        start = pd.Timestamp(np.datetime64(first_day, "D")).replace(month=1, day=1)
+        end = pd.Timestamp(np.datetime64(last_day, "D")).replace(month=12, day=31)
+        table = CalendarTable(start, end, holiday_calendar, fiscal_year_start)
+        _TABLES[key] = table
+
+        logger.info(
+            "Calendar table built | %s to %s | %d days",
+            start.date(),
+            end.date(),
+            table.n_days
+        )
+
+    return table
+
+
+def calendar_columns(
+    add_calendar: bool = True,
+    add_holidays: bool = False,
+    add_fiscal: bool = False
+) -> List[str]:
+    columns = []
+    if add_calendar:
+        columns += CALENDAR_FEATURES
+    if add_holidays:
+        columns += HOLIDAY_FEATURES
+    if add_fiscal:
+        columns += FISCAL_FEATURES
+    return columns
@@ -0,0 +1,331 @@
+"""
+Content-hashed on-disk cache of build_features outputs
+Appended series only compute their new tail rows
+"""
+
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import List, Optional
+import hashlib
+import json
+import os
+import shutil
+import pandas as pd
+import numpy as np
+import logging
+
+from features.feature_engineering import (
+    FeatureConfig,
+    build_feature_matrix,
+    drop_incomplete_rows,
+    feature_names,
+)
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CACHE_DIR = Path("artifacts") / "feature_cache"
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+# Number of leading observations that identify a series across appends
+LINEAGE_PREFIX = 32
+
+META_FILE = "meta.json"
+VALUES_FILE = "values.npy"
+
+
+# -------------------------------------------------
+# Fingerprints
+# -------------------------------------------------
+def _config_payload(config: FeatureConfig, exog_columns, dtype) -> str:
+    fields = {
+        name: list(value) if isinstance(value, (list, tuple)) else value
+        for name, value in asdict(config).items()
+        if name != "drop_na"
+    }
+    return json.dumps([fields, exog_columns, np.dtype(dtype).str], sort_keys=True)
+
+
+def _data_digest(
+    series: pd.Series,
+    exog_values: Optional[np.ndarray],
+    n_obs: int
+) -> str:
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(series.to_numpy(dtype=np.float64)[:n_obs]).tobytes())
+
+    index = series.index[:n_obs]
+    if isinstance(index, pd.DatetimeIndex):
+        digest.update(index.asi8.tobytes())
+    else:
+        digest.update(np.asarray(index).astype(str).tobytes())
+
+    if exog_values is not None:
+        digest.update(np.ascontiguousarray(exog_values[:n_obs]).tobytes())
+
+    return digest.hexdigest()
+
+
+def feature_key(
+    series: pd.Series,
+    config: FeatureConfig,
+    exog_values: Optional[np.ndarray] = None,
+    exog_columns=None,
+    dtype=np.float64
+) -> str:
+    """Hash of the series values and index, config fields and exog"""
+    payload = _config_payload(config, exog_columns, dtype)
+    data = _data_digest(series, exog_values, len(series))
+    return hashlib.sha256(f"{payload}|{data}".encode()).hexdigest()
+
+
+def lineage_key(
+    series: pd.Series,
+    config: FeatureConfig,
+    exog_values: Optional[np.ndarray] = None,
+    exog_columns=None,
+    dtype=np.float64
+) -> str:
+    # Identifies "the same series, possibly extended" by its first points
+    payload = _config_payload(config, exog_columns, dtype)
+    head = _data_digest(series, exog_values, min(len(series), LINEAGE_PREFIX))
+    return hashlib.sha256(f"{payload}|{head}".encode()).hexdigest()
+
+
+def lookback(config: FeatureConfig) -> int:
+    """Past rows a feature row depends on"""
+    horizons = list(config.lags) + list(config.rolling_windows)
+    if config.add_diff or config.add_pct_change:
+        horizons.append(7)
+    return max(horizons, default=0)
+
+
+# -------------------------------------------------
+# Cache
+# -------------------------------------------------
+class FeatureCache:
+    """
+    Content-addressed on-disk store of feature matrices.
+
+    Each entry is a directory with meta.json and the full (pre-drop_na)
+    matrix as a column-major .npy, loaded memory-mapped copy-on-write:
+    returned frames are writable, and writes never reach the entry. A
+    lineage file per series points at the latest entry, so when a series
+    only gains new rows the cached prefix is reused and just the tail is
+    computed (from `lookback` rows of context). Entries are evicted
+    least-recently-used once the cache exceeds max_bytes.
+    """
+
+    def __init__(
+        self,
+        cache_dir=DEFAULT_CACHE_DIR,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        mmap: bool = True
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.mmap = mmap
+
+        (self.cache_dir / "entries").mkdir(parents=True, exist_ok=True)
+        (self.cache_dir / "lineage").mkdir(parents=True, exist_ok=True)
+
+    # -------------------------------------------------
+    # File helpers
+    # -------------------------------------------------
+    def _entry_dir(self, key: str) -> Path:
+        return self.cache_dir / "entries" / key
+
+    def _lineage_path(self, key: str) -> Path:
+        return self.cache_dir / "lineage" / f"{key}.json"
+
+    def _entries(self):
+        return [path for path in (self.cache_dir / "entries").iterdir() if path.is_dir()]
+
+    @staticmethod
+    def _entry_size(path: Path) -> int:
+        return sum(f.stat().st_size for f in path.iterdir())
+
+    def _load(self, key: str) -> Optional[np.ndarray]:
+        path = self._entry_dir(key)
+        try:
+            # Copy-on-write: callers may modify the frame, the entry stays intact
+            values = np.load(path / VALUES_FILE, mmap_mode="c" if self.mmap else None)
+            # Bump the mtime so eviction follows last use
+            os.utime(path / META_FILE)
+        except (OSError, ValueError):
+            return None
+        return values
+
+    def _store(self, key: str, values: np.ndarray, meta: dict) -> None:
+        path = self._entry_dir(key)
+        tmp_path = path.with_name(f"{key}.tmp")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        tmp_path.mkdir(parents=True)
+
+        np.save(tmp_path / VALUES_FILE, values)
+        with open(tmp_path / META_FILE, "w") as f:
+            json.dump(meta, f)
+
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp_path, path)
+
+        if self.size_bytes() > self.max_bytes:
+            self.evict()
+
+    def size_bytes(self) -> int:
+        return sum(self._entry_size(path) for path in self._entries())
+
+    def evict(self) -> None:
+        """Drop least-recently-used entries until under max_bytes"""
+        entries = sorted(
+            self._entries(),
+            key=lambda path: (path / META_FILE).stat().st_mtime
+            if (path / META_FILE).exists() else 0.0
+        )
+        size = sum(self._entry_size(path) for path in entries)
+
+        for path in entries:
+            if size <= self.max_bytes:
+                break
+            size -= self._entry_size(path)
+            shutil.rmtree(path, ignore_errors=True)
+
+    def clear(self) -> None:
+        for sub in ("entries", "lineage"):
+            shutil.rmtree(self.cache_dir / sub, ignore_errors=True)
+            (self.cache_dir / sub).mkdir(parents=True)
+
+    # -------------------------------------------------
+    # Prefix reuse
+    # -------------------------------------------------
+    def _cached_prefix(
+        self,
+        series: pd.Series,
+        exog_values: Optional[np.ndarray],
+        lineage: str
+    ):
+        """(values, n_obs, key) of the cached entry on a strict prefix, if any"""
+        try:
+            with open(self._lineage_path(lineage), "r") as f:
+                pointer = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        n_obs = pointer["n_obs"]
+        if n_obs >= len(series) or _data_digest(series, exog_values, n_obs) != pointer["data"]:
+            return None
+
+        values = self._load(pointer["key"])
+        if values is None or values.shape[0] != n_obs:
+            return None
+        return values, n_obs, pointer["key"]
+
+    def _compute_tail(
+        self,
+        series: pd.Series,
+        config: FeatureConfig,
+        exogenous: Optional[pd.DataFrame],
+        dtype,
+        start: int
+    ) -> np.ndarray:
+        # Rows from `start` on, computed with just enough history before them
+        context = max(0, start - lookback(config))
+        tail_series = series.iloc[context:]
+        tail_exog = exogenous.reindex(tail_series.index) if exogenous is not None else None
+
+        values, _ = build_feature_matrix(
+            tail_series,
+            replace(config, drop_na=False),
+            tail_exog,
+            dtype=dtype,
+            as_frame=False
+        )
+        return values[start - context:]
+
+    # -------------------------------------------------
+    # Public API
+    # -------------------------------------------------
+    def build(
+        self,
+        series: pd.Series,
+        config: FeatureConfig,
+        exogenous: Optional[pd.DataFrame] = None,
+        dtype=np.float64,
+        features: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        build_features through the cache: an exact hit is loaded, a hit on
+        a prefix of the series is extended with the new tail rows, anything
+        else is computed in full. The result is stored either way.
+
+        `features` selects columns of the cached matrix; names the config
+        does not produce are computed directly, bypassing the cache.
+        """
+        columns = feature_names(
+            config, list(exogenous.columns) if exogenous is not None else None
+        )
+        if features is not None and not set(features) <= set(columns):
+            values, _ = build_feature_matrix(
+                series, config, exogenous, dtype=dtype, features=features
+            )
+            return values
+
+        exog_columns = None
+        exog_values = None
+        if exogenous is not None:
+            exog_columns = [str(c) for c in exogenous.columns]
+            exog_values = exogenous.reindex(series.index).to_numpy(dtype=np.float64)
+
+        key = feature_key(series, config, exog_values, exog_columns, dtype)
+        lineage = lineage_key(series, config, exog_values, exog_columns, dtype)
+
+        values = self._load(key)
+        if values is not None:
+            logger.info("Feature cache hit | Rows: %d", values.shape[0])
+        else:
+            prefix = self._cached_prefix(series, exog_values, lineage)
+
+            if prefix is not None:
+                cached, n_obs, old_key = prefix
+                tail = self._compute_tail(series, config, exogenous, dtype, n_obs)
+                values = np.empty((len(series), cached.shape[1]), dtype=dtype, order="F")
+                values[:n_obs] = cached
+                values[n_obs:] = tail
+                del cached
+                # The extended entry supersedes its prefix
+                shutil.rmtree(self._entry_dir(old_key), ignore_errors=True)
+                logger.info(
+                    "Feature cache extended | Cached rows: %d | New rows: %d",
+                    n_obs,
+                    len(series) - n_obs
+                )
+            else:
+                values, _ = build_feature_matrix(
+                    series,
+                    replace(config, drop_na=False),
+                    exogenous,
+                    dtype=dtype,
+                    as_frame=False
+                )
+                logger.info("Feature cache miss | Rows: %d", values.shape[0])
+
+            self._store(key, values, {"n_obs": len(series), "n_features": values.shape[1]})
+            with open(self._lineage_path(lineage), "w") as f:
+                json.dump({
+                    "key": key,
+                    "n_obs": len(series),
+                    "data": _data_digest(series, exog_values, len(series))
+                }, f)
+
+            if self.mmap:
+                values = self._load(key)
+
+        if features is not None:
+            positions = [columns.index(name) for name in features]
+            values, columns = values[:, positions], list(features)
+
+        index = series.index
+        if config.drop_na:
+            values, index = drop_incomplete_rows(values, index)
+
+        return pd.DataFrame(values, index=index, columns=columns, copy=False)
@@ -4,11 +4,29 @@ Leakage-safe, configurable, and reproducible
 """
 
 from dataclasses import dataclass
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple, Union
+import re
+import time
+import tracemalloc
 import pandas as pd
 import numpy as np
 import logging
 
+from features.calendar import (
+    CALENDAR_FEATURES,
+    DEFAULT_HOLIDAY_CALENDAR,
+    FISCAL_FEATURES,
+    HOLIDAY_FEATURES,
+    calendar_columns,
+    get_calendar_table,
+)
+from features.rolling_kernel import (
+    ROLLING_STATS_ORDER,
+    rolling_stats_into,
+    rolling_stats_kernel,
+)
+from utils.exceptions import FeatureEngineeringError
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,9 +41,54 @@ class FeatureConfig:
     add_diff: bool = True
     add_pct_change: bool = True
     add_calendar_features: bool = True
+    add_holiday_features: bool = False
+    add_fiscal_features: bool = False
+    holiday_calendar: str = DEFAULT_HOLIDAY_CALENDAR
+    fiscal_year_start: int = 1
     drop_na: bool = True
 
 
+# -------------------------------------------------
+# Feature names (in build_features column order)
+# -------------------------------------------------
+TREND_FEATURES = ["diff_1", "diff_7", "pct_change_1", "pct_change_7"]
+
+def config_calendar_columns(config: FeatureConfig) -> List[str]:
+    """Calendar-table columns (calendar, holiday, fiscal) this config uses"""
+    return calendar_columns(
+        config.add_calendar_features,
+        config.add_holiday_features,
+        config.add_fiscal_features
+    )
+
+
+def feature_names(
+    config: FeatureConfig,
+    exog_columns: Optional[List[str]] = None
+) -> List[str]:
+    """
+    Column names build_features produces for this config
+    """
+    names = ["y"]
+    names += [f"lag_{lag}" for lag in config.lags]
+    names += [
+        f"roll_{stat}_{window}"
+        for window in config.rolling_windows
+        for stat in ROLLING_STATS_ORDER
+        if stat in config.rolling_stats
+    ]
+
+    if config.add_diff or config.add_pct_change:
+        names += TREND_FEATURES
+
+    names += config_calendar_columns(config)
+
+    if exog_columns is not None:
+        names += list(exog_columns)
+
+    return names
+
+
 # -------------------------------------------------
 # Lag features
 # -------------------------------------------------
@@ -42,24 +105,19 @@ def create_lag_features(series: pd.Series, lags: List[int]) -> pd.DataFrame:
 def create_rolling_features(
     series: pd.Series,
     windows: List[int],
-    stats: List[str]
+    stats: List[str],
+    dtype=np.float64
 ) -> pd.DataFrame:
 
-    df = pd.DataFrame(index=series.index)
-
-    for window in windows:
-        roll = series.shift(1).rolling(window=window)
-
-        if "mean" in stats:
-            df[f"roll_mean_{window}"] = roll.mean()
-        if "std" in stats:
-            df[f"roll_std_{window}"] = roll.std()
-        if "min" in stats:
-            df[f"roll_min_{window}"] = roll.min()
-        if "max" in stats:
-            df[f"roll_max_{window}"] = roll.max()
+    # All windows and stats in one fused pass, see rolling_kernel
+    values, columns = rolling_stats_kernel(
+        series.to_numpy(dtype=np.float64),
+        windows,
+        stats,
+        dtype=dtype
+    )
 
-    return df
+    return pd.DataFrame(values, index=series.index, columns=columns, copy=False)
 
 
 # -------------------------------------------------
@@ -80,19 +138,245 @@ def create_trend_features(series: pd.Series) -> pd.DataFrame:
 # -------------------------------------------------
 # Calendar features
 # -------------------------------------------------
-def create_calendar_features(index: pd.DatetimeIndex) -> pd.DataFrame:
-    df = pd.DataFrame(index=index)
+def create_calendar_features(
+    index: pd.DatetimeIndex,
+    columns: Optional[List[str]] = None,
+    holiday_calendar: str = DEFAULT_HOLIDAY_CALENDAR,
+    fiscal_year_start: int = 1
+) -> pd.DataFrame:
+    # Looked up from the shared calendar table, see features.calendar
+    columns = list(columns) if columns is not None else CALENDAR_FEATURES
+    table = get_calendar_table(index, holiday_calendar, fiscal_year_start)
+
+    return pd.DataFrame(
+        table.lookup(index, columns),
+        index=index,
+        columns=columns,
+        copy=False
+    )
 
-    df["day_of_week"] = index.dayofweek
-    df["week_of_year"] = index.isocalendar().week.astype(int)
-    df["month"] = index.month
-    df["quarter"] = index.quarter
-    df["day_of_month"] = index.day
-    df["is_weekend"] = index.dayofweek.isin([5, 6]).astype(int)
-    df["is_month_start"] = index.is_month_start.astype(int)
-    df["is_month_end"] = index.is_month_end.astype(int)
 
-    return df
+# -------------------------------------------------
+# Feature name resolution
+# -------------------------------------------------
+_LAG_PATTERN = re.compile(r"lag_(\d+)$")
+_ROLLING_PATTERN = re.compile(r"roll_(mean|std|min|max)_(\d+)$")
+_CHANGE_PATTERN = re.compile(r"(diff|pct_change)_(\d+)$")
+
+
+def parse_feature_name(
+    name: str,
+    exog_columns: Optional[List[str]] = None
+) -> Tuple[str, object]:
+    """
+    Resolve a feature name to the computation behind it:
+    ("y", None), ("lag", k), ("roll", (stat, window)), ("diff", k),
+    ("pct_change", k), ("calendar", name) or ("exog", name)
+    """
+    if exog_columns is not None and name in exog_columns:
+        return "exog", name
+    if name == "y":
+        return "y", None
+
+    match = _LAG_PATTERN.match(name)
+    if match:
+        return "lag", int(match.group(1))
+
+    match = _ROLLING_PATTERN.match(name)
+    if match:
+        return "roll", (match.group(1), int(match.group(2)))
+
+    match = _CHANGE_PATTERN.match(name)
+    if match:
+        return match.group(1), int(match.group(2))
+
+    if name in CALENDAR_FEATURES + HOLIDAY_FEATURES + FISCAL_FEATURES:
+        return "calendar", name
+
+    raise FeatureEngineeringError(f"Unknown feature: {name}")
+
+
+# -------------------------------------------------
+# Columnar feature matrix builder
+# -------------------------------------------------
+def _write_shifted(values: np.ndarray, lag: int, column: np.ndarray) -> None:
+    # column[t] = values[t - lag], NaN before the first lagged value
+    n = len(values)
+    column[:lag] = np.nan
+    column[lag:] = values[:max(n - lag, 0)]
+
+
+def _write_change(values: np.ndarray, kind: str, lag: int, column: np.ndarray) -> None:
+    # diff_k / pct_change_k, NaN for the first k rows
+    n = len(values)
+    column[:lag] = np.nan
+    if lag >= n:
+        return
+
+    current, previous = values[lag:], values[:n - lag]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if kind == "diff":
+            np.subtract(current, previous, out=column[lag:], casting="unsafe")
+        else:
+            column[lag:] = current / previous - 1
+
+
+def _complete_rows(values: np.ndarray) -> np.ndarray:
+    # Column by column, so the mask never costs more than one bool per row
+    valid = np.ones(values.shape[0], dtype=bool)
+    for j in range(values.shape[1]):
+        valid &= ~np.isnan(values[:, j])
+    return valid
+
+
+def drop_incomplete_rows(values: np.ndarray, index: pd.Index):
+    # A view when only leading rows are incomplete, a row-filtered copy otherwise
+    valid = _complete_rows(values)
+    first = int(np.argmax(valid)) if valid.any() else len(valid)
+    if valid[first:].all():
+        return values[first:], index[first:]
+    return values[valid], index[valid]
+
+
+def _fill_feature_block(
+    values: np.ndarray,
+    y: np.ndarray,
+    dates: pd.DatetimeIndex,
+    config: FeatureConfig,
+    columns: List[str],
+    exog_values: Optional[np.ndarray] = None,
+    exog_columns: Optional[List[str]] = None,
+    positions: Optional[np.ndarray] = None
+) -> None:
+    """
+    Write the named feature columns of `values` in place, computing only
+    what those names need. `positions` is each row's offset within its
+    series for stacked panels: lagged, rolling and trend values that would
+    reach back across a series boundary are blanked.
+    """
+    def blank_warmup(column, lag):
+        if positions is not None:
+            column[positions < lag] = np.nan
+
+    rolling: Dict[int, Dict[str, int]] = {}
+    calendar = []
+
+    for col, name in enumerate(columns):
+        family, arg = parse_feature_name(name, exog_columns)
+        column = values[:, col]
+
+        if family == "y":
+            column[:] = y
+        elif family == "lag":
+            _write_shifted(y, arg, column)
+            blank_warmup(column, arg)
+        elif family == "roll":
+            stat, window = arg
+            rolling.setdefault(window, {})[stat] = col
+        elif family in ("diff", "pct_change"):
+            _write_change(y, family, arg, column)
+            blank_warmup(column, arg)
+        elif family == "calendar":
+            calendar.append((col, name))
+        else:
+            column[:] = exog_values[:, exog_columns.index(name)]
+
+    # Rolling features: one fused pass over the requested (window, stat) pairs
+    if rolling:
+        rolling_stats_into(y, rolling, values)
+        for window, window_columns in rolling.items():
+            for col in window_columns.values():
+                blank_warmup(values[:, col], window)
+
+    # Calendar features
+    if calendar:
+        table = get_calendar_table(dates, config.holiday_calendar, config.fiscal_year_start)
+        pos = table.positions(dates)
+        for col, name in calendar:
+            values[:, col] = table.columns[name][pos]
+
+
+def build_feature_matrix(
+    series: pd.Series,
+    config: FeatureConfig,
+    exogenous: Optional[pd.DataFrame] = None,
+    dtype=np.float64,
+    as_frame: bool = True,
+    track_memory: bool = False,
+    features: Optional[List[str]] = None
+) -> Tuple[Union[pd.DataFrame, np.ndarray], Dict[str, float]]:
+    """
+    Build the feature matrix into one preallocated block.
+
+    The column list comes from feature_names(config), so a single
+    column-major (n_rows, n_features) array of `dtype` is allocated up
+    front and every feature family writes its columns in place. Leading
+    incomplete rows are dropped by slicing a view; only NaNs further down
+    the series (or in exogenous data) cost a row-filtered copy.
+
+    With `features`, only those columns (any lag_k, roll_<stat>_w,
+    diff_k / pct_change_k, calendar or exog name, in that order) are
+    computed and drop_na only looks at them; the config then just
+    supplies drop_na and the calendar settings.
+
+    Returns (features, stats): a DataFrame wrapping the block without a
+    copy (or the raw ndarray with as_frame=False), and the matrix size,
+    elapsed time and, with track_memory=True, the peak traced memory.
+    """
+    started = time.perf_counter()
+    tracing = track_memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    if track_memory:
+        tracemalloc.reset_peak()
+
+    exog_columns = list(exogenous.columns) if exogenous is not None else None
+    columns = list(features) if features is not None else feature_names(config, exog_columns)
+    y = series.to_numpy(dtype=np.float64)
+    n = len(y)
+
+    exog_values = None
+    if exogenous is not None:
+        # Left join on the series index, only the columns asked for
+        exog_columns = [c for c in exog_columns if c in columns]
+        exog_values = exogenous.reindex(
+            index=series.index, columns=exog_columns
+        ).to_numpy(dtype=np.float64)
+
+    values = np.empty((n, len(columns)), dtype=dtype, order="F")
+    _fill_feature_block(
+        values, y, series.index, config, columns, exog_values, exog_columns
+    )
+
+    index = series.index
+
+    # Drop rows with NA (caused by lags/rolling)
+    if config.drop_na:
+        values, index = drop_incomplete_rows(values, index)
+
+    stats = {
+        "n_rows": values.shape[0],
+        "n_features": values.shape[1],
+        "nbytes": values.nbytes,
+        "elapsed": time.perf_counter() - started
+    }
+    if track_memory:
+        stats["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        if tracing:
+            tracemalloc.stop()
+
+    logger.info(
+        "Feature matrix created | Rows: %d | Features: %d | %.1f MB%s",
+        stats["n_rows"],
+        stats["n_features"],
+        stats["nbytes"] / 1e6,
+        f" | Peak: {stats['peak_bytes'] / 1e6:.1f} MB" if track_memory else ""
+    )
+
+    if not as_frame:
+        return values, stats
+
+    return pd.DataFrame(values, index=index, columns=columns, copy=False), stats
 
 
 # -------------------------------------------------
@@ -101,49 +385,115 @@ def create_calendar_features(index: pd.DatetimeIndex) -> pd.DataFrame:
 def build_features(
     series: pd.Series,
     config: FeatureConfig,
-    exogenous: Optional[pd.DataFrame] = None
+    exogenous: Optional[pd.DataFrame] = None,
+    dtype=np.float64,
+    cache=None,
+    features: Optional[List[str]] = None
 ) -> pd.DataFrame:
     """
     Build full feature matrix for time series forecasting
+    (see build_feature_matrix for the stats and ndarray output).
+    With a FeatureCache, repeated and appended series reuse stored rows.
+    Pass `features` to compute only the named columns.
     """
 
     logger.info("Starting feature engineering")
 
-    # Base target
-    features = pd.DataFrame({"y": series})
-
-    # Lag features
-    lag_df = create_lag_features(series, config.lags)
-    features = features.join(lag_df.drop(columns=["y"]))
+    if cache is not None:
+        return cache.build(series, config, exogenous, dtype=dtype, features=features)
 
-    # Rolling features
-    roll_df = create_rolling_features(
-        series,
-        config.rolling_windows,
-        config.rolling_stats
+    features, _ = build_feature_matrix(
+        series, config, exogenous, dtype=dtype, features=features
     )
-    features = features.join(roll_df)
 
-    # Trend features
-    if config.add_diff or config.add_pct_change:
-        trend_df = create_trend_features(series)
-        features = features.join(trend_df)
+    return features
 
-    # Calendar features
-    if config.add_calendar_features:
-        cal_df = create_calendar_features(series.index)
-        features = features.join(cal_df)
 
-    # Optional exogenous variables
-    if exogenous is not None:
-        features = features.join(exogenous)
+# -------------------------------------------------
+# Panel (multi-series) feature engineering
+# -------------------------------------------------
+def group_positions(codes: np.ndarray) -> np.ndarray:
+    """
+    Offset of every row within its run of equal codes, for codes sorted
+    so each series is contiguous: [0, 1, 2, 0, 1, 0, ...]
+    """
+    n = len(codes)
+    rows = np.arange(n)
+    boundary = np.ones(n, dtype=bool)
+    boundary[1:] = codes[1:] != codes[:-1]
+    group_start = np.maximum.accumulate(np.where(boundary, rows, 0))
+    return rows - group_start
+
+
+def build_panel_features(
+    df: pd.DataFrame,
+    config: FeatureConfig,
+    series_col: str = "series_id",
+    date_col: str = "date",
+    target_col: str = "value",
+    exog_columns: Optional[List[str]] = None,
+    dtype=np.float64,
+    features: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """
+    build_features for every series of a long-format frame in one pass.
+
+    Rows are ordered by (series, date) and the stacked target goes
+    through the same column writers as a single series; shifts and
+    windows that would cross into the previous series are blanked using
+    each row's position within its series. Rolling moments are taken
+    per window, so series on very different scales keep their own
+    precision. Returns one frame indexed by (series_col, date_col), equal
+    to build_features per series stacked.
+    """
+    logger.info("Starting panel feature engineering")
+
+    codes, _ = pd.factorize(df[series_col], sort=True)
+    dates = pd.DatetimeIndex(df[date_col])
+    stamps = dates.asi8
+    same_series = codes[1:] == codes[:-1]
+    is_sorted = np.all(
+        (codes[1:] > codes[:-1]) | (same_series & (stamps[1:] > stamps[:-1]))
+    )
+    order = slice(None) if is_sorted else np.lexsort((stamps, codes))
+
+    codes = codes[order]
+    dates = dates[order]
+    y = df[target_col].to_numpy(dtype=np.float64)[order]
+
+    columns = list(features) if features is not None else feature_names(config, exog_columns)
+
+    exog_values = None
+    if exog_columns is not None:
+        exog_columns = [c for c in exog_columns if c in columns]
+        exog_values = df[exog_columns].to_numpy(dtype=np.float64)[order]
+
+    values = np.empty((len(y), len(columns)), dtype=dtype, order="F")
+    _fill_feature_block(
+        values,
+        y,
+        dates,
+        config,
+        columns,
+        exog_values,
+        exog_columns,
+        positions=group_positions(codes)
+    )
+
+    index = pd.MultiIndex.from_arrays(
+        [df[series_col].to_numpy()[order], dates],
+        names=[series_col, date_col]
+    )
 
-    # Drop rows with NA (caused by lags/rolling)
     if config.drop_na:
-        features = features.dropna()
+        valid = _complete_rows(values)
+        values, index = values[valid], index[valid]
+
+    features = pd.DataFrame(values, index=index, columns=columns, copy=False)
 
     logger.info(
-        "Feature matrix created | Rows: %d | Features: %d",
+        "Panel feature matrix created | Series: %d | Rows: %d | Features: %d",
+        codes[-1] + 1 if len(codes) else 0,
         features.shape[0],
         features.shape[1]
     )
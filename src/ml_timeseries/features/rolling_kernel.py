@@ -0,0 +1,242 @@
+"""
+Fused rolling-statistics kernel
+All configured windows and stats in one pass over the series, written into
+one preallocated array
+"""
+
+from typing import Dict, List, Sequence, Tuple
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+ROLLING_STATS_ORDER = ("mean", "std", "min", "max")
+
+
+# -------------------------------------------------
+# Block prefix / suffix scans
+# -------------------------------------------------
+def _blocks(values: np.ndarray, window: int, fill: float) -> np.ndarray:
+    # View (or padded copy) of the values as consecutive blocks of `window`
+    n = len(values)
+    n_blocks = -(-n // window)
+    if n_blocks * window == n:
+        return np.ascontiguousarray(values).reshape(n_blocks, window)
+
+    padded = np.full(n_blocks * window, fill)
+    padded[:n] = values
+    return padded.reshape(n_blocks, window)
+
+
+def sliding_extreme(values: np.ndarray, window: int, func: np.ufunc) -> np.ndarray:
+    """
+    Min (np.minimum) or max (np.maximum) over the trailing window ending
+    at each position, O(n) for any window length - the vectorized
+    equivalent of a monotonic deque scan (van Herk / Gil-Werman): any
+    window spans at most two blocks of `window` points, so it is covered
+    by the suffix scan of one block and the prefix scan of the next. The
+    first window - 1 positions are left unfilled; callers mask them.
+    """
+    n = len(values)
+    fill = np.inf if func is np.minimum else -np.inf
+    out = np.full(n, fill)
+    if window > n:
+        return out
+
+    blocks = _blocks(values, window, fill)
+    prefix = func.accumulate(blocks, axis=1).ravel()
+    suffix = func.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].ravel()
+
+    func(suffix[:n - window + 1], prefix[window - 1:n], out=out[window - 1:])
+    return out
+
+
+def _prefix_moments(blocks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    # Mean and M2 of every block prefix, summed around the block's first
+    # value: each prefix contains that value, so (mean - ref)^2 <= M2 and
+    # the differencing loses at most ~window * eps of M2 at any level
+    counts = np.arange(1, blocks.shape[1] + 1, dtype=np.float64)
+    ref = blocks[:, :1]
+    dev = blocks - ref
+    s2 = np.cumsum(dev * dev, axis=1)
+    s1 = np.cumsum(dev, axis=1, out=dev)
+    s1 /= counts
+
+    # M2 = s2 - s1^2 / k (s1 now holds the mean deviation s1 / k)
+    m2 = s2
+    m2 -= s1 * s1 * counts
+    np.maximum(m2, 0.0, out=m2)
+    s1 += ref
+    return s1, m2
+
+
+def sliding_moments(values: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean and sum of squared deviations (M2) over the trailing window
+    ending at each position, from the same block decomposition: the
+    suffix of one block and the prefix of the next are merged with the
+    pairwise update of Chan et al. Nothing is differenced across the
+    whole series, so large offsets and level shifts keep full relative
+    precision. The first window - 1 positions are left at 0.
+    """
+    n = len(values)
+    mean = np.zeros(n)
+    m2 = np.zeros(n)
+    if window > n:
+        return mean, m2
+
+    blocks = _blocks(values, window, 0.0)
+    prefix_mean, prefix_m2 = (a.ravel() for a in _prefix_moments(blocks))
+    suffix_mean, suffix_m2 = (
+        a[:, ::-1].ravel() for a in _prefix_moments(blocks[:, ::-1])
+    )
+
+    # Window i = suffix of its start's block (n_a points) + prefix of the
+    # next block (n_b points, none when the start is block-aligned)
+    n_windows = n - window + 1
+    n_a = window - np.arange(window, dtype=np.float64)
+    n_b = window - n_a
+    weight_b = np.resize(n_b / window, n_windows)
+    weight_ab = np.resize(n_a * n_b / window, n_windows)
+
+    mean_a = suffix_mean[:n_windows]
+    delta = prefix_mean[window - 1:n] - mean_a
+
+    out_mean = mean[window - 1:]
+    np.multiply(delta, weight_b, out=out_mean)
+    out_mean += mean_a
+
+    out_m2 = m2[window - 1:]
+    np.multiply(delta, delta, out=out_m2)
+    out_m2 *= weight_ab
+    out_m2 += suffix_m2[:n_windows]
+    m2_b = prefix_m2[window - 1:n]
+    # Aligned windows are the whole suffix: no prefix part
+    m2_b[::window] = 0.0
+    out_m2 += m2_b
+    return mean, m2
+
+
+# -------------------------------------------------
+# Fused kernel
+# -------------------------------------------------
+def rolling_feature_names(windows: Sequence[int], stats: Sequence[str]) -> List[str]:
+    return [
+        f"roll_{stat}_{window}"
+        for window in windows
+        for stat in ROLLING_STATS_ORDER
+        if stat in stats
+    ]
+
+
+def _mask(column: np.ndarray, window: int, invalid: np.ndarray) -> None:
+    column[:window] = np.nan
+    if invalid is not None:
+        column[invalid] = np.nan
+
+
+def rolling_stats_kernel(
+    values: np.ndarray,
+    windows: Sequence[int],
+    stats: Sequence[str],
+    dtype=np.float64,
+    out: np.ndarray = None
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Rolling stats over the previous `window` values (series.shift(1)),
+    matching pandas rolling with min_periods=window and ddof=1.
+
+    By default `out` is allocated column-major (n, n_features) so every
+    column write is contiguous and a DataFrame can wrap it without
+    copying. See rolling_stats_into for the computation.
+    """
+    names = rolling_feature_names(windows, stats)
+    if out is None:
+        out = np.empty((len(values), len(names)), dtype=dtype, order="F")
+
+    targets: Dict[int, Dict[str, int]] = {}
+    for col, name in enumerate(names):
+        stat, window = parse_rolling_name(name)
+        targets.setdefault(window, {})[stat] = col
+
+    rolling_stats_into(values, targets, out)
+    return out, names
+
+
+def parse_rolling_name(name: str) -> Tuple[str, int]:
+    """"roll_std_28" -> ("std", 28)"""
+    _, stat, window = name.split("_")
+    return stat, int(window)
+
+
+def rolling_stats_into(
+    values: np.ndarray,
+    targets: Dict[int, Dict[str, int]],
+    out: np.ndarray
+) -> None:
+    """
+    Write the requested stats into columns of `out`: targets maps
+    window -> {stat: column}, so only those (window, stat) pairs are
+    computed.
+
+    The shifted series and its NaN counts are built once and shared by
+    every window; mean and std of a window come from one sliding_moments
+    pass.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    n = len(x)
+
+    # shift(1): the window ending at t covers x[t-w .. t-1]
+    shifted = np.empty(n)
+    shifted[:1] = np.nan
+    shifted[1:] = x[:-1]
+
+    is_nan = np.isnan(shifted)
+    has_nan = bool(is_nan[1:].any())
+
+    wanted = {stat for window_stats in targets.values() for stat in window_stats}
+
+    # NaNs are zeroed for the moments; windows holding one are masked
+    filled = np.where(is_nan, 0.0, shifted) if wanted & {"mean", "std"} else None
+
+    nan_count = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(is_nan, out=nan_count[1:])
+
+    low_input = np.where(is_nan, np.inf, shifted) if "min" in wanted else None
+    high_input = np.where(is_nan, -np.inf, shifted) if "max" in wanted else None
+
+    for window, columns in targets.items():
+        # NaN while the window holds a NaN; rows before the first full
+        # window (shifted[0] is always NaN) are blanked separately
+        invalid = None
+        if has_nan:
+            invalid = np.zeros(n, dtype=bool)
+            invalid[window:] = (nan_count[window + 1:] - nan_count[1:n - window + 1]) > 0
+
+        if "mean" in columns or "std" in columns:
+            win_mean, win_m2 = sliding_moments(filled, window)
+
+        if "mean" in columns:
+            column = out[:, columns["mean"]]
+            column[:] = win_mean
+            _mask(column, window, invalid)
+
+        if "std" in columns:
+            column = out[:, columns["std"]]
+            if window > 1:
+                win_m2 /= window - 1
+                np.sqrt(win_m2, out=column, casting="unsafe")
+                _mask(column, window, invalid)
+            else:
+                column[:] = np.nan
+
+        if "min" in columns:
+            column = out[:, columns["min"]]
+            column[:] = sliding_extreme(low_input, window, np.minimum)
+            _mask(column, window, invalid)
+
+        if "max" in columns:
+            column = out[:, columns["max"]]
+            column[:] = sliding_extreme(high_input, window, np.maximum)
+            _mask(column, window, invalid)
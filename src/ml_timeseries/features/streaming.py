@@ -0,0 +1,271 @@
+"""
+Streaming feature engineering for online inference
+Emits one build_features-compatible row per new observation
+"""
+
+from collections import deque
+from typing import Dict, List, Optional
+import math
+import pandas as pd
+import numpy as np
+import logging
+
+from features.feature_engineering import (
+    FeatureConfig,
+    ROLLING_STATS_ORDER,
+    config_calendar_columns,
+    feature_names,
+)
+from features.calendar import get_calendar_table
+from utils.exceptions import FeatureEngineeringError
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------------------------------
+# Ring buffer of past values
+# -------------------------------------------------
+class RingBuffer:
+    def __init__(self, size: int):
+        self.size = size
+        self.values = np.full(size, np.nan)
+        self.pos = -1
+
+    def push(self, value: float) -> None:
+        self.pos += 1
+        self.values[self.pos % self.size] = value
+
+    def get(self, lag: int) -> float:
+        """Value `lag` steps back from the latest push (lag=1 is latest)"""
+        idx = self.pos + 1 - lag
+        if lag > self.size or idx < 0:
+            return np.nan
+        return self.values[idx % self.size]
+
+    def last(self, n: int) -> np.ndarray:
+        """The latest n values, oldest first (NaN before the first push)"""
+        positions = np.arange(self.pos + 1 - n, self.pos + 1)
+        values = self.values[positions % self.size]
+        values[positions < 0] = np.nan
+        return values
+
+
+# -------------------------------------------------
+# Rolling window accumulator
+# -------------------------------------------------
+class RollingWindowState:
+    """
+    Sliding mean / variance (Welford add-remove) and monotonic deques for
+    min / max. Like pandas rolling with min_periods=window, stats are NaN
+    until the window is full and while it holds a NaN.
+
+    Add-remove updates accumulate rounding error over a long stream
+    (worst on a large level with small variance), so the owner recomputes
+    mean and M2 exactly from the window contents once every `window`
+    pushes (refresh_due / refresh): amortized O(1) per push.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self.count = 0
+        self.n_nan = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.since_refresh = 0
+        self.min_deque = deque()
+        self.max_deque = deque()
+
+    def _add(self, value: float) -> None:
+        n = self.count - self.n_nan
+        delta = value - self.mean
+        self.mean += delta / n
+        self.m2 += delta * (value - self.mean)
+
+    def _remove(self, value: float) -> None:
+        n = self.count - self.n_nan
+        if n == 0:
+            self.mean, self.m2 = 0.0, 0.0
+            return
+        delta = value - self.mean
+        self.mean -= delta / n
+        self.m2 -= delta * (value - self.mean)
+
+    @property
+    def refresh_due(self) -> bool:
+        return self.since_refresh >= self.window
+
+    def refresh(self, window_values: np.ndarray) -> None:
+        """Recompute mean / M2 with two passes over the current window"""
+        valid = window_values[~np.isnan(window_values)]
+        self.mean = float(valid.mean()) if len(valid) else 0.0
+        self.m2 = float(np.sum((valid - self.mean) ** 2)) if len(valid) else 0.0
+        self.since_refresh = 0
+
+    def push(self, position: int, value: float, leaving: float) -> None:
+        """Add the value at `position`; `leaving` drops out once full"""
+        self.since_refresh += 1
+        if self.count == self.window:
+            self.count -= 1
+            if math.isnan(leaving):
+                self.n_nan -= 1
+            else:
+                self._remove(leaving)
+
+        self.count += 1
+        if math.isnan(value):
+            self.n_nan += 1
+        else:
+            self._add(value)
+
+            while self.min_deque and self.min_deque[-1][1] >= value:
+                self.min_deque.pop()
+            self.min_deque.append((position, value))
+
+            while self.max_deque and self.max_deque[-1][1] <= value:
+                self.max_deque.pop()
+            self.max_deque.append((position, value))
+
+        oldest = position - self.window
+        while self.min_deque and self.min_deque[0][0] <= oldest:
+            self.min_deque.popleft()
+        while self.max_deque and self.max_deque[0][0] <= oldest:
+            self.max_deque.popleft()
+
+    def stats(self) -> Dict[str, float]:
+        if self.count < self.window or self.n_nan > 0:
+            return {stat: np.nan for stat in ROLLING_STATS_ORDER}
+
+        std = np.nan
+        if self.window > 1:
+            std = math.sqrt(max(self.m2, 0.0) / (self.window - 1))
+
+        return {
+            "mean": self.mean,
+            "std": std,
+            "min": self.min_deque[0][1],
+            "max": self.max_deque[0][1],
+        }
+
+
+# -------------------------------------------------
+# Calendar features for a single timestamp
+# -------------------------------------------------
+def calendar_row(
+    timestamp: pd.Timestamp,
+    config: Optional[FeatureConfig] = None
+) -> Dict[str, int]:
+    config = config or FeatureConfig()
+    columns = config_calendar_columns(config)
+    table = get_calendar_table(
+        [timestamp], config.holiday_calendar, config.fiscal_year_start
+    )
+    values = table.lookup([timestamp], columns)[0]
+    return {name: int(value) for name, value in zip(columns, values)}
+
+
+# -------------------------------------------------
+# Streaming featurizer
+# -------------------------------------------------
+class StreamingFeaturizer:
+    """
+    Stateful counterpart of build_features for online inference.
+
+    Each push(timestamp, value) returns the feature row build_features
+    would produce for that observation (before drop_na), in
+    O(number of features). Observations are assumed to arrive at the
+    series' regular frequency, as build_features shifts by position.
+    """
+
+    def __init__(
+        self,
+        config: FeatureConfig,
+        exog_columns: Optional[List[str]] = None
+    ):
+        self.config = config
+        self.exog_columns = list(exog_columns) if exog_columns else None
+        self.columns = feature_names(config, self.exog_columns)
+
+        self.stats = [s for s in ROLLING_STATS_ORDER if s in config.rolling_stats]
+        self.add_trend = config.add_diff or config.add_pct_change
+        self.calendar_columns = config_calendar_columns(config)
+
+        horizon = max(
+            list(config.lags) + list(config.rolling_windows) + [7 if self.add_trend else 1]
+        )
+        self.buffer = RingBuffer(horizon)
+        self.windows = {w: RollingWindowState(w) for w in config.rolling_windows}
+
+        self.position = -1
+        self.last_timestamp = None
+
+    @classmethod
+    def from_history(
+        cls,
+        series: pd.Series,
+        config: FeatureConfig,
+        exog_columns: Optional[List[str]] = None
+    ) -> "StreamingFeaturizer":
+        """Warm the state up on an existing series"""
+        featurizer = cls(config, exog_columns)
+        for timestamp, value in series.items():
+            featurizer.update_state(timestamp, value)
+        return featurizer
+
+    def update_state(self, timestamp: pd.Timestamp, value: float) -> None:
+        timestamp = pd.Timestamp(timestamp)
+        if self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            raise FeatureEngineeringError(
+                f"Out-of-order observation: {timestamp} <= {self.last_timestamp}"
+            )
+
+        value = float(value)
+        self.position += 1
+
+        for window, state in self.windows.items():
+            state.push(self.position, value, self.buffer.get(window))
+
+        self.buffer.push(value)
+        self.last_timestamp = timestamp
+
+        for window, state in self.windows.items():
+            if state.refresh_due:
+                state.refresh(self.buffer.last(window))
+
+    def push(
+        self,
+        timestamp: pd.Timestamp,
+        value: float,
+        exog: Optional[Dict[str, float]] = None
+    ) -> pd.Series:
+        timestamp = pd.Timestamp(timestamp)
+        value = float(value)
+        row = {"y": value}
+
+        # Lags and rolling windows only see past values
+        for lag in self.config.lags:
+            row[f"lag_{lag}"] = self.buffer.get(lag)
+
+        for window in self.config.rolling_windows:
+            window_stats = self.windows[window].stats()
+            for stat in self.stats:
+                row[f"roll_{stat}_{window}"] = window_stats[stat]
+
+        if self.add_trend:
+            prev_1, prev_7 = self.buffer.get(1), self.buffer.get(7)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                row["diff_1"] = value - prev_1
+                row["diff_7"] = value - prev_7
+                row["pct_change_1"] = np.float64(value) / prev_1 - 1
+                row["pct_change_7"] = np.float64(value) / prev_7 - 1
+
+        if self.calendar_columns:
+            row.update(calendar_row(timestamp, self.config))
+
+        if self.exog_columns is not None:
+            exog = exog or {}
+            for column in self.exog_columns:
+                row[column] = exog.get(column, np.nan)
+
+        self.update_state(timestamp, value)
+
+        return pd.Series(row, index=self.columns, name=timestamp, dtype=float)
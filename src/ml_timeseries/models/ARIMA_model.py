@@ -1,7 +1,11 @@
 # models/ARIMA_model.py
 
 import itertools
-from experiments.arima_grid_search import arima_grid_search
+from experiments.arima_grid_search import (
+    grid_search,
+    stepwise_search,
+    DEFAULT_MAX_FITS
+)
 
 
 # ============================================================
@@ -12,21 +16,66 @@ class BaseARIMAModel:
     def __init__(self):
         self.model = None
         self.best_params = None
+        self.candidates = None
 
-    def fit(self, y, exog=None):
-        results = arima_grid_search(
+    def fit(
+        self,
+        y,
+        exog=None,
+        metric="aic",
+        n_jobs=1,
+        timeout=None,
+        search="grid",
+        max_fits=DEFAULT_MAX_FITS,
+        warm_start=False,
+        cache=None
+    ):
+        """
+        search = "grid"     : fit every order in the grids
+                 "stepwise" : greedy neighbourhood search over the grid
+                              values, capped at max_fits models
+
+        warm_start starts each fit from the closest nested order already
+        fitted; per-candidate iteration counts end up in self.candidates.
+
+        cache is an optional experiments.candidate_cache.CandidateCache.
+        """
+        search_kwargs = dict(
             y=y,
             exog=exog,
             order_grid=self.order_grid,
-            seasonal_order_grid=self.seasonal_order_grid
+            seasonal_order_grid=self.seasonal_order_grid,
+            metric=metric,
+            n_jobs=n_jobs,
+            timeout=timeout,
+            warm_start=warm_start,
+            cache=cache
         )
 
+        if search == "grid":
+            results = grid_search(**search_kwargs)
+        elif search == "stepwise":
+            results = stepwise_search(max_fits=max_fits, **search_kwargs)
+        else:
+            raise ValueError(f"Unsupported search strategy: {search}")
+
         self.model = results["best_model"]
         self.best_params = {
             "order": results["best_order"],
             "seasonal_order": results["best_seasonal_order"],
             "score": results["best_score"]
         }
+        self.candidates = results["candidates"]
+        return self
+
+    def update(self, new_y, new_exog=None):
+        """
+        Filter observations that follow the fitted series through the
+        state-space model with the selected order and parameters held fixed.
+        Only the new points are filtered, so no grid search or refit runs;
+        summary() afterwards covers the appended data only.
+        """
+        self.model = self.model.extend(new_y, exog=new_exog)
         return self
 
     def predict(self, steps, exog_future=None):
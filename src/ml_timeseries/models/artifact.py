@@ -0,0 +1,399 @@
+# models/artifact.py
+
+"""
+Compact model artifacts for forecasting
+
+An artifact is a directory holding meta.json (model kind, orders, index
+position) and one .npy file per numeric array (parameters and final filter
+state). Arrays are loaded memory-mapped, so loading does not materialize
+the training data, covariance matrices or smoother output that a pickled
+statsmodels results object carries.
+"""
+
+import json
+import os
+import shutil
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from experiments.arima_grid_search import build_sarimax
+from models.ARIMA_model import BaseARIMAModel
+from models.statstics_models import (
+    NaiveModel,
+    SeasonalNaiveModel,
+    SESModel,
+    HoltModel,
+    HoltWintersModel,
+    ETSModel,
+    ThetaForecastModel
+)
+
+
+META_FILE = "meta.json"
+FORMAT_VERSION = 1
+POINTER_SUFFIX = ".json"
+
+
+# ============================================================
+# INDEX HANDLING
+# ============================================================
+
+def _index_meta(index):
+    if isinstance(index, pd.DatetimeIndex) and index.freq is not None:
+        return {"last": index[-1].isoformat(), "freq": index.freqstr}
+    if isinstance(index, pd.RangeIndex) and len(index):
+        return {"last_position": int(index[-1])}
+    return {"last_position": len(index) - 1}
+
+
+def _forecast_index(index_meta, steps):
+    if "freq" in index_meta:
+        return pd.date_range(
+            start=pd.Timestamp(index_meta["last"]),
+            periods=steps + 1,
+            freq=index_meta["freq"]
+        )[1:]
+
+    start = index_meta["last_position"] + 1
+    return pd.RangeIndex(start, start + steps)
+
+
+# ============================================================
+# FORECASTERS (rebuilt from artifacts)
+# ============================================================
+
+class StateSpaceForecaster:
+    """
+    Forecasts a SARIMAX model from its parameters and the predicted state
+    (and covariance) after the last observation
+    """
+
+    def __init__(self, meta, arrays):
+        self.meta = meta
+        self.params = arrays["params"]
+        self.state = arrays["state"]
+        self.state_cov = arrays["state_cov"]
+
+    def predict(self, steps, exog_future=None):
+        # Filtering an all-missing sample from the saved state yields the
+        # multi-step forecasts as the one-step-ahead predictions
+        model = build_sarimax(
+            np.full(steps, np.nan),
+            exog_future,
+            tuple(self.meta["order"]),
+            tuple(self.meta["seasonal_order"])
+            if self.meta["seasonal_order"] is not None else None
+        )
+        model.ssm.initialize_known(
+            np.asarray(self.state), np.asarray(self.state_cov)
+        )
+        results = model.filter(np.asarray(self.params))
+
+        return pd.Series(
+            results.filter_results.forecasts[0],
+            index=_forecast_index(self.meta["index"], steps),
+            name="predicted_mean"
+        )
+
+
+class ExponentialSmoothingForecaster:
+    """
+    Forecasts Holt-Winters style models from the final level, trend and
+    last season of states
+    """
+
+    def __init__(self, meta, arrays):
+        self.meta = meta
+        self.states = arrays["states"]
+        self.season = arrays.get("season")
+
+    def predict(self, steps):
+        level, trend = self.states[0], self.states[1]
+        phi = self.meta["damping_trend"]
+        h = np.arange(1, steps + 1)
+
+        if self.meta["damped_trend"]:
+            trend_steps = np.cumsum(phi ** h)
+        else:
+            trend_steps = h.astype(float)
+
+        if self.meta["trend"] == "add":
+            fcast = level + trend * trend_steps
+        elif self.meta["trend"] == "mul":
+            fcast = level * trend ** trend_steps
+        else:
+            fcast = np.full(steps, level, dtype=float)
+
+        if self.meta["seasonal"] is not None:
+            period = len(self.season)
+            season = np.asarray(self.season)[(h - 1) % period]
+            if self.meta["seasonal"] == "add":
+                fcast = fcast + season
+            else:
+                fcast = fcast * season
+
+        return pd.Series(fcast, index=_forecast_index(self.meta["index"], steps))
+
+
+class ThetaForecaster:
+    """
+    Theta method forecast (theta = 2) from b0, alpha, the SES level and the
+    seasonal factors
+    """
+
+    def __init__(self, meta, arrays):
+        self.meta = meta
+        self.seasonal = arrays["seasonal"]
+
+    def predict(self, steps, theta=2):
+        alpha, b0 = self.meta["alpha"], self.meta["b0"]
+        nobs = self.meta["nobs"]
+
+        h = np.arange(1, steps + 1, dtype=float) - 1
+        if alpha > 0:
+            h += 1 / alpha - ((1 - alpha) ** nobs / alpha)
+
+        fcast = (theta - 1) / theta * b0 * h + self.meta["one_step"]
+
+        if self.meta["deseasonalize"] and len(self.seasonal):
+            positions = (nobs + np.arange(steps)) % self.meta["period"]
+            season = np.asarray(self.seasonal)[positions]
+            if self.meta["method"].startswith("mul"):
+                fcast = fcast * season
+            else:
+                fcast = fcast + season
+
+        return pd.Series(
+            fcast,
+            index=_forecast_index(self.meta["index"], steps),
+            name="forecast"
+        )
+
+
+class NaiveForecaster:
+    def __init__(self, meta, arrays):
+        self.meta = meta
+        self.last_values = arrays["last_values"]
+
+    def predict(self, steps):
+        reps = int(np.ceil(steps / len(self.last_values)))
+        return np.tile(np.asarray(self.last_values), reps)[:steps]
+
+
+FORECASTERS = {
+    "sarimax": StateSpaceForecaster,
+    "exponential_smoothing": ExponentialSmoothingForecaster,
+    "theta": ThetaForecaster,
+    "naive": NaiveForecaster
+}
+
+
+# ============================================================
+# EXTRACTION
+# ============================================================
+
+def _extract_sarimax(model):
+    results = model.model
+    meta = {
+        "kind": "sarimax",
+        "order": list(model.best_params["order"]),
+        "seasonal_order": (
+            list(model.best_params["seasonal_order"])
+            if model.best_params["seasonal_order"] is not None else None
+        ),
+        "k_exog": int(results.model.k_exog),
+        "index": _index_meta(results.model._index)
+    }
+    arrays = {
+        "params": np.asarray(results.params, dtype=float),
+        "state": np.asarray(results.predicted_state[:, -1]),
+        "state_cov": np.asarray(results.predicted_state_cov[:, :, -1])
+    }
+    return meta, arrays
+
+
+def _extract_exponential_smoothing(model):
+    results = model.fitted_model
+    es_model = results.model
+    damping = results.params["damping_trend"]
+
+    meta = {
+        "kind": "exponential_smoothing",
+        "trend": es_model.trend,
+        "damped_trend": bool(es_model.damped_trend),
+        "damping_trend": float(damping) if np.isfinite(damping) else 1.0,
+        "seasonal": es_model.seasonal,
+        "index": _index_meta(es_model._index)
+    }
+    trend = results.trend.iloc[-1] if es_model.trend is not None else 0.0
+    arrays = {"states": np.array([results.level.iloc[-1], trend], dtype=float)}
+
+    if es_model.seasonal is not None:
+        period = es_model.seasonal_periods
+        arrays["season"] = np.asarray(results.season.iloc[-period:], dtype=float)
+
+    return meta, arrays
+
+
+def _extract_theta(model):
+    results = model.fitted_model
+    theta_model = results.model
+    index = getattr(theta_model.endog_orig, "index", None)
+    if index is None:
+        index = pd.RangeIndex(0, theta_model.endog_orig.shape[0])
+
+    meta = {
+        "kind": "theta",
+        "alpha": float(results._alpha),
+        "b0": float(results._b0),
+        "one_step": float(np.asarray(results._one_step).ravel()[0]),
+        "nobs": int(results._nobs),
+        "deseasonalize": bool(theta_model.deseasonalize),
+        "period": theta_model.period,
+        "method": theta_model.method,
+        "index": _index_meta(index)
+    }
+    arrays = {"seasonal": np.asarray(results._seasonal, dtype=float)}
+    return meta, arrays
+
+
+def _extract_naive(model):
+    if isinstance(model, SeasonalNaiveModel):
+        last_values = np.asarray(model.last_season, dtype=float)
+    else:
+        last_values = np.array([model.last_value], dtype=float)
+    return {"kind": "naive"}, {"last_values": last_values}
+
+
+def extract_artifact(model):
+    """Return (meta, arrays) holding only what forecasting needs"""
+    if isinstance(model, BaseARIMAModel):
+        meta, arrays = _extract_sarimax(model)
+    elif isinstance(model, (SESModel, HoltModel, HoltWintersModel, ETSModel)):
+        meta, arrays = _extract_exponential_smoothing(model)
+    elif isinstance(model, ThetaForecastModel):
+        meta, arrays = _extract_theta(model)
+    elif isinstance(model, (NaiveModel, SeasonalNaiveModel)):
+        meta, arrays = _extract_naive(model)
+    else:
+        raise TypeError(
+            f"No compact artifact format for {model.__class__.__name__}"
+        )
+
+    meta["model_class"] = model.__class__.__name__
+    meta["format_version"] = FORMAT_VERSION
+    return meta, arrays
+
+
+# ============================================================
+# SAVE / LOAD
+# ============================================================
+
+def save_artifact(model, path):
+    path = Path(path)
+    # Extract first: an unsupported model must not leave a directory behind
+    meta, arrays = extract_artifact(model)
+    meta["arrays"] = sorted(arrays)
+
+    # Written next to the target and swapped in, so arrays from an older
+    # artifact never mix with the new meta.json
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    tmp_path.mkdir(parents=True)
+
+    for name, values in arrays.items():
+        np.save(tmp_path / f"{name}.npy", np.ascontiguousarray(values))
+
+    with open(tmp_path / META_FILE, "w") as f:
+        json.dump(meta, f, indent=2)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_artifact(path, mmap=True):
+    """
+    Rebuild a forecaster exposing predict(steps, ...) from an artifact
+    """
+    path = Path(path)
+    with open(path / META_FILE, "r") as f:
+        meta = json.load(f)
+
+    mmap_mode = "r" if mmap else None
+    arrays = {
+        name: np.load(path / f"{name}.npy", mmap_mode=mmap_mode)
+        for name in meta["arrays"]
+    }
+
+    return FORECASTERS[meta["kind"]](meta, arrays)
+
+
+# ============================================================
+# LATEST MODEL (artifact or pickle)
+# ============================================================
+
+def save_model(model, directory, name="best_model"):
+    """
+    Save `model` as directory/name (compact artifact) or, for models
+    without an artifact format, directory/name.pkl. The other format is
+    removed and directory/name.json points at the one written, so
+    load_model never serves a stale model from an earlier run.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    artifact_path = directory / name
+    pickle_path = directory / f"{name}.pkl"
+
+    try:
+        model_path = save_artifact(model, artifact_path)
+        model_format = "artifact"
+        if pickle_path.exists():
+            pickle_path.unlink()
+    except TypeError:
+        model_path = pickle_path
+        model_format = "pickle"
+        joblib.dump(model, pickle_path)
+        shutil.rmtree(artifact_path, ignore_errors=True)
+
+    pointer_path = directory / f"{name}{POINTER_SUFFIX}"
+    tmp_pointer = pointer_path.with_name(f"{pointer_path.name}.tmp")
+    with open(tmp_pointer, "w") as f:
+        json.dump({"format": model_format, "path": model_path.name}, f, indent=2)
+    tmp_pointer.replace(pointer_path)
+
+    return model_path
+
+
+def load_model(directory, name="best_model", mmap=True):
+    """
+    Load the model written by the latest save_model call. Without a
+    pointer file (older runs), the most recently written format is used.
+    """
+    directory = Path(directory)
+    pointer_path = directory / f"{name}{POINTER_SUFFIX}"
+
+    if pointer_path.exists():
+        with open(pointer_path, "r") as f:
+            pointer = json.load(f)
+        model_format = pointer["format"]
+        model_path = directory / pointer["path"]
+    else:
+        candidates = [
+            (marker.stat().st_mtime, model_format, path)
+            for model_format, path, marker in [
+                ("artifact", directory / name, directory / name / META_FILE),
+                ("pickle", directory / f"{name}.pkl", directory / f"{name}.pkl")
+            ]
+            if marker.exists()
+        ]
+        if not candidates:
+            raise FileNotFoundError(f"No saved model '{name}' in {directory}")
+        _, model_format, model_path = max(candidates)
+
+    if model_format == "artifact":
+        return load_artifact(model_path, mmap=mmap)
+    return joblib.load(model_path)
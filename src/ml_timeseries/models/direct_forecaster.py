@@ -0,0 +1,179 @@
+# models/direct_forecaster.py
+
+"""
+Direct multi-horizon forecasting from one shared feature matrix
+
+The feature row of time t (values up to t-1, calendar and exog of t) is
+paired with y[t + h - 1] to learn horizon h. All horizons read the same
+build_features block: each horizon's design matrix and target are slices
+(views) of it and of the target array, and the multi-output target is a
+strided window view, so no horizon holds its own copy of the features.
+"""
+
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from numpy.lib.stride_tricks import sliding_window_view
+from sklearn.base import clone
+
+from experiments.arima_grid_search import resolve_n_jobs
+from features.feature_engineering import FeatureConfig, build_feature_matrix
+from models.recursive_forecaster import (
+    feature_lookback,
+    input_features,
+    series_freq,
+    tail_values
+)
+
+
+STRATEGIES = ("per_horizon", "multi_output")
+
+
+# ============================================================
+# TRAINING HELPERS
+# ============================================================
+
+def shifted_targets(y, horizon):
+    """
+    (n - horizon + 1, horizon) view whose row t is y[t], ..., y[t+horizon-1]:
+    the targets of every horizon for the feature row of time t
+    """
+    return sliding_window_view(np.asarray(y, dtype=float), horizon)
+
+
+def _usable_rows(X, targets):
+    """
+    Rows whose features and targets are complete. The leading NaNs come
+    from the lag / rolling warm-up, so this is normally a slice past them
+    (indexing with it keeps a view); a boolean mask is returned only when
+    incomplete rows also occur further down.
+    """
+    valid = ~np.isnan(targets).any(axis=1) if targets.ndim > 1 else ~np.isnan(targets)
+    for j in range(X.shape[1]):
+        valid &= ~np.isnan(X[:len(valid), j])
+
+    first = int(np.argmax(valid)) if valid.any() else len(valid)
+    if valid[first:].all():
+        return slice(first, len(valid))
+    return valid
+
+
+def _fit_horizon(regressor, X, y, horizon):
+    # Row t of X learns y[t + horizon - 1]; without interior NaNs both
+    # stay views of the shared block and target
+    n_rows = len(y) - horizon + 1
+    X_h, y_h = X[:n_rows], y[horizon - 1:]
+
+    rows = _usable_rows(X_h, y_h)
+    return regressor.fit(X_h[rows], y_h[rows])
+
+
+# ============================================================
+# DIRECT FORECASTER
+# ============================================================
+
+class DirectForecaster:
+    """
+    Multi-step forecaster with a dedicated model per horizon step
+    (strategy="per_horizon", fitted in parallel over n_jobs workers) or a
+    single multi-output regressor (strategy="multi_output"; wrap the
+    regressor in sklearn's MultiOutputRegressor if it is single-output).
+
+    Exogenous inputs are taken at the forecast origin's next step, so
+    predict only needs the first row of exog_future.
+    """
+
+    def __init__(
+        self,
+        regressor,
+        horizon,
+        config=None,
+        strategy="per_horizon",
+        n_jobs=1
+    ):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unsupported strategy: {strategy}")
+
+        self.regressor = regressor
+        self.horizon = horizon
+        self.config = config or FeatureConfig()
+        self.strategy = strategy
+        self.n_jobs = n_jobs
+        self.models = None
+
+    def _feature_block(self, y, exog):
+        # drop_na would break the row alignment with the target array;
+        # incomplete rows are skipped per horizon instead
+        values, _ = build_feature_matrix(
+            y,
+            replace(self.config, drop_na=False),
+            exog,
+            as_frame=False,
+            features=self.columns
+        )
+        return values
+
+    def fit(self, y, exog=None):
+        self.exog_columns = list(exog.columns) if exog is not None else None
+        self.columns = input_features(self.config, self.exog_columns)
+        self.lookback = feature_lookback(self.columns, self.exog_columns)
+
+        X = self._feature_block(y, exog)
+        target = y.to_numpy(dtype=float)
+
+        if self.strategy == "multi_output":
+            targets = shifted_targets(target, self.horizon)
+            rows = _usable_rows(X, targets)
+            self.models = [clone(self.regressor).fit(X[:len(targets)][rows], targets[rows])]
+        else:
+            n_jobs = min(resolve_n_jobs(self.n_jobs), self.horizon)
+            self.models = Parallel(n_jobs=n_jobs)(
+                delayed(_fit_horizon)(clone(self.regressor), X, target, h)
+                for h in range(1, self.horizon + 1)
+            )
+
+        self.freq = series_freq(y.index)
+        self.history = y.iloc[-self.lookback:] if self.lookback else y.iloc[:0]
+        self.last_date = y.index[-1]
+        return self
+
+    def update(self, new_y, new_exog=None):
+        """Move the forecast origin forward without refitting"""
+        if len(new_y):
+            self.history = pd.concat([self.history, new_y]).iloc[-self.lookback:]
+            self.last_date = new_y.index[-1]
+        return self
+
+    def _origin_row(self, exog_future):
+        # Feature row of the first step ahead, built from the stored tail
+        next_date = self.last_date + self.freq
+        values = np.append(tail_values(self.history, self.lookback), np.nan)
+        dates = pd.date_range(end=next_date, periods=len(values), freq=self.freq)
+        series = pd.Series(values, index=dates)
+
+        exog = None
+        if self.exog_columns is not None:
+            exog = pd.DataFrame(
+                np.asarray(exog_future[self.exog_columns], dtype=float)[:1],
+                index=dates[-1:],
+                columns=self.exog_columns
+            )
+
+        return self._feature_block(series, exog)[-1:]
+
+    def predict(self, steps=None, exog_future=None):
+        if self.models is None:
+            raise ValueError("Model has not been fitted")
+
+        steps = steps or self.horizon
+        if steps > self.horizon:
+            raise ValueError(f"steps={steps} exceeds the trained horizon {self.horizon}")
+
+        X = self._origin_row(exog_future)
+
+        if self.strategy == "multi_output":
+            return np.asarray(self.models[0].predict(X))[0, :steps]
+
+        return np.array([model.predict(X)[0] for model in self.models[:steps]])
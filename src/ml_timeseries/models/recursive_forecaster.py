@@ -0,0 +1,349 @@
+# models/recursive_forecaster.py
+
+"""
+Recursive multi-step forecasting with a feature-based regressor
+
+The regressor is trained on build_features output (target "y"). At
+prediction time each forecast is fed back as the newest observation:
+lags are read from a value array, rolling means / stds advance by running
+sums and min / max reduce only the window, so a step costs O(features)
+regardless of the history length. All series of a panel advance in
+lockstep and share one regressor.predict call per step.
+
+Trend features (diff_k, pct_change_k) are computed from the current
+value, which is unknown ahead of time, so they are never used as inputs.
+
+The running sums are centered on each series' mean and recomputed from
+the window once every `window` steps, so their rounding error does not
+grow with the horizon (amortized O(1) per step).
+"""
+
+import numpy as np
+import pandas as pd
+
+from features.calendar import get_calendar_table
+from features.feature_engineering import (
+    FeatureConfig,
+    build_features,
+    build_panel_features,
+    feature_names,
+    parse_feature_name
+)
+
+
+# ============================================================
+# HELPERS
+# ============================================================
+
+def input_features(config, exog_columns=None):
+    """Feature columns the regressor sees: everything knowable ahead"""
+    return [
+        name
+        for name in feature_names(config, exog_columns)
+        if parse_feature_name(name, exog_columns)[0]
+        not in ("y", "diff", "pct_change")
+    ]
+
+
+def feature_lookback(columns, exog_columns):
+    horizons = [0]
+    for name in columns:
+        family, arg = parse_feature_name(name, exog_columns)
+        if family == "lag":
+            horizons.append(arg)
+        elif family == "roll":
+            horizons.append(arg[1])
+    return max(horizons)
+
+
+def tail_values(values, size):
+    # Last `size` values, left-padded with NaN for short histories
+    values = np.asarray(values, dtype=float)[-size:] if size else np.empty(0)
+    if len(values) < size:
+        values = np.concatenate([np.full(size - len(values), np.nan), values])
+    return values
+
+
+def window_sums(values, center):
+    # Centered sum and sum of squares over the window, per series
+    block = values - center[:, np.newaxis]
+    return block.sum(axis=1), (block * block).sum(axis=1)
+
+
+def series_freq(index):
+    freq = getattr(index, "freq", None) or pd.infer_freq(index)
+    if freq is None:
+        raise ValueError("Cannot infer the series frequency for future dates")
+    return pd.tseries.frequencies.to_offset(freq)
+
+
+# ============================================================
+# BATCHED RECURSION
+# ============================================================
+
+def recursive_forecast(
+    regressor,
+    columns,
+    config,
+    history,
+    last_dates,
+    freq,
+    steps,
+    exog_future=None,
+    exog_columns=None
+):
+    """
+    Forecast `steps` ahead for a batch of series at once.
+
+    history     : (n_series, lookback) most recent values, oldest first
+    last_dates  : last observed timestamp of each series
+    exog_future : (n_series, steps, n_exog) future exog values
+
+    Returns an (n_series, steps) array of forecasts.
+    """
+    n_series, lookback = history.shape
+    values = np.empty((n_series, lookback + steps))
+    values[:, :lookback] = history
+
+    last_dates = pd.DatetimeIndex(last_dates)
+    future_dates = np.empty((n_series, steps), dtype="datetime64[ns]")
+    for last in last_dates.unique():
+        rows = last_dates == last
+        future_dates[rows] = pd.date_range(last, periods=steps + 1, freq=freq)[1:].values
+
+    plan = [parse_feature_name(name, exog_columns) for name in columns]
+
+    # Rolling windows: running (centered) sums for mean / std
+    windows = sorted({arg[1] for family, arg in plan if family == "roll"})
+    center = np.nanmean(history, axis=1) if lookback else np.zeros(n_series)
+    center = np.where(np.isnan(center), 0.0, center)
+    sums, squares = {}, {}
+    for window in windows:
+        sums[window], squares[window] = window_sums(
+            values[:, lookback - window:lookback], center
+        )
+
+    calendar = [(j, arg) for j, (family, arg) in enumerate(plan) if family == "calendar"]
+    calendar_positions = None
+    if calendar:
+        table = get_calendar_table(
+            pd.DatetimeIndex(future_dates.ravel()),
+            config.holiday_calendar,
+            config.fiscal_year_start
+        )
+        calendar_positions = table.positions(future_dates.ravel()).reshape(n_series, steps)
+
+    X = np.empty((n_series, len(columns)))
+    forecasts = np.empty((n_series, steps))
+
+    for step in range(steps):
+        now = lookback + step
+
+        if step > 0:
+            # The previous forecast enters every window, the oldest value
+            # leaves. Recompute instead once per window length, and when a
+            # missing value leaves (it cannot be subtracted back out)
+            entering = values[:, now - 1] - center
+            for window in windows:
+                leaving = values[:, now - 1 - window] - center
+                if step % window == 0 or np.isnan(leaving).any():
+                    sums[window], squares[window] = window_sums(
+                        values[:, now - window:now], center
+                    )
+                else:
+                    sums[window] += entering - leaving
+                    squares[window] += entering * entering - leaving * leaving
+
+        for j, (family, arg) in enumerate(plan):
+            if family == "lag":
+                X[:, j] = values[:, now - arg]
+            elif family == "roll":
+                stat, window = arg
+                if stat == "mean":
+                    X[:, j] = sums[window] / window + center
+                elif stat == "std":
+                    if window > 1:
+                        var = (squares[window] - sums[window] ** 2 / window) / (window - 1)
+                        X[:, j] = np.sqrt(np.maximum(var, 0.0))
+                    else:
+                        X[:, j] = np.nan
+                elif stat == "min":
+                    X[:, j] = values[:, now - window:now].min(axis=1)
+                else:
+                    X[:, j] = values[:, now - window:now].max(axis=1)
+            elif family == "exog":
+                X[:, j] = exog_future[:, step, exog_columns.index(arg)]
+
+        for j, name in calendar:
+            X[:, j] = table.columns[name][calendar_positions[:, step]]
+
+        forecasts[:, step] = regressor.predict(X)
+        values[:, now] = forecasts[:, step]
+
+    return forecasts
+
+
+# ============================================================
+# RECURSIVE FORECASTER
+# ============================================================
+
+class RecursiveForecaster:
+    """
+    Multi-step forecaster around any sklearn-style regressor.
+
+    fit / predict / update follow the other models for a single series;
+    fit_panel trains one global regressor on a long-format frame and
+    predict_panel forecasts all its series in one batched recursion.
+    """
+
+    def __init__(self, regressor, config=None):
+        self.regressor = regressor
+        self.config = config or FeatureConfig()
+        self.columns = None
+        self.exog_columns = None
+
+    def _prepare(self, exog_columns):
+        self.exog_columns = list(exog_columns) if exog_columns is not None else None
+        self.columns = input_features(self.config, self.exog_columns)
+        self.lookback = feature_lookback(self.columns, self.exog_columns)
+
+    def _fit_matrix(self, features):
+        self.regressor.fit(features[self.columns].to_numpy(), features["y"].to_numpy())
+
+    # --------------------------------------------------------
+    # Single series
+    # --------------------------------------------------------
+    def fit(self, y, exog=None):
+        self._prepare(exog.columns if exog is not None else None)
+        features = build_features(y, self.config, exog, features=["y"] + self.columns)
+        self._fit_matrix(features)
+
+        self.freq = series_freq(y.index)
+        self.history = y.iloc[-self.lookback:] if self.lookback else y.iloc[:0]
+        self.last_date = y.index[-1]
+        return self
+
+    def update(self, new_y, new_exog=None):
+        """Append observations to the recursion state without refitting"""
+        if len(new_y):
+            self.history = pd.concat([self.history, new_y]).iloc[-self.lookback:]
+            self.last_date = new_y.index[-1]
+        return self
+
+    def predict(self, steps, exog_future=None):
+        if self.columns is None:
+            raise ValueError("Model has not been fitted")
+
+        exog_values = None
+        if self.exog_columns is not None:
+            exog_values = np.asarray(
+                exog_future[self.exog_columns], dtype=float
+            )[np.newaxis, :steps]
+
+        forecasts = recursive_forecast(
+            self.regressor,
+            self.columns,
+            self.config,
+            tail_values(self.history, self.lookback)[np.newaxis, :],
+            [self.last_date],
+            self.freq,
+            steps,
+            exog_values,
+            self.exog_columns
+        )
+        return forecasts[0]
+
+    # --------------------------------------------------------
+    # Panels
+    # --------------------------------------------------------
+    def fit_panel(
+        self,
+        df,
+        series_col="series_id",
+        date_col="date",
+        target_col="value",
+        exog_columns=None
+    ):
+        """One regressor over every series of a long-format frame"""
+        self._prepare(exog_columns)
+        features = build_panel_features(
+            df,
+            self.config,
+            series_col,
+            date_col,
+            target_col,
+            exog_columns=self.exog_columns,
+            features=["y"] + self.columns
+        )
+        self._fit_matrix(features)
+        return self
+
+    def predict_panel(
+        self,
+        df,
+        steps,
+        series_col="series_id",
+        date_col="date",
+        target_col="value",
+        exog_future=None,
+        freq=None
+    ):
+        """
+        Forecast every series in `df` (the history, long format) `steps`
+        ahead. exog_future is a long-format frame with series_col, date_col
+        and the exog columns for the future dates.
+
+        Returns a frame indexed by (series, date) with a "forecast" column.
+        """
+        if self.columns is None:
+            raise ValueError("Model has not been fitted")
+
+        df = df.sort_values([series_col, date_col])
+        groups = df.groupby(series_col, sort=True)
+        series_ids = list(groups.groups)
+
+        history = np.vstack([
+            tail_values(group[target_col].to_numpy(), self.lookback)
+            for _, group in groups
+        ]) if self.lookback else np.empty((len(series_ids), 0))
+        last_dates = pd.DatetimeIndex(groups[date_col].max().to_numpy())
+
+        if freq is None:
+            first_series = df[df[series_col] == series_ids[0]]
+            freq = series_freq(pd.DatetimeIndex(first_series[date_col]))
+        freq = pd.tseries.frequencies.to_offset(freq)
+
+        future = [
+            pd.date_range(last, periods=steps + 1, freq=freq)[1:]
+            for last in last_dates
+        ]
+        index = pd.MultiIndex.from_arrays(
+            [
+                np.repeat(series_ids, steps),
+                np.concatenate([dates.values for dates in future])
+            ],
+            names=[series_col, date_col]
+        )
+
+        exog_values = None
+        if self.exog_columns is not None:
+            exog_values = (
+                exog_future.set_index([series_col, date_col])[self.exog_columns]
+                .reindex(index)
+                .to_numpy(dtype=float)
+                .reshape(len(series_ids), steps, len(self.exog_columns))
+            )
+
+        forecasts = recursive_forecast(
+            self.regressor,
+            self.columns,
+            self.config,
+            history,
+            last_dates,
+            freq,
+            steps,
+            exog_values,
+            self.exog_columns
+        )
+
+        return pd.DataFrame({"forecast": forecasts.ravel()}, index=index)
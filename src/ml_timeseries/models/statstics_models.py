@@ -1,6 +1,7 @@
 # models/statistical_models.py
 
 import numpy as np
+import pandas as pd
 from statsmodels.tsa.holtwinters import (
     SimpleExpSmoothing,
     Holt,
@@ -10,6 +11,82 @@ from statsmodels.tsa.forecasting.theta import ThetaModel
 from statsmodels.tsa.api import VAR
 
 
+# ============================================================
+# HELPERS
+# ============================================================
+
+def continue_index(index, n):
+    """The n index labels that follow `index` (dates use its frequency)"""
+    if isinstance(index, pd.DatetimeIndex):
+        freq = index.freq or (pd.infer_freq(index) if len(index) >= 3 else None)
+        if freq is None:
+            raise ValueError(
+                "Cannot extend an index without a frequency; pass new_y as a Series"
+            )
+        return pd.date_range(index[-1], periods=n + 1, freq=freq)[1:]
+
+    if isinstance(index, pd.RangeIndex):
+        return pd.RangeIndex(index.stop, index.stop + n * index.step, index.step)
+
+    raise ValueError(f"Cannot extend a {type(index).__name__}; pass new_y as a Series")
+
+
+def as_new_observations(y, new_y):
+    """
+    new_y as a Series continuing the index of the history y. Series are
+    taken as they are; arrays and lists get the next index labels.
+    """
+    if isinstance(new_y, pd.Series) or not isinstance(y, pd.Series):
+        return new_y
+    values = np.asarray(new_y, dtype=float).ravel()
+    return pd.Series(values, index=continue_index(y.index, len(values)), name=y.name)
+
+
+def append_observations(y, new_y):
+    new_y = as_new_observations(y, new_y)
+    if isinstance(y, pd.Series) and isinstance(new_y, pd.Series):
+        return pd.concat([y, new_y])
+    return np.concatenate([np.asarray(y), np.asarray(new_y)])
+
+
+def update_exponential_smoothing(fitted_model, new_y):
+    """
+    Extend a fitted ExponentialSmoothing result with new observations.
+
+    The smoothing parameters and initial states are held fixed, so this
+    never calls the optimizer. statsmodels has no way to resume the filter
+    from its last state, so the (compiled) recursions are re-run over the
+    whole history: the cost is O(history), not O(new points).
+    """
+    model = fitted_model.model
+    params = fitted_model.params
+    y_full = append_observations(model.data.orig_endog, new_y)
+
+    init_kwargs = {"initial_level": params["initial_level"]}
+    fit_kwargs = {"smoothing_level": params["smoothing_level"]}
+
+    if model.trend is not None:
+        init_kwargs["initial_trend"] = params["initial_trend"]
+        fit_kwargs["smoothing_trend"] = params["smoothing_trend"]
+        if model.damped_trend:
+            fit_kwargs["damping_trend"] = params["damping_trend"]
+
+    if model.seasonal is not None:
+        init_kwargs["initial_seasonal"] = params["initial_seasons"]
+        fit_kwargs["smoothing_seasonal"] = params["smoothing_seasonal"]
+
+    updated = ExponentialSmoothing(
+        y_full,
+        trend=model.trend,
+        damped_trend=model.damped_trend,
+        seasonal=model.seasonal,
+        seasonal_periods=model.seasonal_periods,
+        initialization_method="known",
+        **init_kwargs
+    )
+    return updated, updated.fit(optimized=False, **fit_kwargs)
+
+
 # ============================================================
 # BASE MODEL
 # ============================================================
@@ -25,6 +102,22 @@ class BaseTimeSeriesModel:
     def predict(self, steps):
         raise NotImplementedError
 
+    def update(self, new_y, new_exog=None):
+        """
+        Absorb observations that follow the fitted series without
+        re-estimating parameters. new_exog matches the ARIMA wrappers'
+        signature; these models take no exogenous inputs and ignore it.
+        """
+        raise NotImplementedError
+
+
+class ExponentialSmoothingUpdateMixin:
+    def update(self, new_y, new_exog=None):
+        self.model, self.fitted_model = update_exponential_smoothing(
+            self.fitted_model, new_y
+        )
+        return self
+
 
 # ============================================================
 # NAIVE MODEL
@@ -35,6 +128,12 @@ class NaiveModel(BaseTimeSeriesModel):
         self.last_value = y.iloc[-1]
         return self
 
+    def update(self, new_y, new_exog=None):
+        values = np.asarray(new_y)
+        if len(values):
+            self.last_value = values[-1]
+        return self
+
     def predict(self, steps):
         return np.repeat(self.last_value, steps)
 
@@ -52,6 +151,11 @@ class SeasonalNaiveModel(BaseTimeSeriesModel):
         self.last_season = y.iloc[-self.season_length:]
         return self
 
+    def update(self, new_y, new_exog=None):
+        y = append_observations(self.last_season, new_y)
+        self.last_season = y[-self.season_length:]
+        return self
+
     def predict(self, steps):
         reps = int(np.ceil(steps / self.season_length))
         return np.tile(self.last_season, reps)[:steps]
@@ -61,7 +165,7 @@ class SeasonalNaiveModel(BaseTimeSeriesModel):
 # SIMPLE EXPONENTIAL SMOOTHING (SES)
 # ============================================================
 
-class SESModel(BaseTimeSeriesModel):
+class SESModel(ExponentialSmoothingUpdateMixin, BaseTimeSeriesModel):
     def fit(self, y):
         self.model = SimpleExpSmoothing(y)
         self.fitted_model = self.model.fit()
@@ -75,7 +179,7 @@ class SESModel(BaseTimeSeriesModel):
 # HOLT (DOUBLE EXPONENTIAL SMOOTHING)
 # ============================================================
 
-class HoltModel(BaseTimeSeriesModel):
+class HoltModel(ExponentialSmoothingUpdateMixin, BaseTimeSeriesModel):
     def fit(self, y):
         self.model = Holt(y)
         self.fitted_model = self.model.fit()
@@ -89,7 +193,7 @@ class HoltModel(BaseTimeSeriesModel):
 # HOLT-WINTERS (TRIPLE ES)
 # ============================================================
 
-class HoltWintersModel(BaseTimeSeriesModel):
+class HoltWintersModel(ExponentialSmoothingUpdateMixin, BaseTimeSeriesModel):
     def __init__(self, season_length, seasonal="additive", trend="additive"):
         super().__init__()
         self.season_length = season_length
@@ -114,7 +218,7 @@ class HoltWintersModel(BaseTimeSeriesModel):
 # ETS (AUTOMATIC ERROR-TREND-SEASONAL)
 # ============================================================
 
-class ETSModel(BaseTimeSeriesModel):
+class ETSModel(ExponentialSmoothingUpdateMixin, BaseTimeSeriesModel):
     def __init__(self, season_length):
         super().__init__()
         self.season_length = season_length
@@ -143,6 +247,26 @@ class ThetaForecastModel(BaseTimeSeriesModel):
         self.fitted_model = self.model.fit()
         return self
 
+    def update(self, new_y, new_exog=None):
+        """
+        Refit on the extended history with the fitted settings (period,
+        method and the seasonality decision of the original fit, whose
+        test is not rerun). statsmodels has no public way to run a fitted
+        Theta model forward, and the fit itself is closed-form (OLS drift
+        plus an SES level), so refitting stays cheap.
+        """
+        old_model = self.model
+        self.model = ThetaModel(
+            append_observations(old_model.endog_orig, new_y),
+            period=old_model.period,
+            deseasonalize=old_model._has_seasonality,
+            use_test=False,
+            method=old_model.method,
+            difference=old_model.difference
+        )
+        self.fitted_model = self.model.fit()
+        return self
+
     def predict(self, steps):
         return self.fitted_model.forecast(steps)
 
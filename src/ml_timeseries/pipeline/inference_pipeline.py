@@ -1,27 +1,20 @@
 # pipeline/inference_pipeline.py
 
-import joblib
 from pathlib import Path
 
-from data.load_data import load_data
-from data.preprocess import preprocess_data
+from models.artifact import load_model
 
 
 ARTIFACTS_DIR = Path("artifacts")
-MODEL_PATH = ARTIFACTS_DIR / "best_model.pkl"
 
 
 def inference_pipeline(forecast_steps=12):
     # --------------------------------------------------------
-    # Load trained model
+    # Load trained model (whichever format the last training run wrote)
     # --------------------------------------------------------
-    model = joblib.load(MODEL_PATH)
-
-    # --------------------------------------------------------
-    # Load latest data
-    # --------------------------------------------------------
-    df = load_data()
-    y = preprocess_data(df)
+    # The model was refreshed on the full preprocessed series at training
+    # time and carries that history, so no data is reloaded here
+    model = load_model(ARTIFACTS_DIR)
 
     # --------------------------------------------------------
     # Forecast future
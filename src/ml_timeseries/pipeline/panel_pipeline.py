@@ -0,0 +1,216 @@
+# pipeline/panel_pipeline.py
+
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from urllib.parse import quote
+
+import joblib
+import pandas as pd
+
+from data.preprocess import PreprocessConfig, preprocess_time_series
+from experiments.arima_grid_search import resolve_n_jobs
+from experiments.model_comparison import (
+    compare_models,
+    get_best_model,
+    refit_best_model
+)
+from models.ARIMA_model import ARIMAModel, SARIMAModel
+from models.statstics_models import HoltWintersModel, ThetaForecastModel
+from models.artifact import save_artifact
+from utils.exceptions import EvaluationError
+
+logger = logging.getLogger(__name__)
+
+
+ARTIFACTS_DIR = Path("artifacts")
+PANEL_ARTIFACTS_DIR = ARTIFACTS_DIR / "panel"
+
+
+def default_models():
+    """Same candidate set as train_pipeline, fresh instances per series"""
+    return {
+        "ARIMA": ARIMAModel(),
+        "SARIMA": SARIMAModel(m=12),
+        "HoltWinters": HoltWintersModel(season_length=12),
+        "Theta": ThetaForecastModel()
+    }
+
+
+# ============================================================
+# PER-SERIES WORK
+# ============================================================
+
+def _artifact_path(output_dir, series_id):
+    # Percent-encoding is one-to-one ("a/b" -> "a%2Fb" never meets "a_b")
+    # and leaves no separators. Dots are encoded as well: "." and ".."
+    # would point at the output directory or its parent, and an id
+    # ending in ".tmp" would meet another series' staging directory
+    safe_id = quote(str(series_id), safe="").replace(".", "%2E")
+    if not safe_id:
+        raise ValueError("Series id cannot be empty")
+    return Path(output_dir) / safe_id
+
+
+def _save_model(model, path):
+    try:
+        return str(save_artifact(model, path))
+    except TypeError:
+        # No compact format for this model type; fall back to a pickle
+        path.mkdir(parents=True, exist_ok=True)
+        joblib.dump(model, path / "model.pkl")
+        return str(path / "model.pkl")
+
+
+def forecast_one_series(
+    series_id,
+    df,
+    date_col,
+    target_col,
+    config,
+    models_factory,
+    output_dir
+):
+    """
+    Preprocess, compare, select and refresh the best model for one series.
+    Returns (rows, artifact_path). A failing model keeps its row with the
+    error and the best is chosen among the others; a series where every
+    model fails becomes a single error row.
+    """
+    try:
+        artifact_dir = None
+        if output_dir is not None:
+            artifact_dir = _artifact_path(output_dir, series_id)
+
+        y_train, y_test = preprocess_time_series(df, date_col, target_col, config)
+
+        models = models_factory()
+        df_results = compare_models(
+            models=models,
+            y_train=y_train,
+            y_test=y_test,
+            steps=len(y_test),
+            verbose=False,
+            on_error="record"
+        )
+
+        # Failed models sort last (NaN RMSE)
+        succeeded = df_results[df_results["Error"].isna()]
+        if succeeded.empty:
+            details = "; ".join(
+                f"{row.Model}: {row.Error}" for row in df_results.itertuples()
+            )
+            raise EvaluationError(f"All models failed: {details}")
+
+        best_model_name, best_model = get_best_model(succeeded, models)
+        best_model = refit_best_model(
+            best_model=best_model,
+            y_full=pd.concat([y_train, y_test]),
+            y_train=y_train
+        )
+
+        artifact_path = None
+        if artifact_dir is not None:
+            artifact_path = _save_model(best_model, artifact_dir)
+
+        df_results.insert(0, "series_id", series_id)
+        df_results["is_best"] = df_results["Model"] == best_model_name
+        return df_results.to_dict("records"), artifact_path
+
+    except Exception as e:
+        return [{"series_id": series_id, "is_best": False, "Error": repr(e)}], None
+
+
+def _forecast_chunk(date_col, target_col, config, models_factory, output_dir, chunk):
+    return [
+        forecast_one_series(
+            series_id, df, date_col, target_col, config, models_factory, output_dir
+        )
+        for series_id, df in chunk
+    ]
+
+
+def _chunked(items, chunk_size):
+    for start in range(0, len(items), chunk_size):
+        yield items[start:start + chunk_size]
+
+
+# ============================================================
+# PANEL PIPELINE
+# ============================================================
+
+def panel_pipeline(
+    df,
+    series_col="series_id",
+    date_col="date",
+    target_col="value",
+    config=None,
+    models_factory=default_models,
+    n_jobs=-1,
+    chunk_size=50,
+    output_dir=PANEL_ARTIFACTS_DIR
+):
+    """
+    Model comparison and selection for every series of a long-format frame.
+
+    Series are scheduled over a process pool in chunks of `chunk_size` to
+    amortize inter-process overhead. models_factory must be picklable
+    (a module-level function) and return fresh model instances.
+
+    Returns (df_results, artifacts, stats):
+        df_results : one row per (series, model) with the comparison
+                     metrics, is_best flag and error (of a failed model,
+                     or a single row when the whole series failed)
+        artifacts  : {series_id: artifact path of the selected model}
+        stats      : n_series, n_failed, elapsed seconds, series_per_second
+    """
+    config = config or PreprocessConfig()
+    start = time.perf_counter()
+
+    groups = [
+        (series_id, group.drop(columns=[series_col]))
+        for series_id, group in df.groupby(series_col, sort=True)
+    ]
+    chunks = list(_chunked(groups, max(1, chunk_size)))
+
+    worker = partial(
+        _forecast_chunk, date_col, target_col, config, models_factory, output_dir
+    )
+
+    n_jobs = min(resolve_n_jobs(n_jobs), max(1, len(chunks)))
+    if n_jobs == 1:
+        chunk_results = [worker(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            chunk_results = list(executor.map(worker, chunks))
+
+    rows = []
+    artifacts = {}
+    n_failed = 0
+    for (series_id, _), (series_rows, artifact_path) in zip(
+        groups, (result for chunk in chunk_results for result in chunk)
+    ):
+        rows.extend(series_rows)
+        if artifact_path is not None:
+            artifacts[series_id] = artifact_path
+        if not any(row["is_best"] for row in series_rows):
+            n_failed += 1
+
+    elapsed = time.perf_counter() - start
+    stats = {
+        "n_series": len(groups),
+        "n_failed": n_failed,
+        "elapsed": elapsed,
+        "series_per_second": len(groups) / elapsed if elapsed > 0 else float("inf")
+    }
+
+    logger.info(
+        "Panel run finished | Series: %d | Failed: %d | %.2f series/sec",
+        stats["n_series"],
+        stats["n_failed"],
+        stats["series_per_second"]
+    )
+
+    return pd.DataFrame(rows), artifacts, stats
@@ -1,10 +1,10 @@
 # pipeline/train_pipeline.py
 
-import joblib
 from pathlib import Path
 
 from data.load_data import load_data
-from data.preprocess import preprocess_data
+from data.preprocess import PreprocessConfig, time_series_split
+from data.series_store import preprocess_to_store
 from experiments.model_comparison import (
     compare_models,
     get_best_model,
@@ -13,22 +13,33 @@ from experiments.model_comparison import (
 
 from models.ARIMA_model import ARIMAModel, SARIMAModel
 from models.statstics_models import HoltWintersModel, ThetaForecastModel
+from models.artifact import save_model
 
 
 ARTIFACTS_DIR = Path("artifacts")
 ARTIFACTS_DIR.mkdir(exist_ok=True)
+SERIES_STORE_PATH = ARTIFACTS_DIR / "series_store"
+DATA_PATH = Path("data") / "raw.csv"
 
 
-def train_pipeline():
+def train_pipeline(
+    data_path=DATA_PATH,
+    date_col="date",
+    target_col="value",
+    config=None
+):
     # --------------------------------------------------------
     # Load & preprocess data
     # --------------------------------------------------------
-    df = load_data()
-    y = preprocess_data(df)
+    config = config or PreprocessConfig(freq="MS")
+    df = load_data(data_path)
+
+    # Preprocess once and persist the series with its config and fitted
+    # outlier caps, for backtests and later appends
+    y = preprocess_to_store(df, date_col, target_col, config, SERIES_STORE_PATH)
 
     # Train / test split
-    train_size = int(len(y) * 0.8)
-    y_train, y_test = y[:train_size], y[train_size:]
+    y_train, y_test = time_series_split(y, config.test_size)
 
     # --------------------------------------------------------
     # Define candidate models
@@ -59,18 +70,19 @@ def train_pipeline():
     print(f"Best model selected: {best_model_name}")
 
     # --------------------------------------------------------
-    # Refit on full data
+    # Update with the held-out data (refit if unsupported)
     # --------------------------------------------------------
     best_model = refit_best_model(
         best_model=best_model,
-        y_full=y
+        y_full=y,
+        y_train=y_train
     )
 
     # --------------------------------------------------------
     # Save trained model
     # --------------------------------------------------------
-    model_path = ARTIFACTS_DIR / "best_model.pkl"
-    joblib.dump(best_model, model_path)
+    # Compact artifact, or a pickle for model types without one
+    model_path = save_model(best_model, ARTIFACTS_DIR)
 
     print(f"Best model saved to {model_path}")
 
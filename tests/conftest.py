@@ -0,0 +1,8 @@
+import sys
+import warnings
+from pathlib import Path
+
+# Modules import each other as top-level packages (data, features, models, ...)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "ml_timeseries"))
+
+warnings.filterwarnings("ignore", module="statsmodels")
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+import experiments.arima_grid_search as search
+
+
+ORDER_GRID = [(p, 1, q) for p in range(2) for q in range(2)]
+
+
+@pytest.fixture(scope="module")
+def y():
+    rng = np.random.default_rng(0)
+    return 50 + np.cumsum(rng.normal(0.1, 1.0, 120))
+
+
+@pytest.fixture
+def pool_counter(monkeypatch):
+    created = []
+    pool_class = search.ProcessPoolExecutor
+
+    def counting_pool(*args, **kwargs):
+        created.append(kwargs.get("max_workers"))
+        return pool_class(*args, **kwargs)
+
+    monkeypatch.setattr(search, "ProcessPoolExecutor", counting_pool)
+    return created
+
+
+def _scores(result):
+    return [(r["order"], round(r["score"], 6)) for r in result["candidates"]]
+
+
+def test_grid_search_parallel_matches_serial(y, pool_counter):
+    serial = search.grid_search(y, order_grid=ORDER_GRID, n_jobs=1)
+    parallel = search.grid_search(y, order_grid=ORDER_GRID, n_jobs=2)
+
+    assert _scores(parallel) == _scores(serial)
+    assert parallel["best_order"] == serial["best_order"]
+    assert pool_counter == [2]
+
+
+def test_warm_start_waves_share_one_pool(y, pool_counter):
+    search.grid_search(y, order_grid=ORDER_GRID, n_jobs=2, warm_start=True)
+    assert len(pool_counter) == 1
+
+
+def test_stepwise_search_shares_one_pool(y, pool_counter):
+    serial = search.stepwise_search(y, order_grid=ORDER_GRID, n_jobs=1)
+    parallel = search.stepwise_search(y, order_grid=ORDER_GRID, n_jobs=2)
+
+    assert _scores(parallel) == _scores(serial)
+    assert len(pool_counter) == 1
+
+
+def test_timeout_reported_as_status(y):
+    record, results = search.fit_candidate(y, None, (2, 1, 2), timeout=0.0)
+    assert record["status"] == "timeout"
+    assert results is None
+
+
+def test_warm_start_seeds_new_lags_away_from_zero(y):
+    donor, _ = search.fit_candidate(y, None, (1, 1, 0))
+    model = search.build_sarimax(y, None, (1, 1, 1))
+    start = dict(zip(model.param_names, search.warm_start_params(model, donor)))
+
+    assert start["ar.L1"] == pytest.approx(donor["params"][0])
+    assert start["ma.L1"] == search.WARM_START_LAG != 0.0
+
+
+def test_warm_fits_never_end_below_nested_donor(y):
+    grid = [(p, 1, q) for p in range(3) for q in range(3)]
+    warm = search.grid_search(y, order_grid=grid, warm_start=True)
+    by_order = {r["order"]: r for r in warm["candidates"]}
+
+    for record in warm["candidates"]:
+        if record["warm_start_from"] is None:
+            continue
+        donor = by_order[record["warm_start_from"][0]]
+        assert record["llf"] >= donor["llf"] - 1e-6
+
+
+def test_warm_start_selection_no_worse_than_cold(y):
+    grid = [(p, 1, q) for p in range(3) for q in range(3)]
+    cold = search.grid_search(y, order_grid=grid)
+    warm = search.grid_search(y, order_grid=grid, warm_start=True)
+
+    assert warm["best_score"] <= cold["best_score"] + 1e-6
+
+
+def test_stepwise_matches_grid_on_a_small_grid(y):
+    grid = [(p, 1, q) for p in range(3) for q in range(3)]
+    exhaustive = search.grid_search(y, order_grid=grid)
+    stepwise = search.stepwise_search(y, order_grid=grid)
+
+    assert stepwise["best_order"] == exhaustive["best_order"]
+    assert stepwise["best_score"] == pytest.approx(exhaustive["best_score"])
+    # Every order it visits scores as in the exhaustive search, never twice
+    scores = dict(_scores(exhaustive))
+    visited = _scores(stepwise)
+    assert len({order for order, _ in visited}) == len(visited) <= len(grid)
+    assert all(scores[order] == score for order, score in visited)
+
+
+def test_stepwise_respects_max_fits(y):
+    grid = [(p, 1, q) for p in range(4) for q in range(4)]
+    result = search.stepwise_search(y, order_grid=grid, max_fits=3)
+    assert len(result["candidates"]) == 3
@@ -0,0 +1,73 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from models.ARIMA_model import ARMAModel
+from models.artifact import load_artifact, load_model, save_artifact, save_model
+from models.statstics_models import (
+    HoltWintersModel,
+    NaiveModel,
+    SeasonalNaiveModel,
+    ThetaForecastModel,
+)
+
+
+class MeanModel:
+    """A model type without a compact artifact format"""
+
+    def fit(self, y):
+        self.mean = float(np.mean(y))
+        return self
+
+    def predict(self, steps):
+        return np.repeat(self.mean, steps)
+
+
+@pytest.fixture(scope="module")
+def y():
+    rng = np.random.default_rng(1)
+    index = pd.date_range("2018-01-01", periods=96, freq="MS")
+    season = 4 * np.sin(2 * np.pi * np.arange(96) / 12)
+    return pd.Series(50 + 0.2 * np.arange(96) + season + rng.normal(0, 1, 96), index=index)
+
+
+@pytest.mark.parametrize("make_model", [
+    lambda y: ARMAModel(p_range=(1,), q_range=(1,)).fit(y),
+    lambda y: HoltWintersModel(12).fit(y),
+    lambda y: ThetaForecastModel().fit(y),
+    lambda y: NaiveModel().fit(y),
+    lambda y: SeasonalNaiveModel(12).fit(y),
+], ids=["sarimax", "holt_winters", "theta", "naive", "seasonal_naive"])
+def test_artifact_round_trip_matches_model(tmp_path, y, make_model):
+    model = make_model(y)
+    forecaster = load_artifact(save_artifact(model, tmp_path / "model"))
+
+    expected, actual = model.predict(steps=15), forecaster.predict(steps=15)
+    np.testing.assert_allclose(np.asarray(actual), np.asarray(expected), rtol=1e-8)
+    if isinstance(expected, pd.Series):
+        assert actual.index.equals(expected.index)
+
+
+def test_unsupported_model_leaves_no_artifact_directory(tmp_path, y):
+    with pytest.raises(TypeError):
+        save_artifact(MeanModel().fit(y), tmp_path / "model")
+    assert not (tmp_path / "model").exists()
+
+
+def test_load_model_serves_the_latest_format(tmp_path, y):
+    save_model(NaiveModel().fit(y), tmp_path)
+    assert (tmp_path / "best_model").is_dir()
+
+    # Pickle fallback replaces the earlier artifact
+    save_model(MeanModel().fit(y.iloc[:48]), tmp_path)
+    assert not (tmp_path / "best_model").exists()
+    np.testing.assert_allclose(load_model(tmp_path).predict(3), y.iloc[:48].mean())
+
+    # And the other way round
+    save_model(NaiveModel().fit(y), tmp_path)
+    assert not (tmp_path / "best_model.pkl").exists()
+    with open(tmp_path / "best_model.json") as f:
+        assert json.load(f)["format"] == "artifact"
+    np.testing.assert_array_equal(load_model(tmp_path).predict(3), np.repeat(y.iloc[-1], 3))
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from Evaluation.backtest import rolling_origin_backtest
+
+
+class LengthModel:
+    """Forecasts the number of training points it has seen"""
+
+    def fit(self, y):
+        self.n_seen = len(y)
+        return self
+
+    def update(self, new_y):
+        self.n_seen += len(new_y)
+        return self
+
+    def predict(self, steps):
+        return np.repeat(float(self.n_seen), steps)
+
+
+@pytest.fixture(scope="module")
+def y():
+    return pd.Series(np.zeros(150), index=pd.date_range("2010-01-01", periods=150, freq="MS"))
+
+
+def folds(results):
+    return results[~results["Fold"].isin(["mean", "std"])]
+
+
+@pytest.mark.parametrize("refit_every", [0, 1, 3])
+def test_sliding_window_trains_on_window_size_points(y, refit_every):
+    results = folds(rolling_origin_backtest(
+        LengthModel(), y, n_folds=4, horizon=6, window="sliding",
+        window_size=126, refit_every=refit_every
+    ))
+    assert (results["TrainSize"] == 126).all()
+    assert results["Refit"].all()
+    # The model really saw window_size points (MAE = |0 - n_seen|)
+    np.testing.assert_allclose(results["MAE"].astype(float), 126)
+
+
+def test_expanding_window_updates_between_refits(y):
+    results = folds(rolling_origin_backtest(
+        LengthModel(), y, n_folds=4, horizon=6, window="expanding", refit_every=0
+    ))
+    assert results["TrainSize"].tolist() == [126, 132, 138, 144]
+    assert results["Refit"].tolist() == [True, False, False, False]
+    np.testing.assert_allclose(results["MAE"].astype(float), [126, 132, 138, 144])
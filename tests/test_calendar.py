@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+import pytest
+from pandas.tseries.holiday import get_calendar
+
+from features.calendar import (
+    CALENDAR_FEATURES,
+    FISCAL_FEATURES,
+    HOLIDAY_FEATURES,
+    MAX_HOLIDAY_DISTANCE,
+    CalendarTable,
+    day_numbers,
+    get_calendar_table,
+)
+from features.feature_engineering import create_calendar_features
+
+MONTHS = ["JAN", "FEB", "MAR", "APR", "MAY", "JUN", "JUL", "AUG", "SEP", "OCT", "NOV", "DEC"]
+
+
+def pandas_reference(index, holiday_calendar, fiscal_year_start):
+    """The table columns computed directly on the index with pandas"""
+    local = index.tz_localize(None) if index.tz is not None else index
+    days = local.normalize()
+    columns = {
+        "day_of_week": local.dayofweek,
+        "week_of_year": local.isocalendar().week.to_numpy(),
+        "month": local.month,
+        "quarter": local.quarter,
+        "day_of_month": local.day,
+        "is_weekend": local.dayofweek >= 5,
+        "is_month_start": local.is_month_start,
+        "is_month_end": local.is_month_end,
+    }
+
+    margin = pd.Timedelta(days=2 * MAX_HOLIDAY_DISTANCE)
+    holidays = get_calendar(holiday_calendar).holidays(days.min() - margin, days.max() + margin)
+    # Signed distance from every day to every holiday
+    gaps = np.subtract.outer(holidays.values, days.values).astype("timedelta64[D]").astype(int)
+    columns["is_holiday"] = days.isin(holidays)
+    columns["days_to_holiday"] = np.where(gaps >= 0, gaps, MAX_HOLIDAY_DISTANCE).min(axis=0)
+    columns["days_from_holiday"] = np.where(gaps <= 0, -gaps, MAX_HOLIDAY_DISTANCE).min(axis=0)
+
+    # Fiscal periods as quarters anchored on the month before the start
+    quarters = local.to_period(f"Q-{MONTHS[(fiscal_year_start - 2) % 12]}")
+    columns["fiscal_year"] = quarters.qyear
+    columns["fiscal_quarter"] = quarters.quarter
+    columns["fiscal_month"] = 3 * (quarters.quarter - 1) + (
+        local.month - quarters.start_time.month
+    ) % 12 + 1
+
+    return pd.DataFrame(
+        {name: np.asarray(values, dtype=np.int64) for name, values in columns.items()},
+        index=index
+    )
+
+
+@pytest.mark.parametrize("fiscal_year_start", [1, 4, 7, 10])
+@pytest.mark.parametrize("index", [
+    pd.date_range("2015-12-20", "2021-01-10", freq="D"),
+    pd.date_range("2020-03-01", periods=24 * 60, freq="h", tz="America/New_York"),
+    pd.date_range("2018-01-01", periods=40, freq="W-MON"),
+], ids=["daily", "hourly_tz", "weekly"])
+def test_table_matches_pandas_columns(index, fiscal_year_start):
+    columns = CALENDAR_FEATURES + HOLIDAY_FEATURES + FISCAL_FEATURES
+    table = CalendarTable(index.min(), index.max(), fiscal_year_start=fiscal_year_start)
+    expected = pandas_reference(index, "USFederalHolidayCalendar", fiscal_year_start)
+
+    actual = pd.DataFrame(table.lookup(index, columns), index=index, columns=columns)
+    pd.testing.assert_frame_equal(actual.astype(np.int64), expected)
+
+
+def test_shared_table_grows_to_cover_new_ranges():
+    first = get_calendar_table(pd.date_range("2031-03-01", periods=10, freq="D"), fiscal_year_start=5)
+    # Built over whole years
+    assert first.covers(*day_numbers(["2031-01-01", "2031-12-31"]))
+
+    later = pd.date_range("2033-06-01", periods=10, freq="D")
+    grown = get_calendar_table(later, fiscal_year_start=5)
+    assert grown is not first
+    assert grown.first_day == first.first_day
+    # Both ranges are served by the same rebuilt table
+    assert get_calendar_table(pd.DatetimeIndex(["2031-03-05"]), fiscal_year_start=5) is grown
+
+    features = create_calendar_features(later, FISCAL_FEATURES, fiscal_year_start=5)
+    expected = pandas_reference(later, "USFederalHolidayCalendar", 5)[FISCAL_FEATURES]
+    pd.testing.assert_frame_equal(features.astype(np.int64), expected)
+
+
+def test_lookup_outside_the_table_raises():
+    table = CalendarTable("2020-01-01", "2020-12-31")
+    with pytest.raises(ValueError, match="outside"):
+        table.lookup(pd.DatetimeIndex(["2021-01-01"]), ["month"])
@@ -0,0 +1,99 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import experiments.arima_grid_search as search
+from experiments.candidate_cache import CandidateCache, fingerprint_data
+
+ORDER_GRID = [(p, 1, q) for p in range(2) for q in range(2)]
+
+
+@pytest.fixture(scope="module")
+def y():
+    rng = np.random.default_rng(0)
+    return 50 + np.cumsum(rng.normal(0.1, 1.0, 120))
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return CandidateCache(tmp_path / "cache")
+
+
+def _scores(result):
+    return [(r["order"], r["score"]) for r in result["candidates"]]
+
+
+def test_identical_rerun_is_served_from_cache(y, cache):
+    first = search.grid_search(y, order_grid=ORDER_GRID, cache=cache)
+    second = search.grid_search(y, order_grid=ORDER_GRID, cache=cache)
+
+    assert not any(r["cached"] for r in first["candidates"])
+    assert all(r["cached"] for r in second["candidates"])
+    assert _scores(second) == _scores(first)
+    assert second["best_order"] == first["best_order"]
+    np.testing.assert_allclose(second["best_model"].params, first["best_model"].params)
+
+
+def test_changed_data_and_warm_start_miss(y, cache):
+    search.grid_search(y, order_grid=ORDER_GRID, cache=cache)
+
+    shifted = search.grid_search(y + 1.0, order_grid=ORDER_GRID, cache=cache)
+    assert not any(r["cached"] for r in shifted["candidates"])
+
+    # Warm fits can end elsewhere than cold ones: kept under their own key
+    warm = search.grid_search(y, order_grid=ORDER_GRID, cache=cache, warm_start=True)
+    assert not any(r["cached"] for r in warm["candidates"])
+    warm_again = search.grid_search(y, order_grid=ORDER_GRID, cache=cache, warm_start=True)
+    assert all(r["cached"] for r in warm_again["candidates"])
+
+
+def test_extended_series_uses_priors_only_when_warm(y, cache):
+    search.grid_search(y[:90], order_grid=ORDER_GRID, cache=cache)
+    assert len(cache.load_ranking(y, None, "aic")) == len(ORDER_GRID)
+
+    cold = search.grid_search(y, order_grid=ORDER_GRID, cache=cache)
+    reference = search.grid_search(y, order_grid=ORDER_GRID)
+    assert all(r["warm_start_from"] is None for r in cold["candidates"])
+    assert _scores(cold) == _scores(reference)
+
+
+def test_lru_eviction_keeps_recently_used(y, cache):
+    record, _ = search.fit_candidate(y, None, (1, 1, 0))
+    data_key = fingerprint_data(y)
+    candidates = [((p, 1, 0), None) for p in range(3)]
+    for candidate in candidates:
+        cache.put(data_key, candidate, "aic", record)
+
+    # Oldest first, then reading the oldest makes it the most recent
+    paths = sorted(cache._files())
+    for age, candidate in enumerate(candidates):
+        path = cache._candidate_path(data_key, candidate, "aic", False)
+        os.utime(path, (1_000 + age, 1_000 + age))
+    assert cache.get(data_key, candidates[0], "aic") is not None
+
+    cache.max_bytes = cache.size_bytes() - 1
+    cache.evict()
+
+    assert cache.get(data_key, candidates[1], "aic") is None
+    assert cache.get(data_key, candidates[0], "aic") is not None
+    assert cache.get(data_key, candidates[2], "aic") is not None
+    assert len(cache._files()) == len(paths) - 1
+
+
+def test_concurrent_writers_do_not_collide(y, cache):
+    record, _ = search.fit_candidate(y, None, (1, 1, 0))
+    data_key = fingerprint_data(y)
+
+    def write(i):
+        cache.put(data_key, ((1, 1, 0), None), "aic", dict(record, n_iter=i))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(write, range(200)))
+
+    files = list((cache.cache_dir / "candidates").iterdir())
+    assert len(files) == 1 and files[0].suffix == ".json"
+    with open(files[0]) as f:
+        assert json.load(f)["score"] == pytest.approx(record["score"])
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.chunked_preprocess import ChunkedPreprocessor, preprocess_chunked
+from data.preprocess import PreprocessConfig, preprocess_series
+from data.series_store import load_series
+
+FILL_METHODS = ["ffill", "bfill", "interpolate"]
+
+
+def raw_frame(seed, n=300, freq="h", tz=None):
+    # Irregular rows: gaps in the grid, missing values and repeated rows
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2020-03-20", periods=n, freq=freq, tz=tz)
+    keep = rng.random(n) > 0.2
+    keep[0] = True
+    values = rng.normal(size=keep.sum())
+    values[rng.random(len(values)) < 0.3] = np.nan
+
+    df = pd.DataFrame({"date": dates[keep], "y": values})
+    repeats = df.sample(frac=0.1, random_state=seed)
+    return pd.concat([df, repeats]).sort_values("date", kind="stable").reset_index(drop=True)
+
+
+def split_rows(df, n_chunks, seed):
+    rng = np.random.default_rng(seed)
+    cuts = np.sort(rng.choice(np.arange(1, len(df)), size=n_chunks - 1, replace=False))
+    bounds = [0, *cuts, len(df)]
+    return [df.iloc[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+@pytest.mark.parametrize("freq, tz", [
+    ("h", None),
+    # Across the DST changes: fixed hourly steps and calendar days
+    ("h", "Europe/Berlin"),
+    ("D", "Europe/Berlin"),
+])
+@pytest.mark.parametrize("method", FILL_METHODS)
+@pytest.mark.parametrize("seed", range(5))
+def test_chunked_matches_preprocess_series(tmp_path, method, seed, freq, tz):
+    df = raw_frame(seed, freq=freq, tz=tz)
+    config = PreprocessConfig(freq=freq, fill_method=method)
+    expected, state = preprocess_series(df, "date", "y", config)
+
+    meta = preprocess_chunked(
+        iter(split_rows(df, 6, seed)),
+        "date",
+        "y",
+        config,
+        tmp_path / "store",
+        caps=(state["lower_cap"], state["upper_cap"])
+    )
+    series, _ = load_series(tmp_path / "store")
+
+    assert meta["n_obs"] == len(expected)
+    assert meta["tz"] == tz
+    pd.testing.assert_series_equal(series, expected.astype(float), check_index_type=False)
+    assert str(series.index.tz) == str(expected.index.tz)
+
+
+def test_sketch_caps_within_rank_error(tmp_path):
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2020-01-01", periods=50_000, freq="min")
+    df = pd.DataFrame({"date": dates, "y": rng.standard_t(3, len(dates))})
+    config = PreprocessConfig(freq="min", sketch_rank_error=0.005)
+
+    meta = preprocess_chunked(iter(split_rows(df, 10, 0)), "date", "y", config, tmp_path / "store")
+
+    values = np.sort(df["y"].to_numpy())
+    q = config.outlier_cap_quantile
+    for cap, target in [(meta["state"]["lower_cap"], 1 - q), (meta["state"]["upper_cap"], q)]:
+        rank = np.searchsorted(values, cap, side="right") / len(values)
+        assert abs(rank - target) <= config.sketch_rank_error
+
+
+@pytest.mark.parametrize("tz", [None, "Europe/Berlin"])
+@pytest.mark.parametrize("method", FILL_METHODS)
+def test_state_round_trip_resumes_the_stream(method, tz):
+    df = raw_frame(7, n=60, freq="D", tz=tz)
+    config = PreprocessConfig(freq="D", fill_method=method)
+    chunks = split_rows(df, 4, 7)
+
+    def run(resume_after=None):
+        processor = ChunkedPreprocessor("date", "y", config)
+        pieces = []
+        for i, chunk in enumerate(chunks):
+            pieces.append(processor.push(chunk))
+            if i == resume_after:
+                processor = ChunkedPreprocessor.from_dict(processor.to_dict(), "date", "y", config)
+        pieces.append(processor.finish())
+        dates = np.concatenate([d for d, _ in pieces])
+        values = np.concatenate([v for _, v in pieces])
+        return dates, values
+
+    dates, values = run()
+    resumed_dates, resumed_values = run(resume_after=1)
+    np.testing.assert_array_equal(resumed_dates, dates)
+    np.testing.assert_array_equal(resumed_values, values)
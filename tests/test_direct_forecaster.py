@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.base import BaseEstimator, RegressorMixin
+
+from features.feature_engineering import FeatureConfig
+import models.direct_forecaster as direct
+from models.direct_forecaster import DirectForecaster
+
+
+class RecordingRegressor(RegressorMixin, BaseEstimator):
+    """Keeps the arrays it was fitted on; predicts zeros"""
+
+    def fit(self, X, y):
+        self.X_, self.y_ = X, y
+        return self
+
+    def predict(self, X):
+        n_outputs = self.y_.shape[1] if self.y_.ndim > 1 else None
+        return np.zeros((len(X), n_outputs) if n_outputs else len(X))
+
+
+CONFIG = FeatureConfig(
+    lags=(1, 2, 7),
+    rolling_windows=(7,),
+    add_diff=False,
+    add_pct_change=False,
+    add_calendar_features=False
+)
+
+
+@pytest.fixture
+def y():
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2020-01-01", periods=120, freq="D")
+    return pd.Series(rng.normal(10, 1, len(index)), index=index)
+
+
+@pytest.fixture
+def feature_blocks(monkeypatch):
+    # Feature matrices built by the forecaster, to check what shares them
+    blocks = []
+    build = direct.build_feature_matrix
+
+    def recording_build(*args, **kwargs):
+        values, stats = build(*args, **kwargs)
+        blocks.append(values)
+        return values, stats
+
+    monkeypatch.setattr(direct, "build_feature_matrix", recording_build)
+    return blocks
+
+
+def test_per_horizon_design_matrices_are_views(y, feature_blocks):
+    forecaster = DirectForecaster(RecordingRegressor(), horizon=4, config=CONFIG).fit(y)
+    block = feature_blocks[0]
+
+    for h, model in enumerate(forecaster.models, start=1):
+        assert np.shares_memory(model.X_, block)
+        # Warm-up rows are sliced off: row t learns y[t + h - 1]
+        assert not np.isnan(model.X_).any()
+        assert len(model.X_) == len(y) - 7 - h + 1
+        np.testing.assert_array_equal(model.y_, y.to_numpy()[7 + h - 1:])
+
+
+def test_multi_output_design_matrix_is_a_view(y, feature_blocks):
+    forecaster = DirectForecaster(
+        RecordingRegressor(), horizon=4, config=CONFIG, strategy="multi_output"
+    ).fit(y)
+    model = forecaster.models[0]
+    assert np.shares_memory(model.X_, feature_blocks[0])
+    assert model.y_.shape == (len(y) - 7 - 3, 4)
+    np.testing.assert_array_equal(model.y_[:, 0], y.to_numpy()[7:-3])
+
+
+def test_interior_nans_are_masked(y, feature_blocks):
+    y = y.copy()
+    y.iloc[60] = np.nan
+    forecaster = DirectForecaster(RecordingRegressor(), horizon=2, config=CONFIG).fit(y)
+
+    for model in forecaster.models:
+        assert not np.shares_memory(model.X_, feature_blocks[0])
+        assert not np.isnan(model.X_).any()
+        assert not np.isnan(model.y_).any()
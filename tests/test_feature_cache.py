@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from features.feature_cache import FeatureCache
+from features.feature_engineering import FeatureConfig, build_features
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2022-01-01", periods=300, freq="D")
+    return pd.Series(100 + rng.normal(0, 5, len(index)).cumsum(), index=index, name="y")
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_cached_frames_match_build_features(tmp_path, series, mmap):
+    cache = FeatureCache(tmp_path, mmap=mmap)
+    config = FeatureConfig()
+
+    miss = cache.build(series, config)
+    hit = cache.build(series, config)
+    expected = build_features(series, config)
+    pd.testing.assert_frame_equal(miss, expected)
+    pd.testing.assert_frame_equal(hit, expected)
+
+    # Appended rows reuse the cached prefix
+    longer = pd.concat([series, series.iloc[-40:].set_axis(
+        pd.date_range(series.index[-1], periods=41, freq="D")[1:]
+    ) + 3.0])
+    longer.index.freq = "D"
+    np.testing.assert_allclose(
+        cache.build(longer, config).to_numpy(),
+        build_features(longer, config).to_numpy(),
+        rtol=1e-12
+    )
+
+
+def test_cache_hit_is_writable_and_entry_unchanged(tmp_path, series):
+    cache = FeatureCache(tmp_path)
+    config = FeatureConfig()
+    cache.build(series, config)
+
+    feats = cache.build(series, config)
+    original = feats.iloc[0, 0]
+    feats.iloc[0, 0] = -1.0
+    assert feats.iloc[0, 0] == -1.0
+
+    assert cache.build(series, config).iloc[0, 0] == original
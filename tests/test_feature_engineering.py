@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import features.feature_engineering as feature_engineering
+from features.feature_engineering import (
+    FeatureConfig,
+    build_feature_matrix,
+    build_features,
+    build_panel_features,
+    drop_incomplete_rows,
+)
+from utils.exceptions import FeatureEngineeringError
+
+
+@pytest.fixture(scope="module")
+def mixed_scale_panel():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2021-01-01", periods=200, freq="D")
+    levels = {"big": (1e7, 1e-3), "shifted": (0.0, 0.01), "unit": (0.0, 1.0)}
+    frames = []
+    for name, (level, scale) in levels.items():
+        values = level + rng.normal(0, scale, len(dates))
+        if name == "shifted":
+            values[100:] += 1e7
+        frames.append(pd.DataFrame({"series_id": name, "date": dates, "value": values}))
+    # Shuffled rows: build_panel_features sorts by (series, date)
+    df = pd.concat(frames, ignore_index=True)
+    return df.sample(frac=1.0, random_state=0)
+
+
+def test_panel_matches_per_series_build_features(mixed_scale_panel):
+    config = FeatureConfig()
+    panel = build_panel_features(mixed_scale_panel, config)
+
+    for name, frame in mixed_scale_panel.groupby("series_id"):
+        series = frame.set_index("date")["value"].sort_index()
+        series.index.freq = "D"
+        expected = build_features(series, config)
+        actual = panel.loc[name]
+
+        assert list(actual.columns) == list(expected.columns)
+        assert actual.index.equals(expected.index.rename("date"))
+        # Block boundaries differ between the stacked and single series;
+        # float64 resolves a 0.01-noise std at 1e7 to ~5e-7 relative
+        np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-6)
+
+
+def test_panel_rolling_std_on_mixed_scales(mixed_scale_panel):
+    panel = build_panel_features(mixed_scale_panel, FeatureConfig())
+
+    for name, frame in mixed_scale_panel.groupby("series_id"):
+        series = frame.set_index("date")["value"].sort_index()
+        expected = series.shift(1).rolling(7).std().loc[panel.loc[name].index]
+        np.testing.assert_allclose(
+            panel.loc[name, "roll_std_7"].to_numpy(), expected.to_numpy(), rtol=1e-3
+        )
+
+
+def make_series(n=200, seed=0, interior_nan=False):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(20, 3, n)
+    if interior_nan:
+        values[[60, 61, 150]] = np.nan
+    return pd.Series(values, index=pd.date_range("2022-01-01", periods=n, freq="D"))
+
+
+def joined_reference(series, config, exogenous=None):
+    """Feature frame assembled column family by column family with pandas joins"""
+    df = pd.DataFrame({"y": series})
+    for lag in config.lags:
+        df[f"lag_{lag}"] = series.shift(lag)
+
+    past = series.shift(1)
+    for window in config.rolling_windows:
+        for stat in ["mean", "std", "min", "max"]:
+            if stat in config.rolling_stats:
+                df[f"roll_{stat}_{window}"] = getattr(past.rolling(window), stat)()
+
+    if config.add_diff or config.add_pct_change:
+        for k in (1, 7):
+            df[f"diff_{k}"] = series.diff(k)
+        for k in (1, 7):
+            df[f"pct_change_{k}"] = series.pct_change(k)
+
+    if config.add_calendar_features:
+        index = series.index
+        df = df.join(pd.DataFrame({
+            "day_of_week": index.dayofweek,
+            "week_of_year": index.isocalendar().week.to_numpy(),
+            "month": index.month,
+            "quarter": index.quarter,
+            "day_of_month": index.day,
+            "is_weekend": index.dayofweek >= 5,
+            "is_month_start": index.is_month_start,
+            "is_month_end": index.is_month_end,
+        }, index=index).astype(float))
+
+    if exogenous is not None:
+        df = df.join(exogenous)
+
+    return df.dropna() if config.drop_na else df
+
+
+@pytest.mark.parametrize("drop_na", [True, False])
+@pytest.mark.parametrize("interior_nan", [False, True])
+def test_builder_matches_joined_reference(drop_na, interior_nan):
+    series = make_series(interior_nan=interior_nan)
+    exog = pd.DataFrame({"promo": np.arange(len(series)) % 4.0}, index=series.index)
+    config = FeatureConfig(drop_na=drop_na)
+
+    actual = build_features(series, config, exogenous=exog)
+    expected = joined_reference(series, config, exog)
+
+    assert list(actual.columns) == list(expected.columns)
+    assert actual.index.equals(expected.index)
+    np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-9, equal_nan=True)
+
+
+def test_builder_float32_block():
+    series = make_series()
+    values, stats = build_feature_matrix(
+        series, FeatureConfig(), dtype=np.float32, as_frame=False, track_memory=True
+    )
+    expected = build_features(series, FeatureConfig())
+
+    # Column-major block: each feature column is contiguous
+    assert values.dtype == np.float32 and values[:, 0].flags.c_contiguous
+    assert stats["nbytes"] == values.nbytes and stats["peak_bytes"] > 0
+    assert (stats["n_rows"], stats["n_features"]) == expected.shape
+    np.testing.assert_allclose(values, expected.to_numpy(), rtol=1e-6)
+
+
+def test_drop_na_copies_only_for_interior_gaps():
+    features = build_features(make_series(interior_nan=True), FeatureConfig(drop_na=False))
+    block = np.asfortranarray(features.to_numpy())
+
+    # Leading warm-up rows are sliced off as a view of the block
+    head = block[:60]
+    values, index = drop_incomplete_rows(head, features.index[:60])
+    assert np.shares_memory(values, head) and index[0] == features.index[28]
+
+    # Rows with NaNs further down cost a row-filtered copy
+    values, index = drop_incomplete_rows(block, features.index)
+    assert not np.shares_memory(values, block) and not np.isnan(values).any()
+    assert index.equals(features.dropna().index)
+
+
+def test_requested_features_match_full_build():
+    series = make_series(interior_nan=True)
+    exog = pd.DataFrame({"promo": np.arange(len(series)) % 4.0}, index=series.index)
+    requested = ["promo", "roll_std_28", "lag_3", "month", "diff_7", "roll_max_5"]
+
+    actual = build_features(series, FeatureConfig(drop_na=False), exog, features=requested)
+    full = build_features(series, FeatureConfig(rolling_windows=[5, 28], drop_na=False), exog)
+    expected = full[["promo", "roll_std_28"]].assign(
+        lag_3=series.shift(3), month=full["month"], diff_7=full["diff_7"],
+        roll_max_5=full["roll_max_5"]
+    )
+
+    assert list(actual.columns) == requested
+    np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), equal_nan=True)
+
+    # drop_na only looks at the requested columns
+    lagged = build_features(series, FeatureConfig(), features=["lag_1"])
+    assert lagged.index.equals(series.shift(1).dropna().index)
+
+
+def test_only_requested_computations_run(monkeypatch):
+    calls = []
+    rolling_stats_into = feature_engineering.rolling_stats_into
+
+    def recording_rolling(y, rolling, values):
+        calls.append({window: sorted(stats) for window, stats in rolling.items()})
+        return rolling_stats_into(y, rolling, values)
+
+    def no_calendar(*args, **kwargs):
+        raise AssertionError("calendar table built without calendar features")
+
+    monkeypatch.setattr(feature_engineering, "rolling_stats_into", recording_rolling)
+    monkeypatch.setattr(feature_engineering, "get_calendar_table", no_calendar)
+
+    build_features(make_series(), FeatureConfig(), features=["roll_std_28", "lag_7"])
+    assert calls == [{28: ["std"]}]
+
+    calls.clear()
+    build_features(make_series(), FeatureConfig(), features=["lag_1", "pct_change_1"])
+    assert calls == []
+
+
+def test_unknown_feature_name_raises():
+    with pytest.raises(FeatureEngineeringError, match="Unknown feature"):
+        build_features(make_series(), FeatureConfig(), features=["lag_1", "roll_median_7"])
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.incremental_preprocess import IncrementalPreprocessor
+from data.preprocess import PreprocessConfig, cap_outliers, preprocess_series
+
+FILL_METHODS = ["ffill", "bfill", "interpolate"]
+
+
+def raw_frame(seed, n=200, tz=None):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2021-02-01", periods=n, freq="D", tz=tz)
+    keep = rng.random(n) > 0.2
+    keep[0] = True
+    values = rng.normal(size=keep.sum())
+    values[rng.random(len(values)) < 0.3] = np.nan
+    return pd.DataFrame({"date": dates[keep], "y": values})
+
+
+# Europe/Berlin spans the March DST change
+@pytest.mark.parametrize("tz", [None, "Europe/Berlin"])
+@pytest.mark.parametrize("method", FILL_METHODS)
+@pytest.mark.parametrize("seed", range(5))
+def test_appends_match_full_rerun_with_frozen_caps(tmp_path, method, seed, tz):
+    df = raw_frame(seed, tz=tz)
+    config = PreprocessConfig(freq="D", fill_method=method)
+    rng = np.random.default_rng(seed)
+    cut = int(rng.integers(20, len(df) - 20))
+    bounds = [cut, *np.sort(rng.choice(np.arange(cut + 1, len(df)), 3, replace=False)), len(df)]
+
+    prep = IncrementalPreprocessor("date", "y", config)
+    pieces = [prep.fit(df.iloc[:cut])]
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        # Every append starts from the persisted state
+        prep = IncrementalPreprocessor.load(prep.save(tmp_path / "state.json"))
+        pieces.append(prep.append(df.iloc[a:b]))
+    # A repeat of the last row is dropped as a duplicate
+    pieces.append(prep.append(df.iloc[-1:]))
+    result = pd.concat(pieces)
+
+    # Full rerun without capping, then the caps frozen at fit time
+    uncapped, _ = preprocess_series(
+        df, "date", "y", PreprocessConfig(freq="D", fill_method=method, outlier_cap_quantile=1.0)
+    )
+    expected = cap_outliers(uncapped, 1.0, caps=prep.caps)
+
+    # bfill / interpolate may still hold back a trailing missing run
+    assert result.index.equals(expected.index[:len(result)])
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy()[:len(result)])
+    if method == "ffill":
+        assert len(result) == len(expected)
+    for piece in pieces:
+        assert str(piece.index.tz) == str(expected.index.tz)
+        assert piece.index.name == expected.index.name == "date"
+        assert piece.index.freq is not None or not len(piece)
+
+
+def test_fit_caps_match_preprocess_series():
+    df = raw_frame(0)
+    config = PreprocessConfig(freq="D")
+    prep = IncrementalPreprocessor("date", "y", config)
+    history = prep.fit(df)
+
+    expected, state = preprocess_series(df, "date", "y", config)
+    assert prep.caps == (state["lower_cap"], state["upper_cap"])
+    pd.testing.assert_series_equal(history, expected)
+
+
+def test_cap_tolerance_tracks_appended_share():
+    df = raw_frame(1)
+    config = PreprocessConfig(freq="D")
+    prep = IncrementalPreprocessor("date", "y", config)
+    n_fit = len(prep.fit(df.iloc[:100]))
+    prep.append(df.iloc[100:])
+
+    n_obs = len(preprocess_series(df, "date", "y", config)[0])
+    assert prep.cap_tolerance == pytest.approx((n_obs - n_fit) / n_obs)
+
+
+def test_append_before_fit_raises():
+    prep = IncrementalPreprocessor("date", "y", PreprocessConfig(freq="D"))
+    with pytest.raises(ValueError, match="not fitted"):
+        prep.append(raw_frame(0))
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from data.load_data import load_data
+
+
+def make_frame(tz=None):
+    dates = pd.date_range("2021-01-01", periods=240, freq="h", tz=tz)
+    return pd.DataFrame({"date": dates, "value": np.arange(240, dtype=float)})
+
+
+def reference(df, start, end):
+    # Full read, then an inclusive date filter in the column's timezone
+    dates = df["date"]
+    tz = dates.dt.tz
+
+    def bound(value):
+        ts = pd.Timestamp(value)
+        if tz is None:
+            return ts
+        return ts.tz_localize(tz) if ts.tz is None else ts.tz_convert(tz)
+
+    mask = (dates >= bound(start)) & (dates <= bound(end))
+    return df[mask].set_index("date")
+
+
+@pytest.mark.parametrize("tz", [None, "UTC", "Europe/Berlin"])
+@pytest.mark.parametrize("chunksize", [None, 50])
+def test_parquet_date_filter_matches_full_read(tmp_path, tz, chunksize):
+    df = make_frame(tz)
+    path = tmp_path / "data.parquet"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, row_group_size=24)
+
+    start, end = "2021-01-03 05:00", "2021-01-06 17:00"
+    loaded = load_data(str(path), date_col="date", start=start, end=end, chunksize=chunksize)
+    if chunksize:
+        loaded = pd.concat(list(loaded))
+
+    pd.testing.assert_frame_equal(loaded, reference(df, start, end), check_freq=False)
+
+
+def test_parquet_tz_aware_bounds_are_converted(tmp_path):
+    df = make_frame("UTC")
+    path = tmp_path / "data.parquet"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, row_group_size=24)
+
+    start = pd.Timestamp("2021-01-03 06:00", tz="Europe/Berlin")
+    loaded = load_data(str(path), date_col="date", start=start, end="2021-01-04")
+    assert loaded.index[0] == pd.Timestamp("2021-01-03 05:00", tz="UTC")
+    assert loaded.index[-1] == pd.Timestamp("2021-01-04 00:00", tz="UTC")
+
+
+def test_parquet_date32_column(tmp_path):
+    dates = pd.date_range("2021-01-01", periods=60, freq="D")
+    table = pa.table({"date": pa.array(dates.date, type=pa.date32()), "value": np.arange(60.0)})
+    path = tmp_path / "data.parquet"
+    pq.write_table(table, path, row_group_size=10)
+
+    loaded = load_data(str(path), date_col="date", start="2021-01-10 12:00", end="2021-01-20")
+    assert loaded.index[0] == pd.Timestamp("2021-01-11")
+    assert loaded.index[-1] == pd.Timestamp("2021-01-20")
+
+
+def test_aware_bound_on_naive_column_raises(tmp_path):
+    path = tmp_path / "data.parquet"
+    pq.write_table(pa.Table.from_pandas(make_frame(), preserve_index=False), path)
+    with pytest.raises(ValueError, match="naive date column"):
+        load_data(str(path), date_col="date", start=pd.Timestamp("2021-01-02", tz="UTC"))
+
+
+@pytest.mark.parametrize("chunksize", [None, 37])
+def test_csv_date_filter_matches_full_read(tmp_path, chunksize):
+    df = make_frame()
+    path = tmp_path / "data.csv"
+    df.to_csv(path, index=False)
+
+    start, end = "2021-01-02 10:00", "2021-01-08"
+    loaded = load_data(str(path), date_col="date", start=start, end=end, chunksize=chunksize)
+    if chunksize:
+        loaded = pd.concat(list(loaded))
+
+    expected = reference(df, start, end)
+    pd.testing.assert_frame_equal(loaded, expected, check_freq=False, check_index_type=False)
@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+
+from Evaluation.Evaluate import mae, mape, rmse
+from Evaluation.metrics import (
+    batch_bias,
+    batch_mae,
+    batch_mape,
+    batch_mase,
+    batch_metrics,
+    batch_rmse,
+    batch_smape,
+    seasonal_scale,
+)
+
+# Errors (actual - forecast): [-1, 0, 3] and [-1, 2, <missing>]
+Y_TRUE = np.array([[1.0, 2.0, 4.0], [0.0, 5.0, np.nan]])
+Y_PRED = np.array([[2.0, 2.0, 1.0], [1.0, 3.0, 7.0]])
+Y_TRAIN = np.array([[1.0, 3.0, 2.0, 5.0], [0.0, 0.0, 1.0, 1.0]])
+
+
+@pytest.mark.parametrize("metric, per, expected", [
+    (batch_rmse, "series", [np.sqrt(10 / 3), np.sqrt(5 / 2)]),
+    (batch_rmse, "horizon", [1.0, np.sqrt(2), 3.0]),
+    (batch_rmse, "all", np.sqrt(15 / 5)),
+    (batch_mae, "series", [4 / 3, 3 / 2]),
+    (batch_mae, "horizon", [1.0, 1.0, 3.0]),
+    (batch_mae, "all", 7 / 5),
+    # The zero actual is left out of MAPE
+    (batch_mape, "series", [100 * (1 + 0 + 0.75) / 3, 100 * 0.4]),
+    (batch_mape, "horizon", [100.0, 20.0, 75.0]),
+    (batch_smape, "series", [100 * (2 / 3 + 0 + 6 / 5) / 3, 100 * (2 + 4 / 8) / 2]),
+    (batch_smape, "all", 100 * (2 / 3 + 0 + 6 / 5 + 2 + 4 / 8) / 5),
+    (batch_bias, "series", [-2 / 3, -1 / 2]),
+    (batch_bias, "horizon", [1.0, -1.0, -3.0]),
+])
+def test_metrics_match_hand_computed_values(metric, per, expected):
+    np.testing.assert_allclose(metric(Y_TRUE, Y_PRED, per=per), expected, rtol=1e-12)
+
+
+def test_mase_scales_by_in_sample_differences():
+    # Mean |first differences| of the training rows: 2 and 1/3
+    np.testing.assert_allclose(seasonal_scale(Y_TRAIN), [2.0, 1 / 3])
+    np.testing.assert_allclose(
+        batch_mase(Y_TRUE, Y_PRED, y_train=Y_TRAIN), [(4 / 3) / 2, 1.5 / (1 / 3)]
+    )
+    # Seasonal differences at lag 2: (1 + 2) / 2 and (1 + 1) / 2
+    np.testing.assert_allclose(seasonal_scale(Y_TRAIN, m=2), [1.5, 1.0])
+    np.testing.assert_allclose(
+        batch_mase(Y_TRUE, Y_PRED, scale=[1.5, 1.0]), [(4 / 3) / 1.5, 1.5]
+    )
+
+
+def test_flat_training_series_has_undefined_mase():
+    scale = seasonal_scale([[3.0, 3.0, 3.0]])
+    assert np.isnan(scale).all()
+    assert np.isnan(batch_mase([[1.0, 2.0]], [[1.0, 1.0]], scale=scale)).all()
+
+
+def test_missing_values_propagate_without_masking():
+    rmse_values = batch_rmse(Y_TRUE, Y_PRED, mask_nan=False)
+    assert rmse_values[0] == pytest.approx(np.sqrt(10 / 3)) and np.isnan(rmse_values[1])
+    # A series with nothing left to score is NaN, not an error
+    assert np.isnan(batch_mae([[np.nan, np.nan]], [[1.0, 2.0]])).all()
+    assert np.isnan(batch_mape([[0.0, 0.0]], [[1.0, 2.0]])).all()
+
+
+def test_single_vector_wrappers_match_sklearn():
+    rng = np.random.default_rng(0)
+    y_true, y_pred = rng.normal(10, 2, 50), rng.normal(10, 2, 50)
+
+    assert rmse(y_true, y_pred) == pytest.approx(np.sqrt(mean_squared_error(y_true, y_pred)))
+    assert mae(y_true, y_pred) == pytest.approx(mean_absolute_error(y_true, y_pred))
+    assert mape(y_true, y_pred) == pytest.approx(100 * np.mean(np.abs((y_true - y_pred) / y_true)))
+    np.testing.assert_allclose(batch_rmse(y_true, y_pred), [rmse(y_true, y_pred)])
+
+
+def test_metric_table_layout():
+    by_horizon = batch_metrics(Y_TRUE, Y_PRED, y_train=Y_TRAIN, per="horizon")
+    assert list(by_horizon.columns) == ["RMSE", "MAE", "MAPE", "sMAPE", "Bias", "MASE"]
+    assert by_horizon.index.equals(pd.RangeIndex(1, 4, name="horizon"))
+    np.testing.assert_allclose(by_horizon["MAE"], [1.0, 1.0, 3.0])
+
+    overall = batch_metrics(Y_TRUE, Y_PRED, per="all")
+    assert overall.shape == (1, 5)
+    assert overall.loc[0, "RMSE"] == pytest.approx(np.sqrt(3))
+
+
+def test_invalid_inputs_raise():
+    with pytest.raises(ValueError, match="Shape mismatch"):
+        batch_rmse(Y_TRUE, Y_PRED[:, :2])
+    with pytest.raises(ValueError, match="Unsupported reduction"):
+        batch_mae(Y_TRUE, Y_PRED, per="model")
+    with pytest.raises(ValueError, match="y_train or scale"):
+        batch_mase(Y_TRUE, Y_PRED)
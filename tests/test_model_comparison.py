@@ -0,0 +1,76 @@
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from experiments.model_comparison import RESULT_COLUMNS, compare_models
+from utils.exceptions import EvaluationError
+
+
+class SleepyModel:
+    """Mean forecast that takes `seconds` to fit"""
+
+    def __init__(self, seconds=0.0):
+        self.seconds = seconds
+
+    def fit(self, y):
+        time.sleep(self.seconds)
+        self.mean = float(np.mean(y))
+        return self
+
+    def predict(self, steps):
+        return np.repeat(self.mean, steps)
+
+
+class FailingModel:
+    def fit(self, y):
+        raise RuntimeError("cannot fit")
+
+
+@pytest.fixture(scope="module")
+def data():
+    y = pd.Series(np.arange(40, dtype=float))
+    return y.iloc[:30], y.iloc[30:]
+
+
+def test_timeout_counts_from_worker_start(data):
+    # Run back to back, the three models take 1.8s in total; each one is
+    # within its own 1s budget
+    models = {name: SleepyModel(0.6) for name in "abc"}
+    results = compare_models(
+        models, *data, steps=10, verbose=False, n_jobs=1, timeout=1.0, on_error="record"
+    )
+    assert results["Error"].isna().all()
+    assert sorted(results["Model"]) == ["a", "b", "c"]
+    assert all(hasattr(model, "mean") for model in models.values())
+
+
+def test_overrunning_model_does_not_block_the_next(data):
+    models = {"slow": SleepyModel(30), "fast": SleepyModel()}
+    start = time.perf_counter()
+    results = compare_models(
+        models, *data, steps=10, verbose=False, n_jobs=1, timeout=0.5, on_error="record"
+    )
+    assert time.perf_counter() - start < 10
+    errors = results.set_index("Model")["Error"]
+    assert errors["slow"].startswith("timeout")
+    assert pd.isna(errors["fast"])
+
+
+def test_timeout_raises_by_default(data):
+    with pytest.raises(EvaluationError, match="timed out"):
+        compare_models({"slow": SleepyModel(30)}, *data, steps=10, verbose=False, timeout=0.3)
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_skip_with_every_model_failing_lists_the_errors(data, n_jobs):
+    models = {"a": FailingModel(), "b": FailingModel()}
+    with pytest.raises(EvaluationError, match="All models failed: a: .*cannot fit.*; b:"):
+        compare_models(models, *data, steps=10, verbose=False, n_jobs=n_jobs, on_error="skip")
+
+
+def test_no_models_gives_an_empty_frame(data):
+    results = compare_models({}, *data, steps=10, verbose=False, on_error="skip")
+    assert results.empty
+    assert list(results.columns) == RESULT_COLUMNS
@@ -0,0 +1,93 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.preprocess import PreprocessConfig
+from models.statstics_models import NaiveModel, ThetaForecastModel
+from pipeline.panel_pipeline import _artifact_path, forecast_one_series, panel_pipeline
+
+SERIES_IDS = ["a", "a/b", "a_b", "a%2Fb", "a.tmp", ".", ".."]
+CONFIG = PreprocessConfig(freq="MS")
+
+
+class BrokenModel:
+    def fit(self, y):
+        raise RuntimeError("cannot fit")
+
+
+def models_with_failure():
+    return {"Naive": NaiveModel(), "Theta": ThetaForecastModel(), "Broken": BrokenModel()}
+
+
+def broken_models():
+    return {"Broken": BrokenModel()}
+
+
+def long_frame(series_ids, n=48, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2018-01-01", periods=n, freq="MS")
+    return pd.concat([
+        pd.DataFrame({
+            "series_id": series_id,
+            "date": dates,
+            "value": 10 * i + np.sin(np.arange(n) * np.pi / 6) + rng.normal(0, 0.1, n)
+        })
+        for i, series_id in enumerate(series_ids)
+    ], ignore_index=True)
+
+
+def test_artifact_paths_are_distinct_and_inside_output_dir(tmp_path):
+    paths = [_artifact_path(tmp_path, series_id) for series_id in SERIES_IDS]
+    assert len(set(paths)) == len(paths)
+    for path in paths:
+        assert path.parent == tmp_path
+        assert "." not in path.name and "/" not in path.name
+    with pytest.raises(ValueError, match="empty"):
+        _artifact_path(tmp_path, "")
+
+
+def test_best_model_is_chosen_among_successes(tmp_path):
+    df = long_frame(["s"]).drop(columns=["series_id"])
+    rows, artifact_path = forecast_one_series(
+        "s", df, "date", "value", CONFIG, models_with_failure, tmp_path
+    )
+    results = pd.DataFrame(rows).set_index("Model")
+
+    assert "cannot fit" in results.loc["Broken", "Error"]
+    assert not results.loc["Broken", "is_best"]
+    best = results["RMSE"].idxmin()
+    assert best in ("Naive", "Theta") and results.loc[best, "is_best"]
+    assert pd.isna(results.loc[best, "Error"])
+    assert Path(artifact_path).is_relative_to(tmp_path)
+
+
+def test_series_fails_when_every_model_fails(tmp_path):
+    df = long_frame(["s"]).drop(columns=["series_id"])
+    rows, artifact_path = forecast_one_series(
+        "s", df, "date", "value", CONFIG, broken_models, tmp_path
+    )
+    assert artifact_path is None
+    assert len(rows) == 1 and not rows[0]["is_best"]
+    assert "All models failed" in rows[0]["Error"]
+
+
+def test_panel_keeps_one_artifact_per_series(tmp_path):
+    output_dir = tmp_path / "panel"
+    df_results, artifacts, stats = panel_pipeline(
+        long_frame(SERIES_IDS),
+        config=CONFIG,
+        models_factory=models_with_failure,
+        n_jobs=1,
+        chunk_size=3,
+        output_dir=output_dir
+    )
+
+    assert stats["n_series"] == len(SERIES_IDS) and stats["n_failed"] == 0
+    assert sorted(artifacts) == sorted(SERIES_IDS)
+    assert len(set(artifacts.values())) == len(SERIES_IDS)
+    # Nothing written outside the output directory, every artifact kept
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["panel"]
+    assert all(Path(path).exists() for path in artifacts.values())
+    assert df_results.groupby("series_id")["is_best"].sum().eq(1).all()
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.preprocess import PreprocessConfig, preprocess_panel, preprocess_series
+
+
+def raw_panel(seed, freq, n_series=6):
+    # Series with their own start and length, grid gaps, missing values
+    # and repeated rows, shuffled together
+    rng = np.random.default_rng(seed)
+    offset = pd.tseries.frequencies.to_offset(freq)
+    frames = []
+    for i in range(n_series):
+        n = int(rng.integers(5, 80))
+        start = pd.Timestamp("2020-01-06") + int(rng.integers(0, 10)) * offset
+        dates = pd.date_range(start, periods=n, freq=freq)
+        keep = rng.random(n) > 0.2
+        keep[0] = True
+        values = rng.normal(10 * i, 1 + i, keep.sum())
+        values[rng.random(len(values)) < 0.2] = np.nan
+        values[0] = 10 * i
+        frame = pd.DataFrame({"series_id": f"s{i}", "date": dates[keep], "value": values})
+        frames.append(pd.concat([frame, frame.sample(frac=0.1, random_state=seed)]))
+    return pd.concat(frames, ignore_index=True).sample(frac=1.0, random_state=seed)
+
+
+@pytest.mark.parametrize("method", ["ffill", "bfill", "interpolate"])
+@pytest.mark.parametrize("freq", ["h", "D", "W-MON", "MS"])
+@pytest.mark.parametrize("seed", range(3))
+def test_panel_matches_preprocess_series(seed, freq, method):
+    df = raw_panel(seed, freq)
+    config = PreprocessConfig(freq=freq, fill_method=method)
+    panel, caps = preprocess_panel(df, config)
+
+    for name, group in df.groupby("series_id"):
+        rows = group.sort_values("date", kind="stable")
+        expected, state = preprocess_series(rows, "date", "value", config)
+        actual = panel[panel["series_id"] == name]
+
+        np.testing.assert_array_equal(
+            actual["date"].to_numpy(), expected.index.as_unit("ns").to_numpy()
+        )
+        np.testing.assert_allclose(
+            actual["value"].to_numpy(), expected.to_numpy(dtype=float), rtol=1e-12
+        )
+        np.testing.assert_allclose(
+            caps.loc[name, ["lower_cap", "upper_cap"]].to_numpy(dtype=float),
+            [state["lower_cap"], state["upper_cap"]],
+            rtol=1e-12
+        )
+
+
+def test_panel_is_ordered_by_series_and_date():
+    panel, _ = preprocess_panel(raw_panel(0, "D"), PreprocessConfig(freq="D"))
+    codes = panel["series_id"].cat.codes.to_numpy()
+    stamps = panel["date"].to_numpy().astype(np.int64)
+    assert np.all((np.diff(codes) > 0) | ((np.diff(codes) == 0) & (np.diff(stamps) > 0)))
+
+
+def test_duplicates_rejected_when_not_removed():
+    df = raw_panel(0, "D")
+    config = PreprocessConfig(freq="D", remove_duplicates=False)
+    with pytest.raises(ValueError, match="Duplicate timestamps"):
+        preprocess_panel(df, config)
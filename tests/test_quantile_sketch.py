@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from data.quantile_sketch import QuantileSketch, k_for_error
+
+QUANTILES = np.array([0.001, 0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99, 0.999])
+
+
+def rank_error(sketch, values):
+    # Distance from each target rank to the rank interval of the estimate
+    data = np.sort(values)
+    estimates = sketch.quantile(QUANTILES)
+    low = np.searchsorted(data, estimates, side="left") / len(data)
+    high = np.searchsorted(data, estimates, side="right") / len(data)
+    return np.max(np.maximum(0.0, np.maximum(low - QUANTILES, QUANTILES - high)))
+
+
+def sample(seed, n=100_000):
+    rng = np.random.default_rng(seed)
+    return rng.lognormal(size=n) if seed % 2 else rng.standard_normal(n)
+
+
+@pytest.mark.parametrize("target", [0.01, 0.005])
+@pytest.mark.parametrize("seed", range(6))
+def test_streamed_sketch_within_target_error(target, seed):
+    values = sample(seed)
+    sketch = QuantileSketch(k=k_for_error(target), seed=seed)
+    for chunk in np.array_split(values, 25):
+        sketch.update(chunk)
+
+    assert sketch.n == len(values)
+    assert rank_error(sketch, values) <= target
+
+
+@pytest.mark.parametrize("target", [0.01, 0.005])
+@pytest.mark.parametrize("seed", range(6))
+def test_merged_sketch_within_target_error(target, seed):
+    values = sample(seed)
+    parts = [
+        QuantileSketch(k=k_for_error(target), seed=seed * 100 + i).update(chunk)
+        for i, chunk in enumerate(np.array_split(values, 8))
+    ]
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+
+    assert merged.n == len(values)
+    assert rank_error(merged, values) <= target
+
+
+def test_extremes_exact_and_non_finite_ignored():
+    values = sample(0, n=10_000)
+    sketch = QuantileSketch(k=50).update(np.concatenate([values, [np.nan, np.inf]]))
+    assert sketch.n == len(values)
+    assert sketch.quantile(0.0) == values.min()
+    assert sketch.quantile(1.0) == values.max()
+
+
+def test_small_input_is_exact():
+    values = np.arange(100.0)
+    sketch = QuantileSketch(k=200).update(values)
+    np.testing.assert_array_equal(
+        sketch.quantile([0.1, 0.5, 0.9]),
+        np.quantile(values, [0.1, 0.5, 0.9], method="inverted_cdf")
+    )
+
+
+def test_json_round_trip():
+    sketch = QuantileSketch(k=64).update(sample(1, n=20_000))
+    restored = QuantileSketch.from_json(sketch.to_json())
+    assert restored.n == sketch.n
+    np.testing.assert_array_equal(restored.quantile(QUANTILES), sketch.quantile(QUANTILES))
@@ -0,0 +1,129 @@
+from dataclasses import replace
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from features.feature_engineering import FeatureConfig, build_features
+from models.recursive_forecaster import RecursiveForecaster, recursive_forecast, tail_values
+
+
+class RecordingRegressor:
+    """Linear regression that keeps every matrix it is asked to predict"""
+
+    def __init__(self):
+        self.model = LinearRegression()
+        self.inputs = []
+
+    def fit(self, X, y):
+        self.model.fit(X, y)
+        return self
+
+    def predict(self, X):
+        self.inputs.append(X.copy())
+        return self.model.predict(np.nan_to_num(X))
+
+
+CONFIGS = [
+    FeatureConfig(),
+    FeatureConfig(
+        lags=[1, 2], rolling_windows=[3, 10], rolling_stats=["std", "min"],
+        add_holiday_features=True, add_fiscal_features=True, fiscal_year_start=7
+    ),
+]
+
+
+def make_series(n=200, level=50.0, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    values = level + 5 * np.sin(2 * np.pi * t / 7) + rng.normal(0, 1, n)
+    return pd.Series(values, index=pd.date_range("2022-01-01", periods=n, freq="D"))
+
+
+def oracle_steps(regressor, columns, config, history, steps):
+    """
+    Features and forecasts recomputed with build_features on the history
+    extended by each forecast so far
+    """
+    config = replace(config, drop_na=False)
+    freq = history.index.freq
+    extended = history.copy()
+    rows, forecasts = [], []
+    for _ in range(steps):
+        # The new point's own value is never an input
+        extended.loc[extended.index[-1] + freq] = np.nan
+        row = build_features(extended, config, features=columns).iloc[-1].to_numpy()
+        forecast = regressor.model.predict(np.nan_to_num(row)[np.newaxis, :])[0]
+        extended.iloc[-1] = forecast
+        rows.append(row)
+        forecasts.append(forecast)
+    return np.array(rows), np.array(forecasts)
+
+
+@pytest.mark.parametrize("config", CONFIGS)
+def test_step_features_match_build_features_on_extended_series(config):
+    y = make_series()
+    regressor = RecordingRegressor()
+    forecaster = RecursiveForecaster(regressor, config).fit(y)
+
+    forecasts = forecaster.predict(40)
+    rows, expected = oracle_steps(regressor, forecaster.columns, config, y, 40)
+
+    inputs = np.vstack(regressor.inputs)
+    assert inputs.shape == (40, len(forecaster.columns))
+    np.testing.assert_allclose(inputs, rows, rtol=1e-9, atol=1e-9)
+    # Each forecast is fed back: later steps see the earlier forecasts
+    np.testing.assert_allclose(forecasts, expected, rtol=1e-9)
+    assert np.ptp(forecasts) > 0
+
+
+def test_long_horizon_at_large_level():
+    y = make_series(level=1e6)
+    config = FeatureConfig(lags=[1, 7], rolling_windows=[7, 28], add_calendar_features=False)
+    regressor = RecordingRegressor()
+    forecaster = RecursiveForecaster(regressor, config).fit(y)
+
+    forecasts = forecaster.predict(300)
+    rows, expected = oracle_steps(regressor, forecaster.columns, config, y, 300)
+
+    np.testing.assert_allclose(np.vstack(regressor.inputs), rows, rtol=1e-9)
+    np.testing.assert_allclose(forecasts, expected, rtol=1e-9)
+
+
+def test_short_history_windows_fill_with_forecasts():
+    # Windows hold missing values until the padding has left them
+    y = make_series()
+    config = FeatureConfig(lags=[1], rolling_windows=[5], add_calendar_features=False)
+    regressor = RecordingRegressor()
+    forecaster = RecursiveForecaster(regressor, config).fit(y)
+    regressor.inputs.clear()
+
+    short = y.iloc[:3]
+    recursive_forecast(
+        regressor, forecaster.columns, config,
+        tail_values(short, forecaster.lookback)[np.newaxis, :],
+        [short.index[-1]], short.index.freq, 12
+    )
+    rows, _ = oracle_steps(regressor, forecaster.columns, config, short, 12)
+
+    inputs = np.vstack(regressor.inputs)
+    assert np.isnan(inputs[:2, 1:]).all() and not np.isnan(inputs[2:]).any()
+    np.testing.assert_allclose(inputs, rows, rtol=1e-9, equal_nan=True)
+
+
+def test_panel_forecasts_match_single_series_recursion():
+    config = CONFIGS[1]
+    series = {f"s{i}": make_series(n=120 + 10 * i, level=10.0 * (i + 1), seed=i) for i in range(3)}
+    df = pd.concat([
+        pd.DataFrame({"series_id": name, "date": y.index, "value": y.to_numpy()})
+        for name, y in series.items()
+    ], ignore_index=True)
+
+    regressor = RecordingRegressor()
+    forecaster = RecursiveForecaster(regressor, config).fit_panel(df)
+    panel = forecaster.predict_panel(df, steps=15)
+
+    for name, y in series.items():
+        _, expected = oracle_steps(regressor, forecaster.columns, config, y, 15)
+        np.testing.assert_allclose(panel.loc[name, "forecast"].to_numpy(), expected, rtol=1e-9)
@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+
+from features.rolling_kernel import rolling_stats_kernel
+
+STATS = ["mean", "std", "min", "max"]
+
+
+def pandas_reference(x, window):
+    rolling = pd.Series(x).shift(1).rolling(window)
+    return np.column_stack([rolling.mean(), rolling.std(), rolling.min(), rolling.max()])
+
+
+def exact_std(x, window):
+    # Two-pass std of each shifted window
+    out = np.full(len(x), np.nan)
+    windows = sliding_window_view(x[:-1], window)
+    out[window:] = windows.std(axis=1, ddof=1)
+    return out
+
+
+def make_series(kind, n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    if kind == "random":
+        return rng.normal(5, 2, n)
+    if kind == "nans":
+        x = rng.normal(0, 1, n)
+        x[rng.choice(n, 20, replace=False)] = np.nan
+        return x
+    if kind == "offset":
+        return 1e7 + rng.normal(0, 0.01, n)
+    # Level shift from 0 to 1e7 with small noise
+    return np.where(np.arange(n) < n // 2, 0.0, 1e7) + rng.normal(0, 0.01, n)
+
+
+@pytest.mark.parametrize("kind", ["random", "nans", "offset", "level_shift"])
+@pytest.mark.parametrize("window", [1, 2, 3, 7, 28, 100])
+def test_kernel_matches_pandas(kind, window):
+    x = make_series(kind)
+    out, names = rolling_stats_kernel(x, [window], STATS)
+    assert names == [f"roll_{stat}_{window}" for stat in STATS]
+
+    expected = pandas_reference(x, window)
+    # pandas' online variance loses up to ~1e-6 absolute on offset data
+    np.testing.assert_allclose(out, expected, rtol=1e-3, atol=1e-5, equal_nan=True)
+
+
+@pytest.mark.parametrize("kind", ["random", "offset", "level_shift"])
+@pytest.mark.parametrize("window", [2, 7, 30])
+def test_std_matches_two_pass_on_large_offsets(kind, window):
+    x = make_series(kind)
+    out, _ = rolling_stats_kernel(x, [window], ["std"])
+    np.testing.assert_allclose(out[:, 0], exact_std(x, window), rtol=1e-6, equal_nan=True)
+
+
+def test_level_shift_std_is_not_lost():
+    x = make_series("level_shift", n=400)
+    out, _ = rolling_stats_kernel(x, [7], ["std"])
+    # Windows on either side of the shift see only the 0.01 noise
+    steady = np.r_[10:200, 210:400]
+    assert np.all((out[steady, 0] > 0.001) & (out[steady, 0] < 0.05))
+
+
+def test_float32_output_and_multiple_windows():
+    x = make_series("random")
+    out, names = rolling_stats_kernel(x, [3, 14], ["std", "max"], dtype=np.float32)
+    assert out.dtype == np.float32 and out.flags.f_contiguous
+    expected = np.column_stack([
+        pandas_reference(x, window)[:, [1, 3]] for window in (3, 14)
+    ])
+    np.testing.assert_allclose(out, expected, rtol=1e-5, equal_nan=True)
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.preprocess import PreprocessConfig, preprocess_series
+from data.series_store import load_series, load_split, preprocess_to_store, save_series
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+@pytest.mark.parametrize("tz, freq", [
+    (None, "D"),
+    ("UTC", "h"),
+    # Spans the March and October DST changes
+    ("Europe/Berlin", "D"),
+    ("America/New_York", "h"),
+])
+def test_round_trip_keeps_index(tmp_path, tz, freq, mmap):
+    index = pd.date_range("2024-03-01", periods=400, freq=freq, tz=tz, name="date")
+    series = pd.Series(np.arange(len(index), dtype=float), index=index, name="y")
+
+    save_series(series, tmp_path / "store")
+    loaded, meta = load_series(tmp_path / "store", mmap=mmap)
+
+    assert meta["tz"] == (str(index.tz) if tz else None)
+    assert loaded.index.equals(index)
+    assert str(loaded.index.tz) == str(index.tz)
+    assert loaded.index.freq == index.freq
+    pd.testing.assert_series_equal(loaded, series, check_index_type=False, check_names=False)
+
+
+def test_store_records_config_and_caps(tmp_path):
+    rng = np.random.default_rng(0)
+    dates = pd.date_range("2020-01-01", periods=120, freq="MS")
+    df = pd.DataFrame({"date": dates, "value": rng.normal(size=len(dates))})
+    config = PreprocessConfig(freq="MS", test_size=0.25)
+
+    series = preprocess_to_store(df, "date", "value", config, tmp_path / "store")
+    _, meta = load_series(tmp_path / "store")
+
+    assert meta["config"]["freq"] == "MS" and meta["config"]["test_size"] == 0.25
+    expected, state = preprocess_series(df, "date", "value", config)
+    pd.testing.assert_series_equal(series, expected)
+    assert meta["state"] == state
+
+    train, test = load_split(tmp_path / "store")
+    assert (len(train), len(test)) == (90, 30)
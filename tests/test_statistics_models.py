@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+from statsmodels.tsa.forecasting.theta import ThetaModel
+
+from models.statstics_models import (
+    HoltWintersModel,
+    NaiveModel,
+    SeasonalNaiveModel,
+    ThetaForecastModel,
+    as_new_observations,
+)
+
+
+@pytest.fixture(scope="module")
+def y():
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2020-01-01", periods=96, freq="MS")
+    season = 5 * np.sin(2 * np.pi * np.arange(96) / 12)
+    return pd.Series(100 + 0.3 * np.arange(96) + season + rng.normal(0, 1, 96), index=index)
+
+
+def test_array_input_continues_the_date_index(y):
+    new = as_new_observations(y.iloc[:90], y.to_numpy()[90:])
+    assert new.index.equals(y.index[90:])
+    np.testing.assert_array_equal(new.to_numpy(), y.to_numpy()[90:])
+
+
+@pytest.mark.parametrize("as_array", [False, True])
+def test_naive_update_accepts_arrays(y, as_array):
+    new = y.iloc[90:].to_numpy() if as_array else y.iloc[90:]
+    model = NaiveModel().fit(y.iloc[:90]).update(new)
+    np.testing.assert_array_equal(model.predict(3), np.repeat(y.iloc[-1], 3))
+
+
+def test_seasonal_naive_update_accepts_arrays(y):
+    model = SeasonalNaiveModel(12).fit(y.iloc[:90]).update(y.iloc[90:].to_numpy())
+    np.testing.assert_array_equal(model.predict(12), y.iloc[-12:].to_numpy())
+
+
+@pytest.fixture(scope="module")
+def flat_y():
+    # Level plus noise: the seasonality test finds no seasonality
+    rng = np.random.default_rng(3)
+    index = pd.date_range("2015-01-01", periods=96, freq="MS")
+    return pd.Series(50 + rng.normal(0, 1, 96), index=index)
+
+
+@pytest.mark.parametrize("series", ["y", "flat_y"])
+@pytest.mark.parametrize("as_array", [False, True])
+def test_theta_update_matches_full_fit(request, series, as_array):
+    y = request.getfixturevalue(series)
+    new = y.iloc[84:].to_numpy() if as_array else y.iloc[84:]
+    model = ThetaForecastModel().fit(y.iloc[:84])
+    seasonal = model.fitted_model.model._has_seasonality
+    assert seasonal == (series == "y")
+
+    model.update(new)
+    assert isinstance(model.model.endog_orig.index, pd.DatetimeIndex)
+    assert model.fitted_model.model._has_seasonality == seasonal
+
+    # Same settings as the original fit (seasonality test included)
+    reference = ThetaModel(y).fit()
+    assert reference.model._has_seasonality == seasonal
+    pd.testing.assert_series_equal(model.predict(6), reference.forecast(6))
+
+
+def test_updates_accept_new_exog(y):
+    for model in [NaiveModel(), SeasonalNaiveModel(12), ThetaForecastModel(), HoltWintersModel(12)]:
+        model.fit(y.iloc[:84]).update(y.iloc[84:], new_exog=None)
+        assert len(np.asarray(model.predict(3))) == 3
+
+
+@pytest.mark.parametrize("as_array", [False, True])
+def test_exponential_smoothing_update_keeps_index(y, as_array):
+    new = y.iloc[84:].to_numpy() if as_array else y.iloc[84:]
+    model = HoltWintersModel(12).fit(y.iloc[:84])
+    params = model.fitted_model.params
+
+    model.update(new)
+
+    assert model.fitted_model.params["smoothing_level"] == params["smoothing_level"]
+    forecast = model.predict(3)
+    assert forecast.index.equals(pd.date_range(y.index[-1], periods=4, freq="MS")[1:])
@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+
+from features.feature_engineering import FeatureConfig, build_features
+from features.streaming import RollingWindowState, StreamingFeaturizer
+from utils.exceptions import FeatureEngineeringError
+
+
+def make_series(n=300, level=50.0, scale=5.0, seed=0):
+    rng = np.random.default_rng(seed)
+    values = level + rng.normal(0, scale, n)
+    values[rng.choice(n, 5, replace=False)] = np.nan
+    index = pd.date_range("2023-01-01", periods=n, freq="D")
+    return pd.Series(values, index=index)
+
+
+@pytest.mark.parametrize("config", [
+    FeatureConfig(drop_na=False),
+    FeatureConfig(
+        lags=[1, 3], rolling_windows=[1, 5], rolling_stats=["std", "max"],
+        add_diff=False, add_pct_change=False, add_holiday_features=True,
+        add_fiscal_features=True, fiscal_year_start=4, drop_na=False
+    ),
+])
+def test_streamed_rows_match_build_features(config):
+    series = make_series()
+    exog = pd.DataFrame({"promo": np.arange(len(series)) % 3.0}, index=series.index)
+    expected = build_features(series, config, exogenous=exog)
+
+    featurizer = StreamingFeaturizer(config, exog_columns=["promo"])
+    rows = pd.DataFrame([
+        featurizer.push(timestamp, value, {"promo": exog.loc[timestamp, "promo"]})
+        for timestamp, value in series.items()
+    ])
+
+    assert list(rows.columns) == list(expected.columns)
+    assert rows.index.equals(expected.index)
+    np.testing.assert_allclose(rows.to_numpy(), expected.to_numpy(), rtol=1e-9, equal_nan=True)
+
+
+def test_warm_start_continues_the_stream():
+    series = make_series()
+    config = FeatureConfig(drop_na=False)
+    expected = build_features(series, config).iloc[200:]
+
+    featurizer = StreamingFeaturizer.from_history(series.iloc[:200], config)
+    rows = pd.DataFrame([featurizer.push(t, v) for t, v in series.iloc[200:].items()])
+    np.testing.assert_allclose(rows.to_numpy(), expected.to_numpy(), rtol=1e-9, equal_nan=True)
+
+
+def test_long_stream_at_large_level_does_not_drift():
+    # 0.01 noise on a 1e6 level: add-remove updates alone drift to ~1e-5
+    # relative error in the std over this stream
+    n, windows = 30_000, [7, 28]
+    rng = np.random.default_rng(0)
+    values = 1e6 + rng.normal(0, 0.01, n)
+    index = pd.date_range("1940-01-01", periods=n, freq="D")
+
+    featurizer = StreamingFeaturizer(FeatureConfig(rolling_windows=windows, add_calendar_features=False))
+    streamed = {window: np.full(n, np.nan) for window in windows}
+    for i, (timestamp, value) in enumerate(zip(index, values)):
+        featurizer.update_state(timestamp, value)
+        for window in windows:
+            streamed[window][i] = featurizer.windows[window].stats()["std"]
+
+    for window in windows:
+        exact = sliding_window_view(values, window).std(axis=1, ddof=1)
+        np.testing.assert_allclose(streamed[window][window - 1:], exact, rtol=5e-7)
+
+
+def test_refresh_matches_running_moments():
+    rng = np.random.default_rng(1)
+    values = rng.normal(3, 2, 50)
+    state = RollingWindowState(10)
+    for position, value in enumerate(values):
+        leaving = values[position - 10] if position >= 10 else np.nan
+        state.push(position, value, leaving)
+
+    running = state.stats()
+    state.refresh(values[-10:])
+    assert state.stats() == pytest.approx(running, rel=1e-12)
+    assert not state.refresh_due
+
+
+def test_out_of_order_observation_raises():
+    featurizer = StreamingFeaturizer(FeatureConfig())
+    featurizer.push("2023-01-02", 1.0)
+    with pytest.raises(FeatureEngineeringError, match="Out-of-order"):
+        featurizer.push("2023-01-01", 2.0)